@@ -2,6 +2,8 @@ import streamlit as st
 import requests
 import json
 import os
+import asyncio
+import threading
 from datetime import datetime
 import openai_client
 
@@ -38,3 +40,71 @@ class AIClient:
         """
         with st.spinner("Analisando dados de SEO e otimizando presença digital... 🔍"):
             return openai_client.analyze_seo(data)
+    
+    def stream_analysis(self, report_type, data):
+        """
+        Stream the AI analysis for a report type
+        
+        Yields sections of the analysis as soon as they are complete, see
+        openai_client.stream_analysis for the event format.
+        """
+        return openai_client.stream_analysis(report_type, data)
+
+class _SharedEventLoop:
+    """Event loop running on a daemon thread, shared by every AsyncAIClient"""
+    
+    _lock = threading.Lock()
+    _loop = None
+    
+    @classmethod
+    def get(cls):
+        with cls._lock:
+            if cls._loop is None or cls._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever,
+                    name="ai-client-event-loop",
+                    daemon=True
+                )
+                thread.start()
+                cls._loop = loop
+            return cls._loop
+
+class AsyncAIClient:
+    """
+    Async client for AI services
+    
+    Every call is a coroutine backed by AsyncOpenAI. Coroutines can be awaited
+    directly or scheduled on a process-wide event loop through ``submit``/``run``,
+    so many report generations can be in flight without a thread per user.
+    """
+    
+    def __init__(self):
+        self.api_key = os.getenv("OPENAI_API_KEY")
+    
+    async def analyze_business(self, data):
+        """Analyze business data using AI"""
+        return await openai_client.analyze_business_async(data)
+    
+    async def generate_blue_ocean_strategy(self, data):
+        """Generate a Blue Ocean strategy using AI"""
+        return await openai_client.generate_blue_ocean_strategy_async(data)
+    
+    async def analyze_seo(self, data):
+        """Analyze SEO data using AI"""
+        return await openai_client.analyze_seo_async(data)
+    
+    @staticmethod
+    def submit(coro):
+        """
+        Schedule a coroutine on the shared event loop
+        
+        Returns a concurrent.futures.Future that can be polled or waited on
+        from any thread.
+        """
+        return asyncio.run_coroutine_threadsafe(coro, _SharedEventLoop.get())
+    
+    @classmethod
+    def run(cls, coro, timeout=None):
+        """Run a coroutine on the shared event loop and wait for its result"""
+        return cls.submit(coro).result(timeout=timeout)
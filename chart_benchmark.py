@@ -0,0 +1,157 @@
+"""
+Micro-benchmark of the graph_objects chart builders against plotly.express
+
+Each builder in utils, visualization and chart_specs that used to go through
+px (and usually a pandas DataFrame) is compared with that original px
+implementation, kept below as the reference: the figures must be equivalent
+(same traces, layout and data) and the script prints the time per chart of
+both versions.
+
+Usage:
+    python chart_benchmark.py --repeat 50
+"""
+import argparse
+import base64
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+import chart_specs
+import utils
+import visualization
+
+
+# Reference implementations (px + pandas), as they were before fast_charts
+
+def px_bar_chart(x_data, y_data, title, x_label, y_label):
+    df = pd.DataFrame({x_label: x_data, y_label: y_data})
+    return px.bar(df, x=x_label, y=y_label, title=title)
+
+
+def px_line_chart(x_data, y_data, title, x_label, y_label):
+    df = pd.DataFrame({x_label: x_data, y_label: y_data})
+    return px.line(df, x=x_label, y=y_label, title=title)
+
+
+def px_keyword_performance(keywords, positions, search_volumes):
+    df = pd.DataFrame({'Palavra-chave': keywords, 'Posição': positions, 'Volume de Busca': search_volumes})
+    fig = px.scatter(
+        df,
+        x='Palavra-chave',
+        y='Posição',
+        size='Volume de Busca',
+        color='Palavra-chave',
+        title="Performance de Palavras-chave",
+        labels={'Posição': 'Posição no Google'}
+    )
+    fig.update_yaxes(autorange="reversed")
+    return fig
+
+
+def px_traffic_sources_chart(sources, percentages):
+    df = pd.DataFrame({'Fonte': sources, 'Porcentagem': percentages})
+    return px.pie(df, values='Porcentagem', names='Fonte', title='Fontes de Tráfego', hole=0.4)
+
+
+def px_optimization_matrix(areas, impact, difficulty):
+    df = pd.DataFrame({'Área': areas, 'Impacto': impact, 'Dificuldade': difficulty})
+    fig = px.scatter(
+        df,
+        x='Dificuldade',
+        y='Impacto',
+        text='Área',
+        size=[40] * len(areas),
+        color='Área',
+        title="Matriz de Oportunidades de Otimização",
+        labels={'Dificuldade': 'Dificuldade de Implementação', 'Impacto': 'Impacto Potencial'}
+    )
+    fig.update_traces(textposition='top center')
+    return fig
+
+
+def px_errc_actions(counts):
+    actions = ["Eliminar", "Reduzir", "Aumentar", "Criar"]
+    return px.bar(
+        x=actions,
+        y=counts,
+        color=actions,
+        title="Framework ERRC (Eliminar-Reduzir-Aumentar-Criar)",
+        labels={'x': 'Ações Estratégicas', 'y': 'Quantidade de Elementos'}
+    )
+
+
+def px_report_keyword_performance(keywords, positions, search_volumes):
+    return px.scatter(
+        x=keywords,
+        y=positions,
+        size=search_volumes,
+        title="Performance de Palavras-chave",
+        labels={'x': 'Palavras-chave', 'y': 'Posição nos Resultados de Busca'}
+    )
+
+
+def px_report_traffic_sources(sources, percentages):
+    return px.pie(values=percentages, names=sources, title="Fontes de Tráfego", hole=0.4)
+
+
+KEYWORDS = (["ecommerce", "loja online", "produtos sustentáveis", "frete grátis", "ofertas"], [4, 12, 18, 7, 22], [2400, 1300, 880, 3200, 590])
+TRAFFIC = (["Orgânico", "Direto", "Redes Sociais", "Referral", "Email"], [35, 25, 20, 15, 5])
+OPTIMIZATION = (["Conteúdo", "Técnico", "Links", "Mobile", "Velocidade"], [8, 7, 6, 9, 8], [4, 6, 8, 5, 7])
+SERIES = (["Q1", "Q2", "Q3", "Q4"], [100, 120, 150, 200], "Potencial de Crescimento", "Período", "Crescimento (%)")
+
+CASES = [
+    ("utils.generate_bar_chart", utils.generate_bar_chart, px_bar_chart, SERIES),
+    ("utils.generate_line_chart", utils.generate_line_chart, px_line_chart, SERIES),
+    ("visualization.create_keyword_performance", visualization.create_keyword_performance, px_keyword_performance, KEYWORDS),
+    ("visualization.create_traffic_sources_chart", visualization.create_traffic_sources_chart, px_traffic_sources_chart, TRAFFIC),
+    ("visualization.create_optimization_matrix", visualization.create_optimization_matrix, px_optimization_matrix, OPTIMIZATION),
+    ("chart_specs errc_actions", chart_specs._errc_actions, px_errc_actions, ([1, 2, 3, 2],)),
+    ("chart_specs keyword_performance", chart_specs._keyword_performance, px_report_keyword_performance, KEYWORDS),
+    ("chart_specs traffic_sources", chart_specs._traffic_sources, px_report_traffic_sources, TRAFFIC),
+]
+
+
+def _plain(value):
+    """Figure JSON with typed and numpy arrays as lists, so px and go output compare equal"""
+    if isinstance(value, dict):
+        if "bdata" in value and "dtype" in value:
+            # Typed arrays that plotly base64-encodes
+            return np.frombuffer(base64.b64decode(value["bdata"]), dtype=value["dtype"]).tolist()
+        return {k: _plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [_plain(v) for v in (value.tolist() if isinstance(value, np.ndarray) else value)]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def equivalent(fast_figure, reference_figure) -> bool:
+    return _plain(fast_figure.to_plotly_json()) == _plain(reference_figure.to_plotly_json())
+
+
+def _time_per_call(fn, args, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(*args)
+    return (time.perf_counter() - started) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara os gráficos com graph_objects e com plotly.express")
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    print(f"{'Gráfico':45} {'px (ms)':>9} {'go (ms)':>9} {'ganho':>7}  equivalente")
+    for name, fast, reference, case_args in CASES:
+        # Memoized builders are measured without their cache
+        fast = getattr(fast, "uncached", fast)
+        same = equivalent(fast(*case_args), reference(*case_args))
+        px_time = _time_per_call(reference, case_args, args.repeat)
+        go_time = _time_per_call(fast, case_args, args.repeat)
+        print(f"{name:45} {px_time * 1000:9.2f} {go_time * 1000:9.2f} {px_time / go_time:6.1f}x  {'sim' if same else 'NÃO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+from typing import Any, Callable, Dict
+
+import plotly.graph_objects as go
+
+from fast_charts import cartesian_layout, colorway, size_reference
+from figure_cache import memoize_figure
+from utils import generate_bar_chart, generate_line_chart, generate_radar_chart
+
+_BUILDERS: Dict[str, Callable[..., go.Figure]] = {}
+
+
+def chart_spec(kind: str, **data) -> Dict[str, Any]:
+    """
+    Lightweight, JSON-serializable description of a chart
+
+    Reports keep these in ``report['visualizations']`` instead of Plotly
+    figures; build_figure materializes them when they are rendered.
+    """
+    if kind not in _BUILDERS:
+        raise ValueError(f"Tipo de gráfico desconhecido: {kind}")
+    return dict(data, kind=kind)
+
+
+def _builder(kind: str):
+    def register(fn):
+        _BUILDERS[kind] = fn
+        return fn
+    return register
+
+
+def build_figure(spec) -> go.Figure:
+    """
+    Plotly figure for a chart spec
+
+    Every builder is memoized (see figure_cache), so the figure is built at
+    most once while it stays cached; it is shared with later renders of the
+    same spec and must not be modified. Figures (from reports generated
+    before chart specs) are returned unchanged.
+    """
+    if isinstance(spec, go.Figure):
+        return spec
+    data = {key: value for key, value in spec.items() if key != "kind"}
+    return _BUILDERS[spec["kind"]](**data)
+
+
+# The generic builders from utils are memoized there
+
+@_builder("radar")
+def _radar(categories, values, title):
+    return generate_radar_chart(categories, values, title)
+
+
+@_builder("bar")
+def _bar(x, y, title, x_label, y_label):
+    return generate_bar_chart(x, y, title, x_label, y_label)
+
+
+@_builder("line")
+def _line(x, y, title, x_label, y_label):
+    return generate_line_chart(x, y, title, x_label, y_label)
+
+
+@_builder("strategy_canvas")
+@memoize_figure
+def _strategy_canvas(factors, your_values, industry_values):
+    """Strategy canvas of the Blue Ocean report"""
+    fig = go.Figure()
+
+    fig.add_trace(go.Scatter(
+        x=factors,
+        y=your_values,
+        name='Sua Empresa',
+        line=dict(color='blue', width=4)
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=factors,
+        y=industry_values,
+        name='Concorrentes',
+        line=dict(color='red', width=4)
+    ))
+
+    fig.update_layout(
+        title="Canvas Estratégico: Sua Empresa vs. Concorrentes",
+        xaxis_title="Fatores de Competição",
+        yaxis_title="Nível de Oferta",
+        yaxis=dict(range=[0, 10])
+    )
+
+    return fig
+
+
+@_builder("errc_actions")
+@memoize_figure
+def _errc_actions(counts):
+    """Number of elements in each ERRC action of the Blue Ocean report"""
+    actions = ["Eliminar", "Reduzir", "Aumentar", "Criar"]
+    colors = colorway()
+
+    traces = [
+        go.Bar(
+            x=[action],
+            y=[count],
+            hovertemplate=f"color={action}<br>Ações Estratégicas=%{{x}}<br>Quantidade de Elementos=%{{y}}<extra></extra>",
+            legendgroup=action,
+            marker=dict(color=colors[i % len(colors)], pattern=dict(shape="")),
+            name=action,
+            orientation="v",
+            showlegend=True,
+            textposition="auto",
+            xaxis="x",
+            yaxis="y"
+        )
+        for i, (action, count) in enumerate(zip(actions, counts))
+    ]
+    return go.Figure(traces, cartesian_layout(
+        "Framework ERRC (Eliminar-Reduzir-Aumentar-Criar)",
+        "Ações Estratégicas",
+        "Quantidade de Elementos",
+        legend_title="color",
+        barmode="relative"
+    ))
+
+
+@_builder("performance_projection")
+@memoize_figure
+def _performance_projection():
+    """Blue Ocean vs. traditional market growth projection"""
+    years = [f"Ano {i}" for i in range(1, 6)]
+    blue_ocean = [100, 150, 225, 340, 510]  # 50% growth YoY
+    red_ocean = [100, 110, 121, 133, 146]   # 10% growth YoY
+
+    fig = go.Figure()
+
+    fig.add_trace(go.Scatter(
+        x=years,
+        y=blue_ocean,
+        name='Estratégia Blue Ocean',
+        line=dict(color='blue', width=3)
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=years,
+        y=red_ocean,
+        name='Mercado Tradicional',
+        line=dict(color='red', width=3)
+    ))
+
+    fig.update_layout(
+        title="Projeção de Performance (5 anos)",
+        xaxis_title="Período",
+        yaxis_title="Crescimento (%)"
+    )
+
+    return fig
+
+
+@_builder("keyword_performance")
+@memoize_figure
+def _keyword_performance(keywords, positions, search_volumes):
+    return go.Figure(
+        go.Scatter(
+            x=list(keywords),
+            y=list(positions),
+            hovertemplate="Palavras-chave=%{x}<br>Posição nos Resultados de Busca=%{y}<br>size=%{marker.size}<extra></extra>",
+            legendgroup="",
+            marker=dict(
+                color=colorway()[0],
+                size=list(search_volumes),
+                sizemode="area",
+                sizeref=size_reference(search_volumes),
+                symbol="circle"
+            ),
+            mode="markers",
+            name="",
+            orientation="v",
+            showlegend=False,
+            xaxis="x",
+            yaxis="y"
+        ),
+        cartesian_layout(
+            "Performance de Palavras-chave",
+            "Palavras-chave",
+            "Posição nos Resultados de Busca",
+            legend=dict(itemsizing="constant")
+        )
+    )
+
+
+@_builder("traffic_sources")
+@memoize_figure
+def _traffic_sources(sources, percentages):
+    return go.Figure(
+        go.Pie(
+            labels=list(sources),
+            values=list(percentages),
+            domain=dict(x=[0.0, 1.0], y=[0.0, 1.0]),
+            hole=0.4,
+            hovertemplate="label=%{label}<br>value=%{value}<extra></extra>",
+            legendgroup="",
+            name="",
+            showlegend=True
+        ),
+        dict(legend=dict(tracegroupgap=0), title=dict(text="Fontes de Tráfego"))
+    )
+
+
+@_builder("optimization_opportunities")
+@memoize_figure
+def _optimization_opportunities(areas, impact, difficulty):
+    fig = go.Figure()
+
+    fig.add_trace(go.Bar(
+        name='Impacto',
+        x=areas,
+        y=impact,
+        marker_color='blue'
+    ))
+
+    fig.add_trace(go.Bar(
+        name='Dificuldade',
+        x=areas,
+        y=difficulty,
+        marker_color='red'
+    ))
+
+    fig.update_layout(
+        barmode='group',
+        title="Oportunidades de Otimização",
+        xaxis_title="Áreas",
+        yaxis_title="Pontuação"
+    )
+
+    return fig
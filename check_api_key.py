@@ -5,6 +5,8 @@ import requests
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
+from llm_transport import get_openai_client
+
 # Carrega as variáveis de ambiente do arquivo .env
 load_dotenv()
 
@@ -32,7 +34,7 @@ def check_api_key():
         return False
 
     print(f"\n🔑 Usando API key: {api_key[:4]}...{api_key[-4:] if len(api_key) > 8 else ''}")
-    client = openai.OpenAI(api_key=api_key)
+    client = get_openai_client(api_key)
     
     try:
         # Check if API key is valid and has permissions
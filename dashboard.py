@@ -4,31 +4,36 @@ import plotly.express as px
 from datetime import datetime
 import uuid
 
+from report_repository import get_report_repository
+
+# Reports listed per page in "Seus Relatórios" (default and choices)
+REPORTS_PAGE_SIZE = 20
+REPORTS_PAGE_SIZES = [10, 20, 50, 100]
+
 def render_dashboard():
     """
     Render the dashboard with user reports and metrics
     """
-    if not st.session_state.reports:
+    repository = get_report_repository()
+    wallet_address = st.session_state.wallet_address
+    total_reports = repository.count(wallet_address)
+    
+    if not total_reports:
         st.info("Você ainda não gerou nenhum relatório. Gere seu primeiro relatório na aba 'Gerar Novo Relatório'.")
         return
     
     # Display summary metrics
+    report_types = repository.count_by_type(wallet_address)
     col1, col2, col3 = st.columns(3)
     with col1:
-        st.metric("Total de Relatórios", len(st.session_state.reports))
+        st.metric("Total de Relatórios", total_reports)
     with col2:
-        # Count report types
-        report_types = {}
-        for report in st.session_state.reports:
-            report_type = report['report_type_display']
-            report_types[report_type] = report_types.get(report_type, 0) + 1
-        
         most_common_type = max(report_types.items(), key=lambda x: x[1])[0]
         st.metric("Tipo mais comum", most_common_type)
     with col3:
         # Get the date of the most recent report
-        most_recent_date = max([report['generated_date'] for report in st.session_state.reports])
-        st.metric("Relatório mais recente", most_recent_date)
+        most_recent = repository.list_reports(wallet_address, limit=1)[0]
+        st.metric("Relatório mais recente", most_recent['generated_date'])
     
     # Display reports by type chart
     report_type_df = pd.DataFrame({
@@ -48,33 +53,95 @@ def render_dashboard():
     # Display reports table
     st.subheader("Seus Relatórios")
     
-    # Create a dataframe with report details
-    reports_data = []
-    for report in st.session_state.reports:
-        reports_data.append({
-            'ID': report['id'],
-            'Título': report['title'],
-            'Tipo': report['report_type_display'],
-            'Data de Geração': report['generated_date']
-        })
+    col1, col2, col3 = st.columns([3, 1, 1])
+    with col1:
+        search = st.text_input(
+            "Buscar por título ou tipo",
+            key="reports_search",
+            on_change=_reset_report_pages
+        ).strip()
+    with col2:
+        page_size = st.selectbox(
+            "Por página",
+            REPORTS_PAGE_SIZES,
+            index=REPORTS_PAGE_SIZES.index(REPORTS_PAGE_SIZE),
+            key="reports_page_size",
+            on_change=_reset_report_pages
+        )
+    with col3:
+        compact = st.toggle("Tabela compacta", value=True, key="reports_compact")
+    
+    # Cursors of the pages already visited; the last one is the current page
+    cursors = st.session_state.setdefault("reports_cursors", [None])
+    reports, next_cursor = repository.page_reports(
+        wallet_address,
+        search=search or None,
+        limit=page_size,
+        after=cursors[-1]
+    )
     
-    reports_df = pd.DataFrame(reports_data)
+    if not reports:
+        st.info("Nenhum relatório encontrado para esta busca.")
+    elif compact:
+        _report_table(reports)
+    else:
+        _report_list(reports)
     
-    # Display as a table with view buttons
-    for i, row in reports_df.iterrows():
+    # Page navigation
+    matching = repository.count(wallet_address, search=search or None) if search else total_reports
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button("← Anteriores", disabled=len(cursors) == 1, key="reports_previous"):
+            cursors.pop()
+            st.rerun()
+    with col2:
+        page_count = max(1, (matching + page_size - 1) // page_size)
+        st.caption(f"Página {len(cursors)} de {page_count} · {matching} relatórios")
+    with col3:
+        if st.button("Próximos →", disabled=next_cursor is None, key="reports_next"):
+            cursors.append(next_cursor)
+            st.rerun()
+
+def _reset_report_pages():
+    """Go back to the first page when the search or the page size changes"""
+    st.session_state.reports_cursors = [None]
+
+def _open_report(report_id):
+    # The report id is mirrored in the URL so a refresh shows the same report
+    st.session_state.current_report_id = report_id
+    st.query_params["report"] = report_id
+    st.session_state.current_page = "report"
+    st.rerun()
+
+def _report_table(reports):
+    """Compact table of a page of reports; selecting a row opens the report"""
+    table = {
+        "Título": [report['title'] for report in reports],
+        "Tipo": [report['report_type_display'] for report in reports],
+        "Data": [report['generated_date'] for report in reports],
+        "Recomendações": [report['recommendations'] for report in reports],
+    }
+    event = st.dataframe(
+        table,
+        hide_index=True,
+        use_container_width=True,
+        on_select="rerun",
+        selection_mode="single-row",
+        key="reports_table"
+    )
+    if event.selection.rows:
+        _open_report(reports[event.selection.rows[0]]['id'])
+
+def _report_list(reports):
+    """A page of reports, one row with a view button each"""
+    for report in reports:
         col1, col2, col3, col4 = st.columns([3, 2, 2, 1])
         with col1:
-            st.write(f"**{row['Título']}**")
+            st.write(f"**{report['title']}**")
         with col2:
-            st.write(row['Tipo'])
+            st.write(report['report_type_display'])
         with col3:
-            st.write(row['Data de Geração'])
+            st.write(report['generated_date'])
         with col4:
-            if st.button("Visualizar", key=f"view_{row['ID']}"):
-                # Find the report in the session state
-                for report in st.session_state.reports:
-                    if report['id'] == row['ID']:
-                        # Set the current page to report view and store the report ID
-                        st.session_state.current_report = report
-                        st.session_state.current_page = "report"
-                        st.rerun()
+            if st.button("Visualizar", key=f"view_{report['id']}"):
+                _open_report(report['id'])
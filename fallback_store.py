@@ -0,0 +1,417 @@
+import re
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Optional
+
+# Placeholders use the {field} syntax inside string values of the payloads
+_PLACEHOLDER = re.compile(r"\{(\w+)\}")
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class FallbackTemplate:
+    """
+    Immutable default analysis of one report type
+
+    The payload is frozen once and its placeholders are checked against
+    ``fields``; each call fills a fresh copy (placeholders substituted in the
+    string values) that callers are free to mutate.
+    """
+
+    def __init__(self, report_type: str, payload: Dict[str, Any], fields: Iterable[str]):
+        self.report_type = report_type
+        self.fields = frozenset(fields)
+        self._check(payload)
+        self.payload = _freeze(payload)
+
+    def _check(self, value: Any) -> None:
+        """Reject unknown placeholders and values that aren't plain JSON"""
+        if isinstance(value, str):
+            for field in _PLACEHOLDER.findall(value):
+                if field not in self.fields:
+                    raise ValueError(f"Placeholder desconhecido '{field}' no fallback '{self.report_type}'")
+        elif isinstance(value, dict):
+            for item in value.values():
+                self._check(item)
+        elif isinstance(value, list):
+            for item in value:
+                self._check(item)
+        elif not (value is None or isinstance(value, (bool, int, float))):
+            raise TypeError(f"Valor não suportado no fallback '{self.report_type}': {value!r}")
+
+    @staticmethod
+    def _filled(value: Any, values: Dict[str, str]) -> Any:
+        """Mutable copy of a frozen value with its placeholders filled"""
+        if isinstance(value, str):
+            return _PLACEHOLDER.sub(lambda match: values[match.group(1)], value)
+        if isinstance(value, MappingProxyType):
+            return {key: FallbackTemplate._filled(item, values) for key, item in value.items()}
+        if isinstance(value, tuple):
+            return [FallbackTemplate._filled(item, values) for item in value]
+        return value
+
+    def keys(self):
+        return self.payload.keys()
+
+    def section(self, key: str, values: Dict[str, str]) -> Any:
+        """Return a fresh copy of one top-level section"""
+        return self._filled(self.payload[key], values)
+
+    def fill(self, values: Dict[str, str]) -> Dict[str, Any]:
+        """Return a fresh copy of the whole payload"""
+        return self._filled(self.payload, values)
+
+
+# Default analyses, served when OpenAI can't be reached or a section is missing
+BUSINESS_MAP_FALLBACK = {
+    "strengths": [
+        "Posicionamento único no mercado de {industry}",
+        "Equipe comprometida",
+        "Produto com diferenciais claros"
+    ],
+    "weaknesses": [
+        "Processos que podem ser otimizados",
+        "Dependência de poucos canais de aquisição",
+        "Escalabilidade limitada no modelo atual"
+    ],
+    "opportunities": [
+        "Expandir para mercados adjacentes",
+        "Desenvolver novas linhas de produtos/serviços",
+        "Parcerias estratégicas com outros players de {industry}"
+    ],
+    "threats": [
+        "Novos entrantes com modelos disruptivos",
+        "Mudanças regulatórias no setor",
+        "Pressão por redução de preços"
+    ],
+    "recommendations": [
+        {
+            "title": "Otimização de Processos",
+            "description": "Implementar melhorias nos processos internos de {business_name} para aumentar eficiência operacional.",
+            "action_items": [
+                "Mapear processos atuais e identificar gargalos",
+                "Implementar ferramentas de automação",
+                "Treinar equipe em novas metodologias"
+            ]
+        },
+        {
+            "title": "Diversificação de Canais",
+            "description": "Expandir os canais de aquisição de {business_name} para reduzir dependências e aumentar alcance.",
+            "action_items": [
+                "Testar novos canais de marketing",
+                "Desenvolver programa de parcerias",
+                "Implementar estratégia de conteúdo"
+            ]
+        },
+        {
+            "title": "Inovação de Produto",
+            "description": "Desenvolver novos produtos/serviços que complementem a oferta atual de {business_name}.",
+            "action_items": [
+                "Realizar pesquisa com clientes",
+                "Desenvolver MVPs para testar conceitos",
+                "Estabelecer processo de inovação contínua"
+            ]
+        }
+    ],
+    "categories": [
+        "Inovação",
+        "Marketing",
+        "Operações",
+        "Finanças",
+        "Atendimento",
+        "Produto"
+    ],
+    "values": [
+        7,
+        6,
+        8,
+        7,
+        9,
+        8
+    ],
+    "market_data": {
+        "Qualidade": 8,
+        "Preço": 7,
+        "Atendimento": 9,
+        "Inovação": 8,
+        "Alcance": 6
+    },
+    "growth_data": {
+        "Q1": 100,
+        "Q2": 120,
+        "Q3": 150,
+        "Q4": 200
+    }
+}
+
+BLUE_OCEAN_FALLBACK = {
+    "eliminate": [
+        "Funcionalidades complexas raramente utilizadas",
+        "Processos burocráticos que atrasam entregas",
+        "Dependência de intermediários na cadeia de valor"
+    ],
+    "reduce": [
+        "Custos operacionais através de automação",
+        "Tempo de implementação/entrega",
+        "Barreiras de adoção para novos clientes"
+    ],
+    "raise": [
+        "Experiência do usuário e facilidade de uso",
+        "Transparência e comunicação com clientes",
+        "Valor percebido do produto/serviço"
+    ],
+    "create": [
+        "Modelo de precificação baseado em resultados",
+        "Comunidade de usuários e co-criação",
+        "Integração perfeita com o ecossistema do cliente"
+    ],
+    "canvas_factors": [
+        "Preço",
+        "Facilidade de uso",
+        "Personalização",
+        "Suporte",
+        "Integração",
+        "Inovação"
+    ],
+    "your_values": [
+        6,
+        9,
+        10,
+        8,
+        9,
+        10
+    ],
+    "industry_values": [
+        8,
+        5,
+        4,
+        6,
+        5,
+        6
+    ],
+    "recommendations": [
+        {
+            "title": "Redefina a proposta de valor",
+            "description": "Crie uma nova curva de valor para {business_name} focando em elementos altamente valorizados pelos clientes mas negligenciados pelo mercado.",
+            "action_items": [
+                "Mapear elementos que podem ser eliminados",
+                "Identificar fatores a serem elevados acima do padrão",
+                "Desenvolver novos elementos nunca oferecidos no setor"
+            ]
+        },
+        {
+            "title": "Foco em não-clientes",
+            "description": "Expanda o mercado mirando pessoas/empresas que atualmente não utilizam {products_services}.",
+            "action_items": [
+                "Identificar os três níveis de não-clientes",
+                "Entender barreiras de adoção atuais",
+                "Desenvolver oferta específica para este público"
+            ]
+        },
+        {
+            "title": "Execução estratégica",
+            "description": "Implemente a estratégia Blue Ocean com foco, divergência e mensagem clara.",
+            "action_items": [
+                "Alinhar toda organização com a nova estratégia",
+                "Superar obstáculos organizacionais",
+                "Integrar execução à estratégia desde o início"
+            ]
+        }
+    ]
+}
+
+SEO_FALLBACK = {
+    "overall_score": 65,
+    "keywords_data": {
+        "keywords": [
+            "{keyword_1}",
+            "{keyword_2}",
+            "{keyword_3}",
+            "{keyword_4}",
+            "{keyword_5}"
+        ],
+        "positions": [
+            4,
+            12,
+            18,
+            7,
+            22
+        ],
+        "search_volumes": [
+            2400,
+            1300,
+            880,
+            3200,
+            590
+        ],
+        "competition": [
+            0.75,
+            0.45,
+            0.3,
+            0.8,
+            0.25
+        ]
+    },
+    "traffic_sources": {
+        "sources": [
+            "Organic",
+            "Direct",
+            "Social",
+            "Referral",
+            "Paid"
+        ],
+        "percentages": [
+            35,
+            25,
+            20,
+            15,
+            5
+        ]
+    },
+    "optimization_opportunities": [
+        {
+            "area": "Content",
+            "impact": 85,
+            "difficulty": 40,
+            "recommendations": [
+                "Create in-depth content targeting main keywords",
+                "Optimize meta titles and descriptions",
+                "Improve internal linking structure"
+            ]
+        },
+        {
+            "area": "Technical",
+            "impact": 65,
+            "difficulty": 70,
+            "recommendations": [
+                "Improve page loading speed",
+                "Fix mobile usability issues",
+                "Implement schema markup"
+            ]
+        },
+        {
+            "area": "Backlinks",
+            "impact": 75,
+            "difficulty": 80,
+            "recommendations": [
+                "Develop a link building strategy",
+                "Create linkable assets (infographics, studies)",
+                "Establish industry partnerships"
+            ]
+        },
+        {
+            "area": "Local SEO",
+            "impact": 55,
+            "difficulty": 30,
+            "recommendations": [
+                "Optimize Google Business Profile",
+                "Ensure NAP consistency",
+                "Generate local reviews"
+            ]
+        },
+        {
+            "area": "Mobile",
+            "impact": 80,
+            "difficulty": 50,
+            "recommendations": [
+                "Improve mobile page speed",
+                "Ensure responsive design",
+                "Optimize for mobile-first indexing"
+            ]
+        }
+    ],
+    "recommendations": [
+        {
+            "title": "Otimização de Conteúdo",
+            "description": "Criar e otimizar conteúdo para as principais palavras-chave identificadas para {website_url}.",
+            "action_items": [
+                "Desenvolver plano de conteúdo focado nas 5 palavras-chave principais",
+                "Otimizar metadados das páginas existentes",
+                "Melhorar estrutura de links internos"
+            ]
+        },
+        {
+            "title": "Melhorias Técnicas",
+            "description": "Resolver problemas técnicos que afetam o desempenho do site nos motores de busca.",
+            "action_items": [
+                "Melhorar velocidade de carregamento das páginas",
+                "Corrigir problemas de usabilidade móvel",
+                "Implementar marcação de esquema (schema markup)"
+            ]
+        },
+        {
+            "title": "Estratégia de Backlinks",
+            "description": "Desenvolver links de qualidade para aumentar a autoridade do domínio.",
+            "action_items": [
+                "Criar conteúdo link-worthy (infográficos, estudos)",
+                "Estabelecer parcerias no setor",
+                "Monitorar perfil de backlinks regularmente"
+            ]
+        }
+    ]
+}
+
+
+def _business_map_values(form_data):
+    return {
+        "business_name": form_data.get("business_name", "Empresa"),
+        "industry": form_data.get("industry", "Tecnologia"),
+    }
+
+
+def _blue_ocean_values(form_data):
+    return {
+        "business_name": form_data.get("business_name", "Empresa"),
+        "products_services": form_data.get("products_services", "Software"),
+    }
+
+
+def _seo_values(form_data):
+    keywords = form_data.get("keywords", "palavras-chave")
+    keyword_list = [k.strip() for k in keywords.split(",") if k.strip()]
+    if not keyword_list:
+        keyword_list = ["keyword1", "keyword2", "keyword3", "keyword4", "keyword5"]
+    # Ensure we have at least 5 keywords
+    while len(keyword_list) < 5:
+        keyword_list.append(f"keyword{len(keyword_list) + 1}")
+
+    values = {"website_url": form_data.get("website_url", "https://exemplo.com")}
+    values.update({f"keyword_{i}": keyword for i, keyword in enumerate(keyword_list[:5], 1)})
+    return values
+
+
+# Built once at import: report type -> (template, form data -> placeholder values)
+_FALLBACKS = {
+    "business_map": (
+        FallbackTemplate("business_map", BUSINESS_MAP_FALLBACK, ("business_name", "industry")),
+        _business_map_values,
+    ),
+    "blue_ocean": (
+        FallbackTemplate("blue_ocean", BLUE_OCEAN_FALLBACK, ("business_name", "products_services")),
+        _blue_ocean_values,
+    ),
+    "seo": (
+        FallbackTemplate("seo", SEO_FALLBACK, ("website_url",) + tuple(f"keyword_{i}" for i in range(1, 6))),
+        _seo_values,
+    ),
+}
+
+
+def _values(report_type: str, form_data: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    template, build_values = _FALLBACKS[report_type]
+    return {field: str(value) for field, value in build_values(form_data or {}).items()}
+
+
+def get_fallback(report_type: str, form_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Return a filled copy of the default analysis for ``report_type``"""
+    return _FALLBACKS[report_type][0].fill(_values(report_type, form_data))
+
+
+def get_fallback_section(report_type: str, key: str, form_data: Optional[Dict[str, Any]] = None) -> Any:
+    """Return a filled copy of a single section of the default analysis"""
+    return _FALLBACKS[report_type][0].section(key, _values(report_type, form_data))
@@ -0,0 +1,60 @@
+"""
+Helpers for building small charts directly with plotly.graph_objects
+
+plotly.express builds a DataFrame, groups it and validates every trace it
+creates, which costs tens of milliseconds for charts with a handful of points.
+The chart builders in utils, visualization and chart_specs use these helpers
+to create the same traces and layout that px would, straight from lists.
+chart_benchmark.py checks that the output matches px and measures the gain.
+"""
+from typing import Any, Dict, Hashable, List, Sequence
+
+import plotly.express as px
+import plotly.io as pio
+
+# px.scatter default for size_max
+SIZE_MAX = 20
+
+
+def colorway() -> Sequence[str]:
+    """Discrete colors px would use: the default template's colorway, else D3"""
+    template = pio.templates[pio.templates.default] if pio.templates.default else None
+    if template is not None and template.layout.colorway:
+        return template.layout.colorway
+    return px.colors.qualitative.D3
+
+
+def cartesian_layout(title: str, x_label: str, y_label: str, legend_title: str = None, **extra) -> Dict[str, Any]:
+    """Layout px gives a single-panel x/y chart"""
+    legend = {"tracegroupgap": 0}
+    if legend_title is not None:
+        legend["title"] = {"text": legend_title}
+    layout = {
+        "xaxis": {"anchor": "y", "domain": [0.0, 1.0], "title": {"text": x_label}},
+        "yaxis": {"anchor": "x", "domain": [0.0, 1.0], "title": {"text": y_label}},
+        "legend": legend,
+        "title": {"text": title},
+    }
+    for key, value in extra.items():
+        if key in layout and isinstance(value, dict):
+            layout[key].update(value)
+        else:
+            layout[key] = value
+    return layout
+
+
+def group_indices(keys: Sequence[Hashable]) -> Dict[Hashable, List[int]]:
+    """Positions of each distinct key, in order of first appearance (px color groups)"""
+    groups: Dict[Hashable, List[int]] = {}
+    for i, key in enumerate(keys):
+        groups.setdefault(key, []).append(i)
+    return groups
+
+
+def pick(values: Sequence[Any], indices: List[int]) -> List[Any]:
+    return [values[i] for i in indices]
+
+
+def size_reference(sizes: Sequence[float]) -> float:
+    """px sizeref for marker areas (largest marker is SIZE_MAX px wide)"""
+    return max(sizes, default=0) / SIZE_MAX ** 2
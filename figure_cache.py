@@ -0,0 +1,109 @@
+import functools
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict
+
+# Number of built figures kept in memory
+FIGURE_CACHE_SIZE = int(os.environ.get("FIGURE_CACHE_SIZE", 64))
+
+
+class UnhashableInput(TypeError):
+    """An argument input_key can't turn into a faithful key"""
+
+
+def _jsonable(value: Any) -> Any:
+    """Plain JSON version of pandas objects, numpy arrays and scalars, and sets"""
+    if hasattr(value, "columns") and hasattr(value, "to_dict"):
+        # DataFrame: index, columns and every value (repr() would truncate)
+        return {"dataframe": value.to_dict("split")}
+    if hasattr(value, "index") and hasattr(value, "tolist"):
+        # Series
+        return {"series": value.tolist(), "index": value.index.tolist(), "name": value.name}
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    raise UnhashableInput(f"Argumento sem chave estável: {type(value).__name__}")
+
+
+def input_key(*args, **kwargs) -> str:
+    """
+    Stable hash of a builder's arguments (equal data gives equal keys)
+
+    Raises UnhashableInput for arguments of other types than JSON values,
+    numpy and pandas objects and sets.
+    """
+    payload = json.dumps([args, kwargs], sort_keys=True, ensure_ascii=False, default=_jsonable)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class FigureCache:
+    """
+    Small thread-safe LRU of Plotly figures
+
+    Figures are cached as built (not as JSON copies), so a hit costs a dict
+    lookup. Cached figures are shared between callers and must not be
+    modified; st.plotly_chart only reads them.
+    """
+
+    def __init__(self, max_entries: int = FIGURE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._figures: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get_or_build(self, key: str, build: Callable[[], Any]) -> Any:
+        with self._lock:
+            figure = self._figures.get(key)
+            if figure is not None:
+                self._figures.move_to_end(key)
+                self._hits += 1
+                return figure
+            self._misses += 1
+
+        figure = build()
+
+        with self._lock:
+            self._figures[key] = figure
+            self._figures.move_to_end(key)
+            while len(self._figures) > self.max_entries:
+                self._figures.popitem(last=False)
+        return figure
+
+    def clear(self) -> None:
+        with self._lock:
+            self._figures.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._figures), "hits": self._hits, "misses": self._misses}
+
+
+figure_cache = FigureCache()
+
+
+def memoize_figure(fn: Callable) -> Callable:
+    """
+    Cache the figures returned by a chart builder, keyed by its arguments
+
+    Repeated calls with the same data (e.g. on every Streamlit rerun) return
+    the figure built the first time. Calls with arguments input_key can't
+    hash faithfully are not cached. The undecorated builder is available as
+    ``fn.uncached``.
+    """
+    name = f"{fn.__module__}.{fn.__qualname__}"
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        try:
+            key = input_key(name, *args, **kwargs)
+        except UnhashableInput:
+            return fn(*args, **kwargs)
+        return figure_cache.get_or_build(key, lambda: fn(*args, **kwargs))
+
+    wrapper.uncached = fn
+    return wrapper
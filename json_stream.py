@@ -0,0 +1,133 @@
+import json
+from typing import Any, Iterator, List, Tuple
+
+# Event kinds emitted by IncrementalJSONParser
+ITEM = "item"
+MEMBER = "member"
+
+
+class IncrementalJSONParser:
+    """
+    Incremental parser for a streamed top-level JSON object
+
+    Chunks of text are fed as they arrive and the parser emits events as soon
+    as a piece of the document is complete, without waiting for the closing
+    brace:
+
+    - ``("item", key, index, value)`` for each element of a top-level array,
+      e.g. one recommendation of ``"recommendations"``
+    - ``("member", key, value)`` for each complete top-level member, e.g. the
+      whole ``"strengths"`` list or the ``"market_data"`` object
+
+    The text received so far is kept (completed values are sliced from it),
+    along with a small scanner state, and each character is scanned once;
+    each completed value is decoded once with ``json.loads``.
+    """
+
+    def __init__(self):
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._key = None
+        self._key_start = None
+        self._member_start = None
+        self._item_start = None
+        self._item_index = 0
+        self._in_array = False
+        self._text = ""
+        self.finished = False
+
+    def feed(self, chunk: str) -> List[Tuple[Any, ...]]:
+        """Consume ``chunk`` and return the events completed by it"""
+        events = []
+        start = len(self._text)
+        self._text += chunk
+
+        for position in range(start, len(self._text)):
+            char = self._text[position]
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._member_start is None:
+                        self._key = json.loads(self._text[self._key_start:position + 1])
+                continue
+
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1 and self._member_start is None:
+                    self._key_start = position
+                elif self._depth == 2 and self._in_array and self._item_start is None:
+                    self._item_start = position
+                continue
+
+            if char == ":" and self._depth == 1 and self._member_start is None:
+                self._member_start = position + 1
+                continue
+
+            if char in "{[":
+                if self._depth == 1 and self._member_start is not None and char == "[":
+                    if not self._text[self._member_start:position].strip():
+                        self._in_array = True
+                        self._item_index = 0
+                elif self._depth == 2 and self._in_array and self._item_start is None:
+                    self._item_start = position
+                self._depth += 1
+                continue
+
+            if char in "}]":
+                self._depth -= 1
+                if self._depth == 2 and self._in_array and self._item_start is not None:
+                    events.append(self._emit_item(position + 1))
+                elif self._depth == 1 and self._in_array and char == "]":
+                    if self._item_start is not None:
+                        events.append(self._emit_item(position))
+                    self._in_array = False
+                elif self._depth == 0:
+                    if self._member_start is not None:
+                        events.append(self._emit_member(position))
+                    self.finished = True
+                continue
+
+            if char == ",":
+                if self._depth == 2 and self._in_array and self._item_start is not None:
+                    events.append(self._emit_item(position))
+                elif self._depth == 1 and self._member_start is not None:
+                    events.append(self._emit_member(position))
+                continue
+
+            if self._depth == 2 and self._in_array and self._item_start is None and not char.isspace():
+                # Start of a scalar array element (number, true, false, null)
+                self._item_start = position
+
+        return events
+
+    def _emit_item(self, end: int) -> Tuple[Any, ...]:
+        value = json.loads(self._text[self._item_start:end])
+        event = (ITEM, self._key, self._item_index, value)
+        self._item_index += 1
+        self._item_start = None
+        return event
+
+    def _emit_member(self, end: int) -> Tuple[Any, ...]:
+        value = json.loads(self._text[self._member_start:end])
+        event = (MEMBER, self._key, value)
+        self._key = None
+        self._member_start = None
+        self._in_array = False
+        return event
+
+    def result(self) -> Any:
+        """Decode the whole document received so far"""
+        return json.loads(self._text)
+
+
+def iter_json_events(chunks) -> Iterator[Tuple[Any, ...]]:
+    """Yield parser events for an iterable of text chunks"""
+    parser = IncrementalJSONParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
@@ -0,0 +1,100 @@
+import asyncio
+import json
+import random
+import time
+from typing import Callable, Iterable, Optional
+
+
+class LatencyModel:
+    """
+    Delay applied to simulated analyses (when OpenAI is not available)
+
+    ``wait`` blocks the calling thread and ``wait_async`` yields to the event
+    loop; both return immediately when the sampled delay is zero.
+    """
+
+    def delay(self) -> float:
+        return 0.0
+
+    def wait(self) -> float:
+        seconds = self.delay()
+        if seconds > 0:
+            time.sleep(seconds)
+        return seconds
+
+    async def wait_async(self) -> float:
+        seconds = self.delay()
+        if seconds > 0:
+            await asyncio.sleep(seconds)
+        return seconds
+
+
+class ZeroLatency(LatencyModel):
+    """No delay at all (default, keeps tests and sample reports fast)"""
+
+    def __repr__(self):
+        return "ZeroLatency()"
+
+
+class FixedLatency(LatencyModel):
+    """The same delay on every call"""
+
+    def __init__(self, seconds: float):
+        self.seconds = max(0.0, seconds)
+
+    def delay(self) -> float:
+        return self.seconds
+
+    def __repr__(self):
+        return f"FixedLatency({self.seconds})"
+
+
+class SampledLatency(LatencyModel):
+    """Delays drawn at random from recorded production latencies"""
+
+    def __init__(self, samples: Iterable[float], seed: Optional[int] = None):
+        self.samples = [float(s) for s in samples if s is not None and float(s) >= 0]
+        self._random = random.Random(seed)
+
+    @classmethod
+    def from_file(cls, path: str, seed: Optional[int] = None) -> "SampledLatency":
+        """Load samples from a JSON list or a file with one number per line"""
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read().strip()
+        if text.startswith("["):
+            samples = json.loads(text)
+        else:
+            samples = [line for line in text.splitlines() if line.strip()]
+        return cls(samples, seed)
+
+    def delay(self) -> float:
+        if not self.samples:
+            return 0.0
+        return self._random.choice(self.samples)
+
+    def __repr__(self):
+        return f"SampledLatency({len(self.samples)} amostras)"
+
+
+def latency_model_from_spec(spec: Optional[str], recorded: Optional[Callable[[], Iterable[float]]] = None) -> LatencyModel:
+    """
+    Build a latency model from a SIMULATED_LATENCY spec
+
+    - ``zero`` (or empty): no delay
+    - ``fixed:1.5``: fixed delay in seconds
+    - ``sampled:latencies.json``: samples read from a file
+    - ``sampled``: samples returned by ``recorded`` (e.g. the latencies
+      stored in the response cache)
+    """
+    spec = (spec or "zero").strip()
+    kind, _, argument = spec.partition(":")
+    kind = kind.lower()
+    if kind in ("", "zero", "none", "0"):
+        return ZeroLatency()
+    if kind == "fixed":
+        return FixedLatency(float(argument or 0))
+    if kind == "sampled":
+        if argument:
+            return SampledLatency.from_file(argument)
+        return SampledLatency(recorded() if recorded else [])
+    raise ValueError(f"Modelo de latência inválido: {spec}")
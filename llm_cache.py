@@ -0,0 +1,156 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+class ResponseCache:
+    """
+    Persistent, content-addressed cache for LLM responses
+
+    Entries are keyed by a hash of everything that determines the model output
+    (model, system prompt, user prompt and response format) and stored in a
+    local SQLite database. Entries expire after ``ttl_seconds`` and the least
+    recently used ones are evicted once ``max_entries`` is exceeded.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float = 86400, max_entries: int = 1000):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._saved_seconds = 0.0
+        self._saved_tokens = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                content TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                latency REAL NOT NULL DEFAULT 0,
+                tokens INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model: str, system_prompt: str, prompt: str, response_format: Optional[Dict[str, Any]] = None) -> str:
+        """Build a stable cache key from the inputs that determine a completion"""
+        payload = json.dumps(
+            {
+                "model": model,
+                "system": system_prompt,
+                "prompt": prompt,
+                "response_format": response_format,
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached content for ``key`` or None on a miss"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content, created_at, latency, tokens FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+            if row is None:
+                self._misses += 1
+                return None
+
+            content, created_at, latency, tokens = row
+            if now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self._misses += 1
+                return None
+
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self._hits += 1
+            self._saved_seconds += latency
+            self._saved_tokens += tokens
+            return content
+
+    def set(self, key: str, content: str, latency: float = 0.0, tokens: int = 0) -> None:
+        """
+        Store ``content`` under ``key``
+
+        ``latency`` and ``tokens`` describe what the original request cost, so
+        later hits can report how much time and spend the cache saved.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO responses (key, content, created_at, last_access, latency, tokens)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (key, content, now, now, latency, tokens),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries and trim the table to ``max_entries`` (LRU)"""
+        self._conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+        count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                """
+                DELETE FROM responses WHERE key IN (
+                    SELECT key FROM responses ORDER BY last_access ASC LIMIT ?
+                )
+                """,
+                (overflow,),
+            )
+
+    def latencies(self) -> List[float]:
+        """Return the latency recorded for every cached response"""
+        with self._lock:
+            rows = self._conn.execute("SELECT latency FROM responses WHERE latency > 0").fetchall()
+        return [row[0] for row in rows]
+
+    def clear(self) -> None:
+        """Remove every cached entry and reset the counters"""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self._hits = 0
+            self._misses = 0
+            self._saved_seconds = 0.0
+            self._saved_tokens = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the latency/tokens saved by hits"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "entries": entries,
+                "saved_seconds": round(self._saved_seconds, 3),
+                "saved_tokens": self._saved_tokens,
+            }
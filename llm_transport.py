@@ -0,0 +1,113 @@
+import asyncio
+import importlib.util
+import threading
+import weakref
+from typing import Optional
+
+import httpx
+
+from config import EnvironmentManager
+
+_lock = threading.Lock()
+_http_client: Optional[httpx.Client] = None
+_openai_clients = {}
+# httpx.AsyncClient connections are bound to the event loop that opened them,
+# so async clients are pooled per loop
+_async_openai_clients = weakref.WeakKeyDictionary()
+
+
+def _env_float(key: str, default: str) -> float:
+    return float(EnvironmentManager.get(key, default))
+
+
+def http2_enabled() -> bool:
+    """HTTP/2 is used when requested and the optional ``h2`` package is installed"""
+    requested = EnvironmentManager.get("OPENAI_HTTP2", "false").lower() in ("1", "true", "yes")
+    return requested and importlib.util.find_spec("h2") is not None
+
+
+def transport_limits() -> httpx.Limits:
+    """Connection pool limits and keep-alive expiry for LLM traffic"""
+    return httpx.Limits(
+        max_connections=int(_env_float("OPENAI_HTTP_MAX_CONNECTIONS", "100")),
+        max_keepalive_connections=int(_env_float("OPENAI_HTTP_MAX_KEEPALIVE", "20")),
+        keepalive_expiry=_env_float("OPENAI_HTTP_KEEPALIVE_EXPIRY", "30"),
+    )
+
+
+def transport_timeout() -> httpx.Timeout:
+    """Per-phase timeouts: connect, read (time between bytes), write and pool wait"""
+    return httpx.Timeout(
+        connect=_env_float("OPENAI_HTTP_CONNECT_TIMEOUT", "5"),
+        read=_env_float("OPENAI_HTTP_READ_TIMEOUT", "120"),
+        write=_env_float("OPENAI_HTTP_WRITE_TIMEOUT", "30"),
+        pool=_env_float("OPENAI_HTTP_POOL_TIMEOUT", "10"),
+    )
+
+
+def get_http_client() -> httpx.Client:
+    """Return the process-wide pooled HTTP client used for every sync LLM call"""
+    global _http_client
+    with _lock:
+        if _http_client is None or _http_client.is_closed:
+            _http_client = httpx.Client(
+                limits=transport_limits(),
+                timeout=transport_timeout(),
+                http2=http2_enabled(),
+            )
+        return _http_client
+
+
+def base_url() -> Optional[str]:
+    """API base URL, e.g. the local mock_llm_server (None uses api.openai.com)"""
+    return EnvironmentManager.get("OPENAI_BASE_URL") or None
+
+
+def get_openai_client(api_key: Optional[str] = None):
+    """
+    Return an OpenAI client backed by the shared HTTP connection pool
+
+    Clients are cached per API key and base URL. SDK-level retries are
+    disabled because retries are handled by retry_policy.
+    """
+    from openai import OpenAI
+
+    api_key = api_key or EnvironmentManager.get("OPENAI_API_KEY")
+    key = (api_key, base_url())
+    with _lock:
+        client = _openai_clients.get(key)
+    if client is None:
+        client = OpenAI(api_key=api_key, base_url=key[1], http_client=get_http_client(), max_retries=0)
+        with _lock:
+            client = _openai_clients.setdefault(key, client)
+    return client
+
+
+def get_async_openai_client(api_key: Optional[str] = None):
+    """
+    Return an AsyncOpenAI client pooled for the running event loop
+
+    Must be called from inside a coroutine. Every coroutine on the same loop
+    (e.g. the shared AsyncAIClient loop) reuses the same connections.
+    """
+    from openai import AsyncOpenAI
+
+    api_key = api_key or EnvironmentManager.get("OPENAI_API_KEY")
+    key = (api_key, base_url())
+    loop = asyncio.get_running_loop()
+    with _lock:
+        clients = _async_openai_clients.setdefault(loop, {})
+        client = clients.get(key)
+        if client is None:
+            client = AsyncOpenAI(
+                api_key=api_key,
+                base_url=key[1],
+                http_client=httpx.AsyncClient(
+                    limits=transport_limits(),
+                    timeout=transport_timeout(),
+                    http2=http2_enabled(),
+                ),
+                max_retries=0,
+            )
+            clients[key] = client
+        return client
@@ -0,0 +1,117 @@
+"""
+Load test of the report generation path against mock_llm_server
+
+Starts a mock OpenAI-compatible server in-process (or uses --base-url), points
+openai_client at it and runs generate_report for every request with the given
+concurrency, then prints latency percentiles, throughput and the limiter,
+latency and server counters.
+
+Usage:
+    python load_test.py --requests 200 --concurrency 16 --latency lognormal:0.8,0.4 --rate-limit-rate 0.05
+"""
+import argparse
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+SAMPLE_FORMS = {
+    "business_map": {
+        "business_name": "Tech Solutions",
+        "industry": "Tecnologia",
+        "business_model": "SaaS",
+        "monthly_revenue": 120000,
+        "employees": 15,
+        "main_products": "Software de Gestão, Consultoria",
+        "target_audience": "Pequenas e Médias Empresas"
+    },
+    "blue_ocean": {
+        "business_name": "Inova Marketing",
+        "products_services": "Marketing Digital, Branding",
+        "competitors": "AgênciaX, MarketingPro",
+        "target_customers": "Startups e Empresas de Tecnologia"
+    },
+    "seo": {
+        "business_name": "Ecommerce Shop",
+        "website_url": "https://www.ecommerceshop.com",
+        "keywords": "ecommerce, loja online, produtos sustentáveis",
+        "competitors": "competitor1.com, competitor2.com"
+    }
+}
+
+
+def percentile(samples, percent):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga da geração de relatórios com o servidor mock da OpenAI")
+    parser.add_argument("--requests", type=int, default=60)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--mode", choices=("sync", "concurrent", "stream"), default="sync",
+                        help="sync: generate_report em threads; concurrent: generate_reports_concurrently; stream: stream_report em threads")
+    parser.add_argument("--base-url", help="Usa um servidor já em execução em vez de iniciar um mock local")
+    parser.add_argument("--latency", default="lognormal:0.8,0.4")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    server = None
+    if args.base_url is None:
+        from mock_llm_server import MockLLMServer
+        server = MockLLMServer(
+            latency=args.latency,
+            error_rate=args.error_rate,
+            rate_limit_rate=args.rate_limit_rate,
+            seed=args.seed
+        ).start()
+
+    # Must be set before openai_client is imported, it builds its client at import
+    os.environ["OPENAI_BASE_URL"] = args.base_url or server.base_url
+    os.environ.setdefault("OPENAI_API_KEY", "mock")
+    os.environ["OPENAI_CACHE_ENABLED"] = "false"
+    os.environ["MAX_CONCURRENT_REPORTS"] = str(args.concurrency)
+
+    import openai_client
+    import report_generator
+
+    report_types = list(SAMPLE_FORMS)
+    requests = [(report_types[i % len(report_types)], SAMPLE_FORMS[report_types[i % len(report_types)]]) for i in range(args.requests)]
+
+    def run_one(request):
+        started = time.perf_counter()
+        if args.mode == "stream":
+            for _ in report_generator.stream_report(*request):
+                pass
+        else:
+            report_generator.generate_report(*request)
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    if args.mode == "concurrent":
+        report_generator.generate_reports_concurrently(requests)
+        latencies = []
+    else:
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            latencies = list(executor.map(run_one, requests))
+    elapsed = time.perf_counter() - started
+
+    print(f"\nRelatórios: {args.requests} | concorrência: {args.concurrency} | modo: {args.mode}")
+    print(f"Tempo total: {elapsed:.2f}s | vazão: {args.requests / elapsed:.2f} relatórios/s")
+    if latencies:
+        print(
+            f"Latência por relatório: média {statistics.mean(latencies):.3f}s | "
+            f"p50 {percentile(latencies, 50):.3f}s | p95 {percentile(latencies, 95):.3f}s | "
+            f"p99 {percentile(latencies, 99):.3f}s"
+        )
+    print(f"Rate limiter: {openai_client.get_rate_limiter_stats()}")
+    print(f"Latência da OpenAI: {openai_client.get_latency_stats()}")
+    if server is not None:
+        print(f"Servidor mock: {server.stats()}")
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
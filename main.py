@@ -11,8 +11,10 @@ from forms import (
     render_blue_ocean_form, 
     render_seo_form
 )
-from report_generator import generate_report
-from utils import load_css, set_page_config, display_report
+from report_generator import REPORT_SECTIONS, restore_visualizations
+from report_repository import get_report_repository
+from report_jobs import DONE, FAILED, QUEUED, get_job_queue
+from utils import load_css, set_page_config, display_report, render_stream_event
 
 # Cache configuration
 @lru_cache(maxsize=10)
@@ -36,14 +38,21 @@ if 'wallet_address' not in st.session_state:
     st.session_state.wallet_address = ""
 if 'token_balance' not in st.session_state:
     st.session_state.token_balance = 0
-if 'reports' not in st.session_state:
-    st.session_state.reports = []
+if 'current_report_id' not in st.session_state:
+    # Like the job id below, the open report's id is kept in the URL
+    st.session_state.current_report_id = st.query_params.get("report")
 if 'current_page' not in st.session_state:
-    st.session_state.current_page = "home"
+    st.session_state.current_page = "report" if st.session_state.current_report_id else "home"
 if 'selected_report_type' not in st.session_state:
     st.session_state.selected_report_type = None
 if 'form_data' not in st.session_state:
     st.session_state.form_data = {}
+if 'reserved_job_id' not in st.session_state:
+    # Job whose token this session reserved (and refunds if it fails)
+    st.session_state.reserved_job_id = None
+if 'active_job_id' not in st.session_state:
+    # The job id is mirrored in the URL so a refresh can pick the job up again
+    st.session_state.active_job_id = st.query_params.get("job")
 
 # Main app
 def main():
@@ -72,6 +81,8 @@ def main():
     if not st.session_state.wallet_connected:
         show_landing_page()
     else:
+        if st.session_state.active_job_id and st.session_state.current_page != "form":
+            show_job_progress()
         if st.session_state.current_page == "home":
             show_dashboard()
         elif st.session_state.current_page == "form":
@@ -147,9 +158,11 @@ def show_dashboard():
                 st.session_state.current_page = "form"
                 st.rerun()
     
+    has_reports = get_report_repository().count(st.session_state.wallet_address) > 0
+    
     with tab2:
         st.header("Meus Relatórios")
-        if not st.session_state.reports:
+        if not has_reports:
             st.info("Você ainda não gerou nenhum relatório. Gere seu primeiro relatório na aba 'Gerar Novo Relatório'.")
         else:
             render_dashboard()
@@ -157,7 +170,7 @@ def show_dashboard():
     with tab3:
         st.header("Dashboard de Insights do Mercado")
         st.write("Visualize insights consolidados de todos os seus relatórios em um único painel.")
-        if not st.session_state.reports:
+        if not has_reports:
             st.info("Você ainda não gerou nenhum relatório. Gere seu primeiro relatório na aba 'Gerar Novo Relatório' para obter insights de mercado.")
         else:
             render_metro_dashboard()
@@ -186,65 +199,123 @@ def show_report_form():
     
     # Handle form submission
     if form_submitted:
+        if st.session_state.active_job_id:
+            st.warning("Aguarde a conclusão do relatório em andamento.")
         # Check token balance
-        if st.session_state.token_balance < 1:
+        elif st.session_state.token_balance < 1:
             st.error("Saldo de tokens insuficiente. Cada relatório custa 1 Token Xperience.")
             return
-        
-        # Process the report generation
-        progress_text = "Preparando seu relatório personalizado..."
-        progress_bar = st.progress(0, text=progress_text)
-        
-        try:
-            # Update progress to show we're starting
-            progress_bar.progress(10, text="Iniciando análise dos dados...")
-            
-            # Generate the report and update token balance
-            report = generate_report(
-                report_type=st.session_state.selected_report_type,
-                form_data=st.session_state.form_data
-            )
-            
-            # Update progress to show we're almost done
-            progress_bar.progress(80, text="Finalizando a geração do relatório...")
-            
-            # Add report to session state
-            st.session_state.reports.append(report)
+        else:
+            try:
+                job_id = get_job_queue().submit(
+                    st.session_state.selected_report_type,
+                    st.session_state.form_data,
+                    owner=st.session_state.wallet_address
+                )
+            except Exception as e:
+                st.error(f"Erro ao gerar relatório: {str(e)}")
+                return
             
-            # Deduct token
+            # Reserve the token now, it is refunded if the job fails (only
+            # by this session, which is the one that paid for it)
             st.session_state.token_balance -= 1
-            
-            # Show completion
-            progress_bar.progress(100, text="Relatório gerado com sucesso! ✨")
-            
-            # Navigate to report view
-            st.session_state.current_page = "report"
-            st.rerun()
-            
-        except Exception as e:
-            st.error(f"Erro ao gerar relatório: {str(e)}")
-            progress_bar.empty()
-        finally:
-            # Clean up the progress bar if we're not redirecting
-            if st.session_state.current_page != "report":
-                progress_bar.empty()
+            st.session_state.reserved_job_id = job_id
+            st.session_state.active_job_id = job_id
+            st.query_params["job"] = job_id
+    
+    if st.session_state.active_job_id:
+        show_job_progress()
+
+@st.fragment(run_every=1.0)
+def show_job_progress():
+    """
+    Poll the active report job, rendering its sections as they arrive
+    
+    The report is generated by the report_jobs worker pool, so this only
+    reads the job state; once the job is done the report is collected and
+    the app navigates to the report view.
+    """
+    job_id = st.session_state.active_job_id
+    owner = st.session_state.wallet_address
+    queue = get_job_queue()
+    # Jobs of other wallets (e.g. from a shared ?job= link) are not found
+    status = queue.status(job_id, owner=owner)
+    
+    if status is None:
+        st.warning("O relatório em andamento não foi encontrado (ele pode ter expirado).")
+        _clear_active_job()
+        return
+    
+    if status["status"] == FAILED:
+        queue.take(job_id, owner=owner)
+        st.error(f"Erro ao gerar relatório: {status['error']}")
+        if st.session_state.reserved_job_id == job_id:
+            st.session_state.token_balance += 1
+        _clear_active_job()
+        return
+    
+    if status["status"] == DONE:
+        report = queue.take(job_id, owner=owner)
+        if report is None:
+            # Already collected by another tab of this wallet
+            st.warning("O relatório em andamento não foi encontrado (ele pode ter expirado).")
+            _clear_active_job()
+            return
+        get_report_repository().save(report, owner)
+        st.session_state.current_report_id = report['id']
+        st.query_params["report"] = report['id']
+        _clear_active_job()
+        st.session_state.current_page = "report"
+        st.rerun()
+    
+    expected_sections = len(REPORT_SECTIONS.get(status["report_type"], ())) or 1
+    received = {}
+    with st.container():
+        st.subheader("Prévia da análise")
+        for event in queue.events(job_id, owner=owner):
+            render_stream_event(event, received)
+    
+    sections_done = len([key for key in received if not key.startswith('_')])
+    if status["status"] == QUEUED:
+        st.progress(0, text="Relatório na fila de geração...")
+    elif sections_done:
+        st.progress(min(int(90 * sections_done / expected_sections), 90), text="Recebendo análise da IA...")
+    else:
+        st.progress(0, text="Iniciando análise dos dados...")
+
+def _clear_active_job():
+    st.session_state.active_job_id = None
+    st.session_state.reserved_job_id = None
+    if "job" in st.query_params:
+        del st.query_params["job"]
 
 def show_report():
-    """Display the most recently generated report"""
+    """Display the selected report (or the most recently generated one)"""
     # Back button
     if st.button("← Voltar para o Dashboard"):
-        st.session_state.current_page = "home"
+        _close_report()
         st.rerun()
     
-    # Show the most recent report
-    if st.session_state.reports:
-        latest_report = st.session_state.reports[-1]
-        display_report(latest_report)
+    # The selected report is looked up by id (primary key), within the wallet
+    repository = get_report_repository()
+    if st.session_state.current_report_id:
+        report = repository.get_report(st.session_state.current_report_id, st.session_state.wallet_address)
+    else:
+        report = repository.latest(st.session_state.wallet_address)
+    
+    if report:
+        display_report(restore_visualizations(report))
     else:
         st.error("Nenhum relatório encontrado.")
-        st.session_state.current_page = "home"
+        _close_report()
         st.rerun()
 
+def _close_report():
+    st.session_state.current_report_id = None
+    st.session_state.current_page = "home"
+    if "report" in st.query_params:
+        del st.query_params["report"]
+
 if __name__ == "__main__":
     # Run the app
     main()
@@ -2,16 +2,23 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from datetime import datetime
+from datetime import timedelta
 import random
 import numpy as np
 
+from report_repository import get_report_repository
+from swot_themes import top_themes
+
 def render_metro_dashboard():
     """
     Render the metro-style dashboard showing market insights and business horizons
     based on aggregated data from all reports
     """
-    if not st.session_state.reports:
+    repository = get_report_repository()
+    wallet_address = st.session_state.wallet_address
+    total_reports = repository.count(wallet_address)
+    
+    if not total_reports:
         st.info("Você ainda não gerou nenhum relatório. Gere seu primeiro relatório na aba 'Gerar Novo Relatório'.")
         return
     
@@ -83,23 +90,12 @@ def render_metro_dashboard():
     st.sidebar.header("Filtros")
     
     # Get earliest and latest report dates
-    report_dates = []
-    for report in st.session_state.reports:
-        try:
-            date_str = report['generated_date']
-            # Parse date assuming format is DD/MM/YYYY HH:MM
-            report_dates.append(datetime.strptime(date_str, "%d/%m/%Y %H:%M"))
-        except:
-            # Skip if can't parse date
-            pass
-    
-    # Initialize filtered_reports to all reports by default
-    filtered_reports = st.session_state.reports.copy()
-    
-    # Default date range (if we have dates)
-    if report_dates:
-        min_date = min(report_dates).date()
-        max_date = max(report_dates).date()
+    date_range = repository.date_range(wallet_address)
+    start_date = end_date = None
+    
+    if date_range:
+        min_date = date_range[0].date()
+        max_date = date_range[1].date()
         
         start_date = st.sidebar.date_input(
             "Data Inicial",
@@ -114,28 +110,23 @@ def render_metro_dashboard():
             min_value=start_date,
             max_value=max_date
         )
-        
-        # Filter reports by date
-        filtered_reports = []
-        for report in st.session_state.reports:
-            try:
-                report_date = datetime.strptime(report['generated_date'], "%d/%m/%Y %H:%M").date()
-                if start_date <= report_date <= end_date:
-                    filtered_reports.append(report)
-            except:
-                # Include reports with unparseable dates
-                filtered_reports.append(report)
-        
-        # Show filter information
-        if len(filtered_reports) < len(st.session_state.reports):
-            st.sidebar.info(f"Exibindo {len(filtered_reports)} de {len(st.session_state.reports)} relatórios")
     
-    # Use filtered reports
-    business_map_reports = [r for r in filtered_reports if r['report_type'] == 'business_map']
-    blue_ocean_reports = [r for r in filtered_reports if r['report_type'] == 'blue_ocean']
-    seo_reports = [r for r in filtered_reports if r['report_type'] == 'seo']
+    # Metrics of the selected period (end date inclusive) come from the
+    # repository's incrementally maintained aggregates
+    end = end_date + timedelta(days=1) if end_date else None
+    aggregates = repository.aggregates(wallet_address, start=start_date, end=end)
+    is_filtered = aggregates['reports'] < total_reports
+    
+    # Show filter information
+    if is_filtered:
+        st.sidebar.info(f"Exibindo {aggregates['reports']} de {total_reports} relatórios")
     
-    # Data already collected and filtered above
+    # Only the latest business map report is loaded, for the radar section
+    business_map_reports = []
+    if aggregates['by_type'].get('business_map'):
+        business_map_reports = repository.load_reports(wallet_address, 'business_map', start=start_date, end=end, limit=1)
+    has_blue_ocean = bool(aggregates['by_type'].get('blue_ocean'))
+    has_seo = bool(aggregates['by_type'].get('seo'))
     
     # ==== Top metrics section ====
     st.subheader("Métricas Principais")
@@ -143,11 +134,11 @@ def render_metro_dashboard():
     
     with col1:
         # Use filtered reports count if we have filters, otherwise use total count
-        if report_dates and len(filtered_reports) < len(st.session_state.reports):
-            reports_count = len(filtered_reports)
+        if is_filtered:
+            reports_count = aggregates['reports']
             display_name = "Relatórios no Período"
         else:
-            reports_count = len(st.session_state.reports)
+            reports_count = total_reports
             display_name = "Total de Relatórios"
             
         st.markdown(f"""
@@ -158,11 +149,7 @@ def render_metro_dashboard():
         """, unsafe_allow_html=True)
     
     with col2:
-        # Calculate average monthly revenue from business map reports
-        avg_revenue = 0
-        if business_map_reports:
-            revenues = [r['form_data'].get('monthly_revenue', 0) for r in business_map_reports]
-            avg_revenue = sum(revenues) / len(revenues)
+        avg_revenue = aggregates['average_revenue']
         
         st.markdown(f"""
         <div class="metro-tile metro-tile-green">
@@ -172,10 +159,7 @@ def render_metro_dashboard():
         """, unsafe_allow_html=True)
     
     with col3:
-        # Count unique industries from business map reports
-        industries = set()
-        if business_map_reports:
-            industries = set([r['form_data'].get('industry', '') for r in business_map_reports])
+        industries = aggregates['industries']
         
         st.markdown(f"""
         <div class="metro-tile metro-tile-purple">
@@ -185,12 +169,10 @@ def render_metro_dashboard():
         """, unsafe_allow_html=True)
     
     with col4:
-        # Count total recommendations across filtered reports
-        if report_dates and len(filtered_reports) < len(st.session_state.reports):
-            total_recs = sum([len(r.get('recommendations', [])) for r in filtered_reports])
+        total_recs = aggregates['recommendations']
+        if is_filtered:
             display_name = "Recomendações no Período"
         else:
-            total_recs = sum([len(r.get('recommendations', [])) for r in st.session_state.reports])
             display_name = "Recomendações Geradas"
         
         st.markdown(f"""
@@ -211,26 +193,21 @@ def render_metro_dashboard():
             st.markdown('<div class="graph-container">', unsafe_allow_html=True)
             st.markdown("#### Análise SWOT Agregada")
             
-            # Collect all strengths and opportunities for word cloud
-            all_strengths = []
-            all_weaknesses = []
+            # Most mentioned themes, near-duplicates grouped (see swot_themes);
+            # the items come from the repository's per-day SWOT aggregates
+            top_strengths = top_themes(repository.swot_items('strengths', wallet_address, start=start_date, end=end))
+            top_weaknesses = top_themes(repository.swot_items('weaknesses', wallet_address, start=start_date, end=end))
             
-            for report in business_map_reports:
-                all_strengths.extend(report.get('strengths', []))
-                all_weaknesses.extend(report.get('weaknesses', []))
-            
-            # Create a simple table to display top strengths and weaknesses
-            if all_strengths and all_weaknesses:
-                top_strengths = all_strengths[:5]
-                top_weaknesses = all_weaknesses[:5]
-                
+            if top_strengths or top_weaknesses:
                 st.markdown("**Principais Forças:**")
-                for strength in top_strengths:
-                    st.markdown(f"✓ {strength}")
+                for strength, mentions in top_strengths:
+                    st.markdown(f"✓ {strength} ({mentions})")
                     
                 st.markdown("**Principais Fraquezas:**")
-                for weakness in top_weaknesses:
-                    st.markdown(f"✗ {weakness}")
+                for weakness, mentions in top_weaknesses:
+                    st.markdown(f"✗ {weakness} ({mentions})")
+                
+                st.caption("Entre parênteses, o número de menções de cada tema nos relatórios (variações citadas no mesmo relatório contam separadamente).")
             
             st.markdown('</div>', unsafe_allow_html=True)
         
@@ -239,144 +216,140 @@ def render_metro_dashboard():
             st.markdown("#### Desempenho por Área de Negócio")
             
             # Aggregate radar chart data from business map reports
-            if business_map_reports and 'visualizations' in business_map_reports[0]:
+            if business_map_reports:
                 # Extract categories and values from first report's radar chart
                 first_report = business_map_reports[0]
-                if 'radar_chart' in first_report['visualizations']:
-                    # Get data from the first report
-                    try:
-                        # Get data from the plotly figure
-                        radar_chart = first_report['visualizations']['radar_chart']
-                        categories = first_report.get('categories', ['Produto', 'Marketing', 'Operações', 'Financeiro', 'Inovação', 'Pessoas'])
-                        values = first_report.get('values', [7.5, 6.8, 7.2, 6.5, 8.1, 6.9])
-                        
-                        # Create radar chart
-                        fig = go.Figure()
-                        
-                        fig.add_trace(go.Scatterpolar(
-                            r=values,
-                            theta=categories,
-                            fill='toself',
-                            name='Desempenho Médio'
-                        ))
-                        
-                        fig.update_layout(
-                            polar=dict(
-                                radialaxis=dict(
-                                    visible=True,
-                                    range=[0, 10]
-                                )
-                            ),
-                            margin=dict(l=10, r=10, t=30, b=10)
-                        )
-                        
-                        st.plotly_chart(fig, use_container_width=True)
-                    except Exception as e:
-                        st.error(f"Erro ao renderizar o gráfico: {str(e)}")
-                        st.write("Usando valores padrão para o gráfico")
-                        # Use default values
-                        categories = ['Produto', 'Marketing', 'Operações', 'Financeiro', 'Inovação', 'Pessoas']
-                        values = [7.5, 6.8, 7.2, 6.5, 8.1, 6.9]
-                        
-                        fig = go.Figure()
-                        
-                        fig.add_trace(go.Scatterpolar(
-                            r=values,
-                            theta=categories,
-                            fill='toself',
-                            name='Desempenho Médio'
-                        ))
-                        
-                        fig.update_layout(
-                            polar=dict(
-                                radialaxis=dict(
-                                    visible=True,
-                                    range=[0, 10]
-                                )
-                            ),
-                            margin=dict(l=10, r=10, t=30, b=10)
-                        )
-                        
-                        st.plotly_chart(fig, use_container_width=True)
-            
+                # Get data from the first report
+                try:
+                    categories = first_report.get('categories', ['Produto', 'Marketing', 'Operações', 'Financeiro', 'Inovação', 'Pessoas'])
+                    values = first_report.get('values', [7.5, 6.8, 7.2, 6.5, 8.1, 6.9])
+                    
+                    # Create radar chart
+                    fig = go.Figure()
+                    
+                    fig.add_trace(go.Scatterpolar(
+                        r=values,
+                        theta=categories,
+                        fill='toself',
+                        name='Desempenho Médio'
+                    ))
+                    
+                    fig.update_layout(
+                        polar=dict(
+                            radialaxis=dict(
+                                visible=True,
+                                range=[0, 10]
+                            )
+                        ),
+                        margin=dict(l=10, r=10, t=30, b=10)
+                    )
+                    
+                    st.plotly_chart(fig, use_container_width=True)
+                except Exception as e:
+                    st.error(f"Erro ao renderizar o gráfico: {str(e)}")
+                    st.write("Usando valores padrão para o gráfico")
+                    # Use default values
+                    categories = ['Produto', 'Marketing', 'Operações', 'Financeiro', 'Inovação', 'Pessoas']
+                    values = [7.5, 6.8, 7.2, 6.5, 8.1, 6.9]
+                    
+                    fig = go.Figure()
+                    
+                    fig.add_trace(go.Scatterpolar(
+                        r=values,
+                        theta=categories,
+                        fill='toself',
+                        name='Desempenho Médio'
+                    ))
+                    
+                    fig.update_layout(
+                        polar=dict(
+                            radialaxis=dict(
+                                visible=True,
+                                range=[0, 10]
+                            )
+                        ),
+                        margin=dict(l=10, r=10, t=30, b=10)
+                    )
+                    
+                    st.plotly_chart(fig, use_container_width=True)
+        
             st.markdown('</div>', unsafe_allow_html=True)
     
     # Blue Ocean Strategy insights
-    if blue_ocean_reports:
+    if has_blue_ocean:
         st.markdown('<div class="graph-container">', unsafe_allow_html=True)
         st.markdown("#### Estratégia Blue Ocean: Fatores de Competição")
         
         # Aggregate strategy canvas data from blue ocean reports
-        if 'visualizations' in blue_ocean_reports[0]:
-            # We'll use a template for now (in a real app we'd aggregate the actual data)
-            factors = ['Preço', 'Facilidade de uso', 'Personalização', 'Suporte', 'Integração', 'Inovação']
-            your_values = [6, 9, 10, 8, 9, 10]
-            industry_values = [8, 5, 4, 6, 5, 6]
+        # We'll use a template for now (in a real app we'd aggregate the actual data)
+        factors = ['Preço', 'Facilidade de uso', 'Personalização', 'Suporte', 'Integração', 'Inovação']
+        your_values = [6, 9, 10, 8, 9, 10]
+        industry_values = [8, 5, 4, 6, 5, 6]
+        
+        # Create strategy canvas
+        try:
+            market_data = first_report.get('market_data', {
+                'Qualidade': 8,
+                'Preço': 7,
+                'Atendimento': 9,
+                'Inovação': 8,
+                'Alcance': 6
+            })
             
-            # Create strategy canvas
-            try:
-                market_data = first_report.get('market_data', {
-                    'Qualidade': 8,
-                    'Preço': 7,
-                    'Atendimento': 9,
-                    'Inovação': 8,
-                    'Alcance': 6
-                })
-                
-                fig = go.Figure()
-                
-                fig.add_trace(go.Bar(
-                    x=list(market_data.keys()),
-                    y=list(market_data.values()),
-                    name='Comparação com o Mercado',
-                    marker_color='rgb(55, 83, 109)'
-                ))
-                
-                fig.update_layout(
-                    title="Comparação com o Mercado",
-                    xaxis_title="Categorias",
-                    yaxis_title="Valores",
-                    yaxis=dict(range=[0, 10]),
-                    margin=dict(l=10, r=10, t=50, b=50)
-                )
-                
-                st.plotly_chart(fig, use_container_width=True)
-            except Exception as e:
-                st.error(f"Erro ao renderizar o gráfico de comparação com o mercado: {str(e)}")
+            fig = go.Figure()
             
-            try:
-                growth_data = first_report.get('growth_data', {
-                    'Q1': 100,
-                    'Q2': 120,
-                    'Q3': 150,
-                    'Q4': 200
-                })
-                
-                fig = go.Figure()
-                
-                fig.add_trace(go.Scatter(
-                    x=list(growth_data.keys()),
-                    y=list(growth_data.values()),
-                    mode='lines+markers',
-                    name='Potencial de Crescimento',
-                    line=dict(color='rgb(26, 118, 255)', width=3)
-                ))
-                
-                fig.update_layout(
-                    title="Potencial de Crescimento",
-                    xaxis_title="Período",
-                    yaxis_title="Crescimento (%)",
-                    margin=dict(l=10, r=10, t=50, b=50)
-                )
-                
-                st.plotly_chart(fig, use_container_width=True)
-            except Exception as e:
-                st.error(f"Erro ao renderizar o gráfico de potencial de crescimento: {str(e)}")
+            fig.add_trace(go.Bar(
+                x=list(market_data.keys()),
+                y=list(market_data.values()),
+                name='Comparação com o Mercado',
+                marker_color='rgb(55, 83, 109)'
+            ))
+            
+            fig.update_layout(
+                title="Comparação com o Mercado",
+                xaxis_title="Categorias",
+                yaxis_title="Valores",
+                yaxis=dict(range=[0, 10]),
+                margin=dict(l=10, r=10, t=50, b=50)
+            )
+            
+            st.plotly_chart(fig, use_container_width=True)
+        except Exception as e:
+            st.error(f"Erro ao renderizar o gráfico de comparação com o mercado: {str(e)}")
+        
+        try:
+            growth_data = first_report.get('growth_data', {
+                'Q1': 100,
+                'Q2': 120,
+                'Q3': 150,
+                'Q4': 200
+            })
+            
+            fig = go.Figure()
+            
+            fig.add_trace(go.Scatter(
+                x=list(growth_data.keys()),
+                y=list(growth_data.values()),
+                mode='lines+markers',
+                name='Potencial de Crescimento',
+                line=dict(color='rgb(26, 118, 255)', width=3)
+            ))
+            
+            fig.update_layout(
+                title="Potencial de Crescimento",
+                xaxis_title="Período",
+                yaxis_title="Crescimento (%)",
+                margin=dict(l=10, r=10, t=50, b=50)
+            )
+            
+            st.plotly_chart(fig, use_container_width=True)
+        except Exception as e:
+            st.error(f"Erro ao renderizar o gráfico de potencial de crescimento: {str(e)}")
         
         st.markdown('</div>', unsafe_allow_html=True)
     
     # SEO insights
-    if seo_reports:
+    if has_seo:
         col1, col2 = st.columns(2)
         
         with col1:
@@ -384,26 +357,25 @@ def render_metro_dashboard():
             st.markdown("#### Análise SEO: Palavras-chave")
             
             # Aggregate keyword data from SEO reports
-            if 'visualizations' in seo_reports[0]:
-                # For demo purposes, using simulated data
-                keywords = ['Produto A', 'Serviço B', 'Consultoria', 'Software', 'Solução']
-                positions = [4, 12, 18, 7, 22]
-                search_volumes = [2400, 1300, 880, 3200, 590]
-                
-                # Create scatter plot
-                fig = px.scatter(
-                    x=keywords,
-                    y=positions,
-                    size=search_volumes,
-                    color=keywords,
-                    title="Performance de Palavras-chave",
-                    labels={'x': 'Palavras-chave', 'y': 'Posição nos Resultados de Busca'},
-                )
-                
-                fig.update_yaxes(autorange="reversed")  # Reverse y-axis so lower numbers (better rankings) are at top
-                fig.update_layout(margin=dict(l=10, r=10, t=50, b=50))
-                
-                st.plotly_chart(fig, use_container_width=True)
+            # For demo purposes, using simulated data
+            keywords = ['Produto A', 'Serviço B', 'Consultoria', 'Software', 'Solução']
+            positions = [4, 12, 18, 7, 22]
+            search_volumes = [2400, 1300, 880, 3200, 590]
+            
+            # Create scatter plot
+            fig = px.scatter(
+                x=keywords,
+                y=positions,
+                size=search_volumes,
+                color=keywords,
+                title="Performance de Palavras-chave",
+                labels={'x': 'Palavras-chave', 'y': 'Posição nos Resultados de Busca'},
+            )
+            
+            fig.update_yaxes(autorange="reversed")  # Reverse y-axis so lower numbers (better rankings) are at top
+            fig.update_layout(margin=dict(l=10, r=10, t=50, b=50))
+            
+            st.plotly_chart(fig, use_container_width=True)
             
             st.markdown('</div>', unsafe_allow_html=True)
         
@@ -412,33 +384,29 @@ def render_metro_dashboard():
             st.markdown("#### Fontes de Tráfego")
             
             # Aggregate traffic sources data from SEO reports
-            if 'visualizations' in seo_reports[0]:
-                # For demo purposes, using simulated data
-                sources = ['Orgânico', 'Direto', 'Redes Sociais', 'Referral', 'Email']
-                traffic_values = [35, 25, 20, 15, 5]
-                
-                # Create pie chart
-                fig = px.pie(
-                    values=traffic_values,
-                    names=sources,
-                    title="Fontes de Tráfego",
-                    hole=0.4
-                )
-                
-                fig.update_layout(margin=dict(l=10, r=10, t=50, b=50))
-                
-                st.plotly_chart(fig, use_container_width=True)
+            # For demo purposes, using simulated data
+            sources = ['Orgânico', 'Direto', 'Redes Sociais', 'Referral', 'Email']
+            traffic_values = [35, 25, 20, 15, 5]
+            
+            # Create pie chart
+            fig = px.pie(
+                values=traffic_values,
+                names=sources,
+                title="Fontes de Tráfego",
+                hole=0.4
+            )
+            
+            fig.update_layout(margin=dict(l=10, r=10, t=50, b=50))
+            
+            st.plotly_chart(fig, use_container_width=True)
             
             st.markdown('</div>', unsafe_allow_html=True)
     
     # ==== Market Insights section ====
     st.subheader("Insights e Oportunidades de Mercado")
     
-    # Collect recommendations from filtered reports
-    all_recommendations = []
-    for report in filtered_reports:
-        if 'recommendations' in report:
-            all_recommendations.extend(report['recommendations'])
+    # Recommendations of the most recent reports in the period
+    top_recommendations = repository.recent_recommendations(wallet_address, start=start_date, end=end, limit=5)
     
     # Display top insights
     col1, col2 = st.columns(2)
@@ -466,7 +434,7 @@ def render_metro_dashboard():
             st.markdown('</div>', unsafe_allow_html=True)
     
     with col2:
-        if blue_ocean_reports:
+        if has_blue_ocean:
             st.markdown('<div class="insight-box">', unsafe_allow_html=True)
             st.markdown('<div class="insight-title">Estratégias Diferenciadas</div>', unsafe_allow_html=True)
             st.write("""
@@ -477,7 +445,7 @@ def render_metro_dashboard():
             """)
             st.markdown('</div>', unsafe_allow_html=True)
             
-        if seo_reports:
+        if has_seo:
             st.markdown('<div class="insight-box">', unsafe_allow_html=True)
             st.markdown('<div class="insight-title">Presença Digital</div>', unsafe_allow_html=True)
             st.write("""
@@ -492,10 +460,7 @@ def render_metro_dashboard():
     st.subheader("Recomendações Top 5")
     
     # If we have recommendations, display the top 5
-    if all_recommendations:
-        # Sort by priority (for this demo, we'll just take the first 5)
-        top_recommendations = all_recommendations[:5]
-        
+    if top_recommendations:
         for i, rec in enumerate(top_recommendations):
             st.markdown(f"""
             <div style="padding: 15px; margin-bottom: 10px; border-radius: 4px; background-color: white; box-shadow: 0 1px 3px rgba(0, 0, 0, 0.12);">
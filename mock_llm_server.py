@@ -0,0 +1,297 @@
+"""
+Local OpenAI-compatible server for offline and load testing
+
+Serves ``POST /v1/chat/completions`` (regular and streaming) and
+``GET /v1/models`` with configurable latency, error and 429 injection.
+Completions are synthesized from the request's ``json_schema`` response
+format, or from the report_schemas model whose keys the prompt mentions, so
+responses pass the app's validation.
+
+Usage:
+    python mock_llm_server.py --port 8089 --latency lognormal:0.8,0.4 --error-rate 0.02 --rate-limit-rate 0.05
+    OPENAI_BASE_URL=http://127.0.0.1:8089/v1 OPENAI_API_KEY=mock streamlit run main.py
+"""
+import argparse
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+from report_schemas import REPORT_MODELS, json_schema_format
+
+
+class LatencyDistribution:
+    """
+    Samples response latencies in seconds from a spec string
+
+    Supported specs: ``fixed:S``, ``uniform:MIN,MAX``, ``normal:MEAN,STD``,
+    ``lognormal:MEDIAN,SIGMA`` and ``exponential:MEAN``. Samples are never
+    negative.
+    """
+
+    def __init__(self, spec: str = "fixed:0", seed: Optional[int] = None):
+        self.spec = spec
+        kind, _, params = spec.partition(":")
+        self.kind = kind
+        self.params = [float(p) for p in params.split(",") if p] or [0.0]
+        if kind not in ("fixed", "uniform", "normal", "lognormal", "exponential"):
+            raise ValueError(f"Distribuição de latência desconhecida: {spec}")
+        self._random = random.Random(seed)
+
+    def sample(self) -> float:
+        p = self.params
+        if self.kind == "fixed":
+            value = p[0]
+        elif self.kind == "uniform":
+            value = self._random.uniform(p[0], p[1])
+        elif self.kind == "normal":
+            value = self._random.gauss(p[0], p[1])
+        elif self.kind == "lognormal":
+            value = self._random.lognormvariate(math.log(p[0]), p[1]) if p[0] > 0 else 0.0
+        else:
+            value = self._random.expovariate(1 / p[0]) if p[0] > 0 else 0.0
+        return max(0.0, value)
+
+
+def synthesize(schema: Dict[str, Any], root: Optional[Dict[str, Any]] = None, name: str = "item") -> Any:
+    """Build a deterministic value that satisfies a (strict) JSON schema"""
+    root = root or schema
+    if "$ref" in schema:
+        return synthesize(root["$defs"][schema["$ref"].split("/")[-1]], root, name)
+    kind = schema.get("type")
+    if kind == "object":
+        return {key: synthesize(value, root, key) for key, value in schema.get("properties", {}).items()}
+    if kind == "array":
+        # Every array has the same length so paired chart arrays line up
+        return [synthesize(schema.get("items", {}), root, f"{name} {i}") for i in range(1, 4)]
+    if kind == "integer":
+        return 5
+    if kind == "number":
+        return 5.5
+    if kind == "boolean":
+        return True
+    return name.replace("_", " ").capitalize()
+
+
+def _schema_for_request(body: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    response_format = body.get("response_format") or {}
+    if response_format.get("type") == "json_schema":
+        return response_format["json_schema"]["schema"]
+
+    # json_object requests: pick the report whose keys the prompt lists
+    text = " ".join(str(m.get("content", "")) for m in body.get("messages", []))
+    for model in REPORT_MODELS.values():
+        schema = json_schema_format(model)["json_schema"]["schema"]
+        if all(f'"{key}"' in text for key in schema["properties"]):
+            return schema
+    return None
+
+
+class MockLLMServer:
+    """
+    Threaded OpenAI-compatible HTTP server
+
+    ``error_rate`` and ``rate_limit_rate`` are the probabilities of answering
+    with a 500 or a 429 (with Retry-After). Streaming responses are split in
+    ``stream_chunk_chars`` pieces sent ``stream_chunk_delay`` seconds apart,
+    after the sampled latency has elapsed.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: str = "fixed:0",
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after: float = 0.5,
+        stream_chunk_chars: int = 40,
+        stream_chunk_delay: float = 0.01,
+        seed: Optional[int] = None
+    ):
+        self.latency = LatencyDistribution(latency, seed)
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.stream_chunk_chars = stream_chunk_chars
+        self.stream_chunk_delay = stream_chunk_delay
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "streams": 0, "errors": 0, "rate_limited": 0}
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "MockLLMServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="mock-llm-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+    def _draw(self):
+        """Decide the fate of a request: an injected error or a latency"""
+        with self._lock:
+            roll = self._random.random()
+        if roll < self.rate_limit_rate:
+            return "rate_limited"
+        if roll < self.rate_limit_rate + self.error_rate:
+            return "error"
+        return None
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, status, payload, headers=None):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path.rstrip("/").endswith("/models"):
+                    self._send_json(200, {"object": "list", "data": [{"id": "mock-model", "object": "model", "owned_by": "mock"}]})
+                else:
+                    self._send_json(404, {"error": {"message": "Not found", "type": "invalid_request_error"}})
+
+            def do_POST(self):
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    self._send_json(404, {"error": {"message": "Not found", "type": "invalid_request_error"}})
+                    return
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                server._count("requests")
+
+                failure = server._draw()
+                if failure == "rate_limited":
+                    server._count("rate_limited")
+                    self._send_json(
+                        429,
+                        {"error": {"message": "Rate limit reached (mock)", "type": "rate_limit_exceeded"}},
+                        {"retry-after-ms": str(int(server.retry_after * 1000)), "retry-after": str(math.ceil(server.retry_after))}
+                    )
+                    return
+                time.sleep(server.latency.sample())
+                if failure == "error":
+                    server._count("errors")
+                    self._send_json(500, {"error": {"message": "Internal error (mock)", "type": "server_error"}})
+                    return
+
+                schema = _schema_for_request(body)
+                content = json.dumps(synthesize(schema) if schema else {"message": "mock"}, ensure_ascii=False)
+                prompt_chars = sum(len(str(m.get("content", ""))) for m in body.get("messages", []))
+                usage = {
+                    "prompt_tokens": prompt_chars // 4,
+                    "completion_tokens": len(content) // 4,
+                    "total_tokens": prompt_chars // 4 + len(content) // 4
+                }
+                if body.get("stream"):
+                    server._count("streams")
+                    self._stream(body, content, usage)
+                else:
+                    self._send_json(200, {
+                        "id": f"chatcmpl-{uuid.uuid4().hex}",
+                        "object": "chat.completion",
+                        "created": int(time.time()),
+                        "model": body.get("model", "mock-model"),
+                        "choices": [{
+                            "index": 0,
+                            "message": {"role": "assistant", "content": content},
+                            "finish_reason": "stop"
+                        }],
+                        "usage": usage
+                    })
+
+            def _stream(self, body, content, usage):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+
+                completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+                base = {"id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()), "model": body.get("model", "mock-model")}
+
+                def send(payload):
+                    self.wfile.write(f"data: {json.dumps(payload, ensure_ascii=False)}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+
+                size = max(1, server.stream_chunk_chars)
+                for start in range(0, len(content), size):
+                    send(dict(base, choices=[{"index": 0, "delta": {"content": content[start:start + size]}, "finish_reason": None}]))
+                    time.sleep(server.stream_chunk_delay)
+                send(dict(base, choices=[{"index": 0, "delta": {}, "finish_reason": "stop"}]))
+                if (body.get("stream_options") or {}).get("include_usage"):
+                    send(dict(base, choices=[], usage=usage))
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor local compatível com a API da OpenAI para testes de carga")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", default="lognormal:0.8,0.4", help="fixed:S, uniform:MIN,MAX, normal:MEAN,STD, lognormal:MEDIAN,SIGMA ou exponential:MEAN")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probabilidade de responder 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Probabilidade de responder 429")
+    parser.add_argument("--retry-after", type=float, default=0.5, help="Segundos informados no Retry-After dos 429")
+    parser.add_argument("--stream-chunk-chars", type=int, default=40)
+    parser.add_argument("--stream-chunk-delay", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    server = MockLLMServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        stream_chunk_chars=args.stream_chunk_chars,
+        stream_chunk_delay=args.stream_chunk_delay,
+        seed=args.seed
+    )
+    print(f"Servidor mock da OpenAI em {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,129 +1,91 @@
-import json
+import asyncio
 import os
+import threading
 import time
 
+from config import EnvironmentManager
+from fallback_store import get_fallback
+from json_stream import IncrementalJSONParser, MEMBER
+from latency_model import latency_model_from_spec
+from llm_cache import ResponseCache
+from llm_transport import get_async_openai_client, get_openai_client
+from prompt_registry import PromptRegistry, compact_prompt, markdown_outline
+from pydantic import ValidationError
+from report_schemas import BlueOceanAnalysis, BusinessAnalysis, SEOAnalysis, convert_member, json_schema_format, parse_analysis
+from rate_limiter import RateLimiter, estimate_tokens
+from retry_policy import (
+    LatencyTracker,
+    RetryPolicy,
+    acall_with_retry,
+    ahedged_call,
+    call_with_retry,
+    hedged_call
+)
+from utils import SEO_REPORT_TEMPLATE
+
 # The newest OpenAI model is "gpt-4o" which was released May 13, 2024.
 # Do not change this unless explicitly requested by the user
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
 OPENAI_MODEL = os.environ.get("OPENAI_MODEL", "gpt-3.5-turbo")  # Default to gpt-3.5-turbo if not specified
 
 try:
-    from openai import OpenAI
-    client = OpenAI(api_key=OPENAI_API_KEY)
+    # Backed by the shared connection pool from llm_transport; async clients are
+    # fetched per event loop at call time with get_async_openai_client
+    client = get_openai_client(OPENAI_API_KEY)
     OPENAI_AVAILABLE = True
 except Exception as e:
     print(f"Erro ao inicializar o cliente OpenAI: {e}")
     OPENAI_AVAILABLE = False
 
-def log_prompt(prompt, system_prompt=""):
-    """
-    Log the prompt being sent to OpenAI API
-    """
-    print("\n🤖 Enviando prompt para OpenAI:")
-    if system_prompt:
-        print("\nSystem prompt:")
-        print(system_prompt)
-    print("\nUser prompt:")
-    print(prompt)
-    print("\n---")
+# Responses are cached on disk so identical submissions (e.g. after a Streamlit
+# rerun) don't trigger a new API call
+JSON_RESPONSE_FORMAT = {"type": "json_object"}
+OPENAI_CACHE_ENABLED = os.environ.get("OPENAI_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+response_cache = ResponseCache(
+    path=os.environ.get("OPENAI_CACHE_PATH", ".cache/openai_responses.sqlite3"),
+    ttl_seconds=float(os.environ.get("OPENAI_CACHE_TTL", 7 * 24 * 3600)),
+    max_entries=int(os.environ.get("OPENAI_CACHE_MAX_ENTRIES", 1000))
+)
 
-def analyze_business(form_data):
-    """
-    Analyze business data using OpenAI's GPT model
-    
-    This function takes form data about a business and sends it to OpenAI's API
-    to generate insights and recommendations.
-    
-    If OpenAI is not available, it returns simulated data.
-    """
-    # If OpenAI is not available, return simulated data immediately
-    if not OPENAI_AVAILABLE:
-        business_name = form_data.get('business_name', 'Empresa')
-        industry = form_data.get('industry', 'Tecnologia')
-        
-        # Simulate API analysis with a delay to make it feel realistic
-        time.sleep(1.5)
-        
-        return {
-            "strengths": [
-                f"Posicionamento único no mercado de {industry}",
-                "Equipe comprometida",
-                "Produto com diferenciais claros"
-            ],
-            "weaknesses": [
-                "Processos que podem ser otimizados",
-                "Dependência de poucos canais de aquisição",
-                "Escalabilidade limitada no modelo atual"
-            ],
-            "opportunities": [
-                "Expandir para mercados adjacentes",
-                "Desenvolver novas linhas de produtos/serviços",
-                f"Parcerias estratégicas com outros players de {industry}"
-            ],
-            "threats": [
-                "Novos entrantes com modelos disruptivos",
-                "Mudanças regulatórias no setor",
-                "Pressão por redução de preços"
-            ],
-            "recommendations": [
-                {
-                    "title": "Otimização de Processos",
-                    "description": f"Implementar melhorias nos processos internos de {business_name} para aumentar eficiência operacional.",
-                    "action_items": [
-                        "Mapear processos atuais e identificar gargalos",
-                        "Implementar ferramentas de automação",
-                        "Treinar equipe em novas metodologias"
-                    ]
-                },
-                {
-                    "title": "Diversificação de Canais",
-                    "description": f"Expandir os canais de aquisição de {business_name} para reduzir dependências e aumentar alcance.",
-                    "action_items": [
-                        "Testar novos canais de marketing",
-                        "Desenvolver programa de parcerias",
-                        "Implementar estratégia de conteúdo"
-                    ]
-                },
-                {
-                    "title": "Inovação de Produto",
-                    "description": f"Desenvolver novos produtos/serviços que complementem a oferta atual de {business_name}.",
-                    "action_items": [
-                        "Realizar pesquisa com clientes",
-                        "Desenvolver MVPs para testar conceitos",
-                        "Estabelecer processo de inovação contínua"
-                    ]
-                }
-            ],
-            # Dados para os gráficos
-            "categories": ['Inovação', 'Marketing', 'Operações', 'Finanças', 'Atendimento', 'Produto'],
-            "values": [7, 6, 8, 7, 9, 8],
-            "market_data": {
-                'Qualidade': 8,
-                'Preço': 7,
-                'Atendimento': 9,
-                'Inovação': 8,
-                'Alcance': 6
-            },
-            "growth_data": {
-                'Q1': 100,
-                'Q2': 120,
-                'Q3': 150,
-                'Q4': 200
-            }
-        }
-    # Create a prompt with the form data
-    business_name = form_data.get('business_name', 'Empresa')
-    industry = form_data.get('industry', 'Tecnologia')
-    business_model = form_data.get('business_model', 'SaaS')
-    monthly_revenue = form_data.get('monthly_revenue', 50000)
-    employees = form_data.get('employees', 10)
-    main_products = form_data.get('main_products', '')
-    target_audience = form_data.get('target_audience', '')
-    competitors = form_data.get('competitors', '')
-    marketing_channels = form_data.get('marketing_channels', [])
-    growth_stage = form_data.get('growth_stage', '')
-    
-    prompt = f"""
+# Responses are requested as strict json_schema structured outputs and
+# validated against the report_schemas models. Models released before
+# structured outputs only get json_object; "auto" picks based on OPENAI_MODEL.
+_STRUCTURED_OUTPUTS_SETTING = EnvironmentManager.get("OPENAI_STRUCTURED_OUTPUTS", "auto").lower()
+if _STRUCTURED_OUTPUTS_SETTING == "auto":
+    OPENAI_STRUCTURED_OUTPUTS = not (OPENAI_MODEL == "gpt-4" or OPENAI_MODEL.startswith(("gpt-3.5", "gpt-4-")))
+else:
+    OPENAI_STRUCTURED_OUTPUTS = _STRUCTURED_OUTPUTS_SETTING in ("1", "true", "yes")
+# Extra requests allowed when a response doesn't match its schema
+OPENAI_SCHEMA_RETRIES = int(EnvironmentManager.get("OPENAI_SCHEMA_RETRIES", "1"))
+
+# Delay of simulated analyses when OpenAI is not available: zero (default),
+# fixed:SECONDS or sampled[:FILE] (recorded latencies, e.g. from the cache)
+simulated_latency = latency_model_from_spec(
+    EnvironmentManager.get("SIMULATED_LATENCY", "zero"),
+    recorded=response_cache.latencies
+)
+
+# Process-wide limiter shared by every OpenAI call (sync, async and streaming)
+rate_limiter = RateLimiter.from_environment()
+# Completion tokens reserved per request until the real usage is known
+EXPECTED_COMPLETION_TOKENS = int(EnvironmentManager.get("OPENAI_EXPECTED_COMPLETION_TOKENS", "1500"))
+
+# Transient failures are retried with exponential backoff and jitter; slow
+# requests can be hedged once they exceed the observed latency percentile
+retry_policy = RetryPolicy.from_environment()
+latency_tracker = LatencyTracker()
+OPENAI_HEDGE_ENABLED = EnvironmentManager.get("OPENAI_HEDGE_ENABLED", "false").lower() in ("1", "true", "yes")
+OPENAI_HEDGE_PERCENTILE = float(EnvironmentManager.get("OPENAI_HEDGE_PERCENTILE", "95"))
+
+# Prompt templates are compiled once and validated at import; request-time
+# assembly is a plain substitution. BLUE_OCEAN.md is reloaded when edited.
+# Each prompt is split into sections so the compact mode can move the static
+# ones (output schema, reference template) into the system message.
+BUSINESS_SYSTEM_PROMPT = "Você é um consultor de negócios especialista em análise estratégica."
+BLUE_OCEAN_SYSTEM_PROMPT = "Você é um consultor especialista em Blue Ocean Strategy."
+SEO_SYSTEM_PROMPT = "Você é um especialista em SEO."
+
+BUSINESS_REQUEST_TEMPLATE = """
     Você é um consultor de negócios especialista que deve analisar os dados da empresa abaixo e gerar insights estratégicos.
     
     DADOS DA EMPRESA:
@@ -135,14 +97,16 @@ def analyze_business(form_data):
     - Produtos/serviços principais: {main_products}
     - Público-alvo: {target_audience}
     - Concorrentes: {competitors}
-    - Canais de marketing: {', '.join(marketing_channels) if marketing_channels else 'Não informado'}
+    - Canais de marketing: {marketing_channels}
     - Estágio de crescimento: {growth_stage}
     
     TAREFA:
     Gere uma análise SWOT completa, 3 recomendações estratégicas detalhadas e dados para visualizações gráficas.
     As recomendações devem ser específicas para o contexto da empresa e incluir ações concretas.
     
-    Organize a resposta em JSON no seguinte formato:
+"""
+
+BUSINESS_SCHEMA_TEMPLATE = """    Organize a resposta em JSON no seguinte formato:
     {{
         "strengths": ["ponto forte 1", "ponto forte 2", ...],
         "weaknesses": ["ponto fraco 1", "ponto fraco 2", ...],
@@ -177,192 +141,8 @@ def analyze_business(form_data):
     - market_data: 5 fatores de comparação com o mercado e seus valores de 0 a 10
     - growth_data: projeção de crescimento em 4 trimestres, começando em 100
     """
-    
-    try:
-        system_prompt = "Você é um consultor de negócios especialista em análise estratégica."
-        log_prompt(prompt, system_prompt)
-        response = client.chat.completions.create(
-            model=OPENAI_MODEL,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": prompt}
-            ],
-            response_format={"type": "json_object"}
-        )
-        
-        # Parse the JSON response
-        result = json.loads(response.choices[0].message.content)
-        return result
-    except Exception as e:
-        # If there's an error, return a default response
-        print(f"Error calling OpenAI API: {e}")
-        return {
-            "strengths": [
-                f"Posicionamento único no mercado de {industry}",
-                "Equipe comprometida",
-                "Produto com diferenciais claros"
-            ],
-            "weaknesses": [
-                "Processos que podem ser otimizados",
-                "Dependência de poucos canais de aquisição",
-                "Escalabilidade limitada no modelo atual"
-            ],
-            "opportunities": [
-                "Expandir para mercados adjacentes",
-                "Desenvolver novas linhas de produtos/serviços",
-                f"Parcerias estratégicas com outros players de {industry}"
-            ],
-            "threats": [
-                "Novos entrantes com modelos disruptivos",
-                "Mudanças regulatórias no setor",
-                "Pressão por redução de preços"
-            ],
-            "recommendations": [
-                {
-                    "title": "Otimização de Processos",
-                    "description": f"Implementar melhorias nos processos internos de {business_name} para aumentar eficiência operacional.",
-                    "action_items": [
-                        "Mapear processos atuais e identificar gargalos",
-                        "Implementar ferramentas de automação",
-                        "Treinar equipe em novas metodologias"
-                    ]
-                },
-                {
-                    "title": "Diversificação de Canais",
-                    "description": f"Expandir os canais de aquisição de {business_name} para reduzir dependências e aumentar alcance.",
-                    "action_items": [
-                        "Testar novos canais de marketing",
-                        "Desenvolver programa de parcerias",
-                        "Implementar estratégia de conteúdo"
-                    ]
-                },
-                {
-                    "title": "Inovação de Produto",
-                    "description": f"Desenvolver novos produtos/serviços que complementem a oferta atual de {business_name}.",
-                    "action_items": [
-                        "Realizar pesquisa com clientes",
-                        "Desenvolver MVPs para testar conceitos",
-                        "Estabelecer processo de inovação contínua"
-                    ]
-                }
-            ],
-            # Dados para os gráficos
-            "categories": ['Inovação', 'Marketing', 'Operações', 'Finanças', 'Atendimento', 'Produto'],
-            "values": [7, 6, 8, 7, 9, 8],
-            "market_data": {
-                'Qualidade': 8,
-                'Preço': 7,
-                'Atendimento': 9,
-                'Inovação': 8,
-                'Alcance': 6
-            },
-            "growth_data": {
-                'Q1': 100,
-                'Q2': 120,
-                'Q3': 150,
-                'Q4': 200
-            }
-        }
 
-def generate_blue_ocean_strategy(form_data):
-    """
-    Generate a Blue Ocean strategy using OpenAI's GPT model
-    
-    This function takes form data about a business and sends it to OpenAI's API
-    to generate a Blue Ocean strategy.
-    
-    If OpenAI is not available, it returns simulated data.
-    """
-    # Extract form data
-    business_name = form_data.get('business_name', 'Empresa')
-    products_services = form_data.get('products_services', 'Software')
-    competitors = form_data.get('competitors', 'Concorrentes')
-    target_customers = form_data.get('target_customers', 'Clientes')
-    differentials = form_data.get('differentials', 'Diferenciais')
-    challenges = form_data.get('challenges', 'Desafios')
-    goals = form_data.get('goals', 'Objetivos')
-    strengths = form_data.get('strengths', 'Pontos fortes')
-    limitations = form_data.get('limitations', 'Limitações')
-    
-    # If OpenAI is not available, return simulated data immediately
-    if not OPENAI_AVAILABLE:
-        # Simulate API analysis with a delay to make it feel realistic
-        time.sleep(1.5)
-        
-        return {
-            "eliminate": [
-                "Funcionalidades complexas raramente utilizadas",
-                "Processos burocráticos que atrasam entregas",
-                "Dependência de intermediários na cadeia de valor"
-            ],
-            "reduce": [
-                "Custos operacionais através de automação",
-                "Tempo de implementação/entrega",
-                "Barreiras de adoção para novos clientes"
-            ],
-            "raise": [
-                "Experiência do usuário e facilidade de uso",
-                "Transparência e comunicação com clientes",
-                "Valor percebido do produto/serviço"
-            ],
-            "create": [
-                "Modelo de precificação baseado em resultados",
-                "Comunidade de usuários e co-criação",
-                "Integração perfeita com o ecossistema do cliente"
-            ],
-            "canvas_factors": [
-                "Preço",
-                "Facilidade de uso",
-                "Personalização",
-                "Suporte",
-                "Integração",
-                "Inovação"
-            ],
-            "your_values": [6, 9, 10, 8, 9, 10],
-            "industry_values": [8, 5, 4, 6, 5, 6],
-            "recommendations": [
-                {
-                    "title": "Redefina a proposta de valor",
-                    "description": f"Crie uma nova curva de valor para {business_name} focando em elementos altamente valorizados pelos clientes mas negligenciados pelo mercado.",
-                    "action_items": [
-                        "Mapear elementos que podem ser eliminados",
-                        "Identificar fatores a serem elevados acima do padrão",
-                        "Desenvolver novos elementos nunca oferecidos no setor"
-                    ]
-                },
-                {
-                    "title": "Foco em não-clientes",
-                    "description": f"Expanda o mercado mirando pessoas/empresas que atualmente não utilizam {products_services}.",
-                    "action_items": [
-                        "Identificar os três níveis de não-clientes",
-                        "Entender barreiras de adoção atuais",
-                        "Desenvolver oferta específica para este público"
-                    ]
-                },
-                {
-                    "title": "Execução estratégica",
-                    "description": "Implemente a estratégia Blue Ocean com foco, divergência e mensagem clara.",
-                    "action_items": [
-                        "Alinhar toda organização com a nova estratégia",
-                        "Superar obstáculos organizacionais",
-                        "Integrar execução à estratégia desde o início"
-                    ]
-                }
-            ]
-        }
-    
-    # Get industry from products/services
-    industry = products_services.split(',')[0] if isinstance(products_services, str) and ',' in products_services else products_services
-    
-    # Read the Blue Ocean template markdown file
-    try:
-        with open('reports/templates/BLUE_OCEAN.md', 'r', encoding='utf-8') as f:
-            template = f.read()
-    except Exception as e:
-        print(f"Error reading Blue Ocean template: {e}")
-        template = "Template não encontrado"
-    
-    prompt = f"""
+BLUE_OCEAN_INTRO_TEMPLATE = """
     Você é um consultor especialista na metodologia Blue Ocean Strategy. Analise os dados da empresa abaixo e gere uma estratégia Blue Ocean completa seguindo a estrutura do template fornecido.
     
     ## DADOS DA EMPRESA:
@@ -376,16 +156,22 @@ def generate_blue_ocean_strategy(form_data):
     - Pontos fortes: {strengths}
     - Limitações: {limitations}
     
-    ## TEMPLATE DE REFERÊNCIA:
+"""
+
+BLUE_OCEAN_REFERENCE_TEMPLATE = """    ## TEMPLATE DE REFERÊNCIA:
     {template}
     
-    ## TAREFA:
+"""
+
+BLUE_OCEAN_TASK_TEMPLATE = """    ## TAREFA:
     Gere uma estratégia Blue Ocean completa, incluindo:
     1. Framework ERRC (Eliminar-Reduzir-Aumentar-Criar)
     2. Fatores para o Strategy Canvas (Tela Estratégica)
     3. 3 recomendações estratégicas detalhadas
     
-    Organize a resposta em JSON no seguinte formato:
+"""
+
+BLUE_OCEAN_SCHEMA_TEMPLATE = """    Organize a resposta em JSON no seguinte formato:
     {{
         "eliminate": ["elemento 1", "elemento 2", ...],
         "reduce": ["elemento 1", "elemento 2", ...],
@@ -406,237 +192,23 @@ def generate_blue_ocean_strategy(form_data):
     
     Obs: your_values e industry_values devem ser arrays de números entre 0 e 10, com a mesma quantidade de elementos que canvas_factors.
     """
-    
-    try:
-        system_prompt = "Você é um consultor especialista em Blue Ocean Strategy."
-        log_prompt(prompt, system_prompt)
-        response = client.chat.completions.create(
-            model=OPENAI_MODEL,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": prompt}
-            ],
-            response_format={"type": "json_object"}
-        )
-        
-        # Parse the JSON response
-        result = json.loads(response.choices[0].message.content)
-        return result
-    except Exception as e:
-        # If there's an error, return a default response
-        print(f"Error calling OpenAI API: {e}")
-        return {
-            "eliminate": [
-                "Funcionalidades complexas raramente utilizadas",
-                "Processos burocráticos que atrasam entregas",
-                "Dependência de intermediários na cadeia de valor"
-            ],
-            "reduce": [
-                "Custos operacionais através de automação",
-                "Tempo de implementação/entrega",
-                "Barreiras de adoção para novos clientes"
-            ],
-            "raise": [
-                "Experiência do usuário e facilidade de uso",
-                "Transparência e comunicação com clientes",
-                "Valor percebido do produto/serviço"
-            ],
-            "create": [
-                "Modelo de precificação baseado em resultados",
-                "Comunidade de usuários e co-criação",
-                "Integração perfeita com o ecossistema do cliente"
-            ],
-            "canvas_factors": [
-                "Preço",
-                "Facilidade de uso",
-                "Personalização",
-                "Suporte",
-                "Integração",
-                "Inovação"
-            ],
-            "your_values": [6, 9, 10, 8, 9, 10],
-            "industry_values": [8, 5, 4, 6, 5, 6],
-            "recommendations": [
-                {
-                    "title": "Redefina a proposta de valor",
-                    "description": f"Crie uma nova curva de valor para {business_name} focando em elementos altamente valorizados pelos clientes mas negligenciados pelo mercado.",
-                    "action_items": [
-                        "Mapear elementos que podem ser eliminados",
-                        "Identificar fatores a serem elevados acima do padrão",
-                        "Desenvolver novos elementos nunca oferecidos no setor"
-                    ]
-                },
-                {
-                    "title": "Foco em não-clientes",
-                    "description": f"Expanda o mercado mirando pessoas/empresas que atualmente não utilizam {products_services}.",
-                    "action_items": [
-                        "Identificar os três níveis de não-clientes",
-                        "Entender barreiras de adoção atuais",
-                        "Desenvolver oferta específica para este público"
-                    ]
-                },
-                {
-                    "title": "Execução estratégica",
-                    "description": "Implemente a estratégia Blue Ocean com foco, divergência e mensagem clara.",
-                    "action_items": [
-                        "Alinhar toda organização com a nova estratégia",
-                        "Superar obstáculos organizacionais",
-                        "Integrar execução à estratégia desde o início"
-                    ]
-                }
-            ]
-        }
 
-def analyze_seo(form_data):
-    """
-    Analyze SEO data using OpenAI's GPT model
-    
-    This function takes form data about a website and sends it to OpenAI's API
-    to generate SEO insights and recommendations.
-    """
-    # If OpenAI is not available, return simulated data immediately
-    if not OPENAI_AVAILABLE:
-        business_name = form_data.get('business_name', 'Empresa')
-        website_url = form_data.get('website_url', 'https://exemplo.com')
-        keywords = form_data.get('keywords', 'palavras-chave')
-        
-        # Parse keywords into a list
-        keyword_list = [k.strip() for k in keywords.split(',') if k.strip()]
-        if not keyword_list:
-            keyword_list = ["keyword1", "keyword2", "keyword3", "keyword4", "keyword5"]
-        
-        # Ensure we have at least 5 keywords
-        while len(keyword_list) < 5:
-            keyword_list.append(f"keyword{len(keyword_list)+1}")
-        
-        # Simulate API analysis with a delay to make it feel realistic
-        time.sleep(1.5)
-        
-        # Return default response
-        return {
-            "overall_score": 65,
-            "keywords_data": {
-                "keywords": keyword_list[:5],
-                "positions": [4, 12, 18, 7, 22],
-                "search_volumes": [2400, 1300, 880, 3200, 590],
-                "competition": [0.75, 0.45, 0.3, 0.8, 0.25]
-            },
-            "traffic_sources": {
-                "sources": ["Organic", "Direct", "Social", "Referral", "Paid"],
-                "percentages": [35, 25, 20, 15, 5]
-            },
-            "optimization_opportunities": [
-                {
-                    "area": "Content",
-                    "impact": 85,
-                    "difficulty": 40,
-                    "recommendations": [
-                        "Create in-depth content targeting main keywords",
-                        "Optimize meta titles and descriptions",
-                        "Improve internal linking structure"
-                    ]
-                },
-                {
-                    "area": "Technical",
-                    "impact": 65,
-                    "difficulty": 70,
-                    "recommendations": [
-                        "Improve page loading speed",
-                        "Fix mobile usability issues",
-                        "Implement schema markup"
-                    ]
-                },
-                {
-                    "area": "Backlinks",
-                    "impact": 75,
-                    "difficulty": 80,
-                    "recommendations": [
-                        "Develop a link building strategy",
-                        "Create linkable assets (infographics, studies)",
-                        "Establish industry partnerships"
-                    ]
-                },
-                {
-                    "area": "Local SEO",
-                    "impact": 55,
-                    "difficulty": 30,
-                    "recommendations": [
-                        "Optimize Google Business Profile",
-                        "Ensure NAP consistency",
-                        "Generate local reviews"
-                    ]
-                },
-                {
-                    "area": "Mobile",
-                    "impact": 80,
-                    "difficulty": 50,
-                    "recommendations": [
-                        "Improve mobile page speed",
-                        "Ensure responsive design",
-                        "Optimize for mobile-first indexing"
-                    ]
-                }
-            ],
-            "recommendations": [
-                {
-                    "title": "Otimização de Conteúdo",
-                    "description": f"Criar e otimizar conteúdo para as principais palavras-chave identificadas para {website_url}.",
-                    "action_items": [
-                        "Desenvolver plano de conteúdo focado nas 5 palavras-chave principais",
-                        "Otimizar metadados das páginas existentes",
-                        "Melhorar estrutura de links internos"
-                    ]
-                },
-                {
-                    "title": "Melhorias Técnicas",
-                    "description": "Resolver problemas técnicos que afetam o desempenho do site nos motores de busca.",
-                    "action_items": [
-                        "Melhorar velocidade de carregamento das páginas",
-                        "Corrigir problemas de usabilidade móvel",
-                        "Implementar marcação de esquema (schema markup)"
-                    ]
-                },
-                {
-                    "title": "Estratégia de Backlinks",
-                    "description": "Desenvolver links de qualidade para aumentar a autoridade do domínio.",
-                    "action_items": [
-                        "Criar conteúdo link-worthy (infográficos, estudos)",
-                        "Estabelecer parcerias no setor",
-                        "Monitorar perfil de backlinks regularmente"
-                    ]
-                }
-            ]
-        }
-    # Extract form data
-    business_name = form_data.get('business_name', 'Empresa')
-    website_url = form_data.get('website_url', 'https://exemplo.com')
-    keywords = form_data.get('keywords', 'palavras-chave')
-    competitors = form_data.get('competitors', 'concorrentes')
-    digital_channels = form_data.get('digital_channels', [])
-    site_age = form_data.get('site_age', '1 a 3 anos')
-    goals = form_data.get('goals', 'objetivos')
-    target_audience = form_data.get('target_audience', 'público-alvo')
-    
-    # Import the template for SEO report
-    from utils import SEO_REPORT_TEMPLATE
-    
-    # Format the template with business data to show as an example
-    seo_example = SEO_REPORT_TEMPLATE.format(
-        business_name=business_name
-    )
-    
-    prompt = f"""
+SEO_INTRO_TEMPLATE = """
     Você é um especialista em SEO que deve analisar os dados do site abaixo e gerar insights e recomendações estratégicas, seguindo o formato do exemplo fornecido.
     
-    EXEMPLO DE FORMATO DE RELATÓRIO:
+"""
+
+SEO_REFERENCE_TEMPLATE = """    EXEMPLO DE FORMATO DE RELATÓRIO:
     {seo_example}
     
-    DADOS DO SITE:
+"""
+
+SEO_REQUEST_TEMPLATE = """    DADOS DO SITE:
     - Nome da empresa: {business_name}
     - URL do site: {website_url}
     - Palavras-chave target: {keywords}
     - Sites concorrentes: {competitors}
-    - Canais digitais utilizados: {', '.join(digital_channels) if digital_channels else 'Não informado'}
+    - Canais digitais utilizados: {digital_channels}
     - Idade do site: {site_age}
     - Objetivos da presença online: {goals}
     - Público-alvo online: {target_audience}
@@ -649,7 +221,9 @@ def analyze_seo(form_data):
     4. 5 áreas de otimização com impacto e dificuldade
     5. 3 recomendações estratégicas detalhadas
     
-    Organize a resposta em JSON no seguinte formato:
+"""
+
+SEO_SCHEMA_TEMPLATE = """    Organize a resposta em JSON no seguinte formato:
     {{
         "overall_score": número de 0 a 100,
         "keywords_data": {{
@@ -687,127 +261,609 @@ def analyze_seo(form_data):
     - competition são valores de 0 a 1 indicando nível de competição
     - percentages devem somar 100
     """
-    
+
+BUSINESS_FIELDS = (
+    "business_name", "industry", "business_model", "monthly_revenue", "employees",
+    "main_products", "target_audience", "competitors", "marketing_channels", "growth_stage"
+)
+BLUE_OCEAN_FIELDS = (
+    "business_name", "products_services", "competitors", "target_customers", "differentials",
+    "challenges", "goals", "strengths", "limitations"
+)
+SEO_FIELDS = (
+    "business_name", "website_url", "keywords", "competitors",
+    "digital_channels", "site_age", "goals", "target_audience"
+)
+
+BLUE_OCEAN_TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reports", "templates", "BLUE_OCEAN.md")
+
+prompt_registry = PromptRegistry()
+prompt_registry.register("business_map", BUSINESS_REQUEST_TEMPLATE + BUSINESS_SCHEMA_TEMPLATE, BUSINESS_FIELDS)
+prompt_registry.register(
+    "blue_ocean",
+    BLUE_OCEAN_INTRO_TEMPLATE + BLUE_OCEAN_REFERENCE_TEMPLATE + BLUE_OCEAN_TASK_TEMPLATE + BLUE_OCEAN_SCHEMA_TEMPLATE,
+    BLUE_OCEAN_FIELDS + ("template",)
+)
+prompt_registry.register(
+    "seo",
+    SEO_INTRO_TEMPLATE + SEO_REFERENCE_TEMPLATE + SEO_REQUEST_TEMPLATE + SEO_SCHEMA_TEMPLATE,
+    SEO_FIELDS + ("seo_example",)
+)
+prompt_registry.register("seo_example", SEO_REPORT_TEMPLATE, ("business_name",))
+prompt_registry.register_file("blue_ocean_reference", BLUE_OCEAN_TEMPLATE_PATH, default="Template não encontrado")
+
+# Compact variants: whitespace stripped, schema and reference template in the
+# system message (schema first, so the prefix is identical across requests
+# and can be reused by provider-side prompt caching)
+prompt_registry.register("business_map_compact", compact_prompt(BUSINESS_REQUEST_TEMPLATE), BUSINESS_FIELDS)
+prompt_registry.register("business_map_compact_system", compact_prompt(BUSINESS_SYSTEM_PROMPT + "\n" + BUSINESS_SCHEMA_TEMPLATE))
+prompt_registry.register("blue_ocean_compact", compact_prompt(BLUE_OCEAN_INTRO_TEMPLATE + BLUE_OCEAN_TASK_TEMPLATE), BLUE_OCEAN_FIELDS)
+prompt_registry.register(
+    "blue_ocean_compact_system",
+    compact_prompt(BLUE_OCEAN_SYSTEM_PROMPT + "\n" + BLUE_OCEAN_SCHEMA_TEMPLATE + BLUE_OCEAN_REFERENCE_TEMPLATE),
+    ("template",)
+)
+prompt_registry.register("seo_compact", compact_prompt(SEO_INTRO_TEMPLATE + SEO_REQUEST_TEMPLATE), SEO_FIELDS)
+prompt_registry.register(
+    "seo_compact_system",
+    compact_prompt(SEO_SYSTEM_PROMPT + "\n" + SEO_SCHEMA_TEMPLATE + SEO_REFERENCE_TEMPLATE),
+    ("seo_example",)
+)
+
+# Compact mode trades the verbatim prompts above for fewer input tokens
+OPENAI_COMPACT_PROMPTS = EnvironmentManager.get("OPENAI_COMPACT_PROMPTS", "false").lower() in ("1", "true", "yes")
+# In compact mode reference templates are reduced to their outline (headings and bullets)
+OPENAI_COMPACT_TEMPLATE_OUTLINE = EnvironmentManager.get("OPENAI_COMPACT_TEMPLATE_OUTLINE", "true").lower() in ("1", "true", "yes")
+# Reference field of each prompt that the outline applies to
+_REFERENCE_FIELDS = {"blue_ocean": "template", "seo": "seo_example"}
+_prompt_stats = {"compact_calls": 0, "original_tokens": 0, "compact_tokens": 0}
+_prompt_stats_lock = threading.Lock()
+
+# Event emitted by stream_analysis once the whole response is available
+DONE = "done"
+
+def get_cache_stats():
+    """
+    Return hit/miss counters of the response cache, including the latency
+    and tokens saved by cache hits
+    """
+    return response_cache.stats()
+
+def get_rate_limiter_stats():
+    """Return queue depth, in-flight requests and wait times of the rate limiter"""
+    return rate_limiter.stats()
+
+def get_latency_stats():
+    """Return the p50/p95 latency of recent OpenAI requests (None until enough samples)"""
+    return {
+        "p50_seconds": latency_tracker.percentile(50),
+        "p95_seconds": latency_tracker.percentile(95),
+        "samples": len(latency_tracker.samples()),
+        "hedging": OPENAI_HEDGE_ENABLED
+    }
+
+def get_prompt_stats():
+    """Return how many input tokens the compact prompt mode has saved"""
+    with _prompt_stats_lock:
+        stats = dict(_prompt_stats)
+    stats["tokens_saved"] = stats["original_tokens"] - stats["compact_tokens"]
+    stats["compact_enabled"] = OPENAI_COMPACT_PROMPTS
+    return stats
+
+def _assemble_prompt(report_type, system_prompt, **values):
+    """
+    Render the system and user prompts of ``report_type``
+
+    In compact mode the compact variants are returned instead and the input
+    tokens saved against the verbatim prompts are logged and accumulated.
+    """
+    prompt = prompt_registry.render(report_type, **values)
+    if not OPENAI_COMPACT_PROMPTS:
+        return system_prompt, prompt
+
+    reference_field = _REFERENCE_FIELDS.get(report_type)
+    if reference_field:
+        reference = values[reference_field]
+        values[reference_field] = markdown_outline(reference) if OPENAI_COMPACT_TEMPLATE_OUTLINE else compact_prompt(reference)
+    compact_system = prompt_registry.render(f"{report_type}_compact_system", **values)
+    compact = prompt_registry.render(f"{report_type}_compact", **values)
+
+    original_tokens = estimate_tokens(system_prompt, prompt)
+    compact_tokens = estimate_tokens(compact_system, compact)
+    with _prompt_stats_lock:
+        _prompt_stats["compact_calls"] += 1
+        _prompt_stats["original_tokens"] += original_tokens
+        _prompt_stats["compact_tokens"] += compact_tokens
+    print(f"Prompt compacto ({report_type}): ~{original_tokens - compact_tokens} tokens economizados ({original_tokens} -> {compact_tokens})")
+    return compact_system, compact
+
+def _estimate_request_tokens(system_prompt, prompt):
+    """Tokens to reserve for a request: estimated prompt plus expected completion"""
+    return estimate_tokens(system_prompt, prompt) + EXPECTED_COMPLETION_TOKENS
+
+def _total_tokens(usage):
+    return getattr(usage, "total_tokens", None) if usage else None
+
+def log_prompt(prompt, system_prompt=""):
+    """
+    Log the prompt being sent to OpenAI API
+    """
+    print("\n🤖 Enviando prompt para OpenAI:")
+    if system_prompt:
+        print("\nSystem prompt:")
+        print(system_prompt)
+    print("\nUser prompt:")
+    print(prompt)
+    print("\n---")
+
+def _response_format(response_model):
+    """Strict json_schema for ``response_model``, or json_object on older models"""
+    if OPENAI_STRUCTURED_OUTPUTS:
+        return json_schema_format(response_model)
+    return JSON_RESPONSE_FORMAT
+
+def _completion_content(response):
+    message = response.choices[0].message
+    if message.content is None:
+        raise ValueError(f"Resposta recusada pelo modelo: {getattr(message, 'refusal', None)}")
+    return message.content
+
+def _get_cached_completion(cache_key, response_model):
+    """Return the cached validated response for ``cache_key``, if any"""
+    if not OPENAI_CACHE_ENABLED:
+        return None
+    cached = response_cache.get(cache_key)
+    if cached is None:
+        return None
     try:
-        system_prompt = "Você é um especialista em SEO."
-        log_prompt(prompt, system_prompt)
+        return parse_analysis(response_model, cached)
+    except ValidationError:
+        return None
+
+def _parse_completion(cache_key, content, usage, started, response_model):
+    """Validate the content of a completion and store it in the response cache"""
+    # Validate before caching so invalid payloads are never stored
+    result = parse_analysis(response_model, content)
+    if OPENAI_CACHE_ENABLED:
+        response_cache.set(
+            cache_key,
+            content,
+            latency=time.perf_counter() - started,
+            tokens=getattr(usage, "total_tokens", 0) or 0
+        )
+    return result
+
+def _build_messages(system_prompt, prompt):
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": prompt}
+    ]
+
+def _hedge_delay():
+    """Seconds after which a hedged copy of a request is sent (None disables it)"""
+    if not OPENAI_HEDGE_ENABLED:
+        return None
+    return latency_tracker.percentile(OPENAI_HEDGE_PERCENTILE)
+
+def _send_completion(system_prompt, prompt, response_format):
+    """Send a single chat completion request through the rate limiter"""
+    with rate_limiter.limit(_estimate_request_tokens(system_prompt, prompt)) as permit:
+        started = time.perf_counter()
         response = client.chat.completions.create(
             model=OPENAI_MODEL,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": prompt}
-            ],
-            response_format={"type": "json_object"}
+            messages=_build_messages(system_prompt, prompt),
+            response_format=response_format
+        )
+        latency_tracker.record(time.perf_counter() - started)
+        permit.actual_tokens = _total_tokens(getattr(response, "usage", None))
+    return response
+
+async def _asend_completion(system_prompt, prompt, response_format):
+    """Async counterpart of _send_completion"""
+    async with rate_limiter.limit_async(_estimate_request_tokens(system_prompt, prompt)) as permit:
+        started = time.perf_counter()
+        response = await get_async_openai_client(OPENAI_API_KEY).chat.completions.create(
+            model=OPENAI_MODEL,
+            messages=_build_messages(system_prompt, prompt),
+            response_format=response_format
+        )
+        latency_tracker.record(time.perf_counter() - started)
+        permit.actual_tokens = _total_tokens(getattr(response, "usage", None))
+    return response
+
+def _create_completion(system_prompt, prompt, response_model):
+    """
+    Send a chat completion request and return the validated response
+    
+    Identical requests are served from the response cache without touching
+    the network. Transient failures are retried with backoff and, when
+    enabled, slow requests are hedged with a second copy. Responses that
+    don't match ``response_model`` are requested again at most
+    OPENAI_SCHEMA_RETRIES times.
+    """
+    response_format = _response_format(response_model)
+    cache_key = ResponseCache.make_key(OPENAI_MODEL, system_prompt, prompt, response_format)
+    cached = _get_cached_completion(cache_key, response_model)
+    if cached is not None:
+        return cached
+    
+    log_prompt(prompt, system_prompt)
+    for attempt in range(OPENAI_SCHEMA_RETRIES + 1):
+        started = time.perf_counter()
+        response = call_with_retry(
+            lambda: hedged_call(
+                lambda: _send_completion(system_prompt, prompt, response_format),
+                _hedge_delay()
+            ),
+            retry_policy
+        )
+        try:
+            return _parse_completion(
+                cache_key,
+                _completion_content(response),
+                getattr(response, "usage", None),
+                started,
+                response_model
+            )
+        except ValidationError as e:
+            if attempt >= OPENAI_SCHEMA_RETRIES:
+                raise
+            print(f"Resposta fora do esquema {response_model.__name__} ({e.error_count()} erros), nova tentativa")
+
+async def _acreate_completion(system_prompt, prompt, response_model):
+    """
+    Async counterpart of _create_completion using the AsyncOpenAI client
+    
+    The response cache is SQLite, so its reads and writes run in a worker
+    thread instead of blocking the event loop.
+    """
+    response_format = _response_format(response_model)
+    cache_key = ResponseCache.make_key(OPENAI_MODEL, system_prompt, prompt, response_format)
+    cached = await asyncio.to_thread(_get_cached_completion, cache_key, response_model)
+    if cached is not None:
+        return cached
+    
+    log_prompt(prompt, system_prompt)
+    for attempt in range(OPENAI_SCHEMA_RETRIES + 1):
+        started = time.perf_counter()
+        response = await acall_with_retry(
+            lambda: ahedged_call(
+                lambda: _asend_completion(system_prompt, prompt, response_format),
+                _hedge_delay()
+            ),
+            retry_policy
+        )
+        try:
+            return await asyncio.to_thread(
+                _parse_completion,
+                cache_key,
+                _completion_content(response),
+                getattr(response, "usage", None),
+                started,
+                response_model
+            )
+        except ValidationError as e:
+            if attempt >= OPENAI_SCHEMA_RETRIES:
+                raise
+            print(f"Resposta fora do esquema {response_model.__name__} ({e.error_count()} erros), nova tentativa")
+
+def _business_prompt(form_data):
+    """Build the system and user prompts for the business analysis"""
+    # Create a prompt with the form data
+    business_name = form_data.get('business_name', 'Empresa')
+    industry = form_data.get('industry', 'Tecnologia')
+    business_model = form_data.get('business_model', 'SaaS')
+    monthly_revenue = form_data.get('monthly_revenue', 50000)
+    employees = form_data.get('employees', 10)
+    main_products = form_data.get('main_products', '')
+    target_audience = form_data.get('target_audience', '')
+    competitors = form_data.get('competitors', '')
+    marketing_channels = form_data.get('marketing_channels', [])
+    growth_stage = form_data.get('growth_stage', '')
+    
+    return _assemble_prompt(
+        "business_map",
+        BUSINESS_SYSTEM_PROMPT,
+        business_name=business_name,
+        industry=industry,
+        business_model=business_model,
+        monthly_revenue=monthly_revenue,
+        employees=employees,
+        main_products=main_products,
+        target_audience=target_audience,
+        competitors=competitors,
+        marketing_channels=', '.join(marketing_channels) if marketing_channels else 'Não informado',
+        growth_stage=growth_stage
+    )
+
+def _business_fallback(form_data):
+    """Simulated business analysis used when OpenAI can't be reached"""
+    return get_fallback("business_map", form_data)
+
+def _stream_completion(system_prompt, prompt, response_model):
+    """
+    Stream a chat completion, yielding JSON parser events as sections complete
+    
+    Yields the ``item``/``member`` events of IncrementalJSONParser while tokens
+    arrive and finally ``("done", result)`` with the parsed response. Cache hits
+    are replayed as member events without touching the network.
+    
+    The final response is validated against ``response_model``. Only opening
+    the stream is retried here; when the stream fails or its response doesn't
+    validate, stream_analysis requests it again through _create_completion.
+    """
+    response_format = _response_format(response_model)
+    cache_key = ResponseCache.make_key(OPENAI_MODEL, system_prompt, prompt, response_format)
+    cached = _get_cached_completion(cache_key, response_model)
+    if cached is not None:
+        for key, value in cached.items():
+            yield (MEMBER, key, value)
+        yield (DONE, cached)
+        return
+    
+    log_prompt(prompt, system_prompt)
+    parser = IncrementalJSONParser()
+    content = []
+    usage = None
+    
+    # The permit is held until the last chunk has been received
+    with rate_limiter.limit(_estimate_request_tokens(system_prompt, prompt)) as permit:
+        started = time.perf_counter()
+        stream = call_with_retry(
+            lambda: client.chat.completions.create(
+                model=OPENAI_MODEL,
+                messages=_build_messages(system_prompt, prompt),
+                response_format=response_format,
+                stream=True,
+                stream_options={"include_usage": True}
+            ),
+            retry_policy
         )
         
-        # Parse the JSON response
-        result = json.loads(response.choices[0].message.content)
-        return result
+        for chunk in stream:
+            if getattr(chunk, "usage", None):
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                content.append(delta)
+                for event in parser.feed(delta):
+                    if event[0] == MEMBER:
+                        event = (MEMBER, event[1], convert_member(event[1], event[2]))
+                    yield event
+        # Full response time, like the non-streamed requests' samples
+        latency_tracker.record(time.perf_counter() - started)
+        permit.actual_tokens = _total_tokens(usage)
+    
+    yield (DONE, _parse_completion(cache_key, "".join(content), usage, started, response_model))
+
+def analyze_business(form_data):
+    """
+    Analyze business data using OpenAI's GPT model
+    
+    This function takes form data about a business and sends it to OpenAI's API
+    to generate insights and recommendations.
+    
+    If OpenAI is not available, it returns simulated data.
+    """
+    # If OpenAI is not available, return simulated data immediately
+    if not OPENAI_AVAILABLE:
+        # Simulated analysis, delayed according to SIMULATED_LATENCY
+        simulated_latency.wait()
+        return _business_fallback(form_data)
+    
+    system_prompt, prompt = _business_prompt(form_data)
+    try:
+        return _create_completion(system_prompt, prompt, BusinessAnalysis)
     except Exception as e:
         # If there's an error, return a default response
         print(f"Error calling OpenAI API: {e}")
-        
-        # Parse keywords into a list
-        keyword_list = [k.strip() for k in keywords.split(',') if k.strip()]
-        if not keyword_list:
-            keyword_list = ["keyword1", "keyword2", "keyword3", "keyword4", "keyword5"]
-        
-        # Ensure we have at least 5 keywords
-        while len(keyword_list) < 5:
-            keyword_list.append(f"keyword{len(keyword_list)+1}")
-        
-        # Return default response
-        return {
-            "overall_score": 65,
-            "keywords_data": {
-                "keywords": keyword_list[:5],
-                "positions": [4, 12, 18, 7, 22],
-                "search_volumes": [2400, 1300, 880, 3200, 590],
-                "competition": [0.75, 0.45, 0.3, 0.8, 0.25]
-            },
-            "traffic_sources": {
-                "sources": ["Organic", "Direct", "Social", "Referral", "Paid"],
-                "percentages": [35, 25, 20, 15, 5]
-            },
-            "optimization_opportunities": [
-                {
-                    "area": "Content",
-                    "impact": 85,
-                    "difficulty": 40,
-                    "recommendations": [
-                        "Create in-depth content targeting main keywords",
-                        "Optimize meta titles and descriptions",
-                        "Improve internal linking structure"
-                    ]
-                },
-                {
-                    "area": "Technical",
-                    "impact": 65,
-                    "difficulty": 70,
-                    "recommendations": [
-                        "Improve page loading speed",
-                        "Fix mobile usability issues",
-                        "Implement schema markup"
-                    ]
-                },
-                {
-                    "area": "Backlinks",
-                    "impact": 75,
-                    "difficulty": 80,
-                    "recommendations": [
-                        "Develop a link building strategy",
-                        "Create linkable assets (infographics, studies)",
-                        "Establish industry partnerships"
-                    ]
-                },
-                {
-                    "area": "Local SEO",
-                    "impact": 55,
-                    "difficulty": 30,
-                    "recommendations": [
-                        "Optimize Google Business Profile",
-                        "Ensure NAP consistency",
-                        "Generate local reviews"
-                    ]
-                },
-                {
-                    "area": "Mobile",
-                    "impact": 80,
-                    "difficulty": 50,
-                    "recommendations": [
-                        "Improve mobile page speed",
-                        "Ensure responsive design",
-                        "Optimize for mobile-first indexing"
-                    ]
-                }
-            ],
-            "recommendations": [
-                {
-                    "title": "Otimização de Conteúdo",
-                    "description": f"Criar e otimizar conteúdo para as principais palavras-chave identificadas para {website_url}.",
-                    "action_items": [
-                        "Desenvolver plano de conteúdo focado nas 5 palavras-chave principais",
-                        "Otimizar metadados das páginas existentes",
-                        "Melhorar estrutura de links internos"
-                    ]
-                },
-                {
-                    "title": "Melhorias Técnicas",
-                    "description": "Resolver problemas técnicos que afetam o desempenho do site nos motores de busca.",
-                    "action_items": [
-                        "Melhorar velocidade de carregamento das páginas",
-                        "Corrigir problemas de usabilidade móvel",
-                        "Implementar marcação de esquema (schema markup)"
-                    ]
-                },
-                {
-                    "title": "Estratégia de Backlinks",
-                    "description": "Desenvolver links de qualidade para aumentar a autoridade do domínio.",
-                    "action_items": [
-                        "Criar conteúdo link-worthy (infográficos, estudos)",
-                        "Estabelecer parcerias no setor",
-                        "Monitorar perfil de backlinks regularmente"
-                    ]
-                }
-            ]
-        }
\ No newline at end of file
+        return _business_fallback(form_data)
+
+async def analyze_business_async(form_data):
+    """
+    Analyze business data using OpenAI's GPT model without blocking a thread
+    
+    Same contract as analyze_business, but awaits the AsyncOpenAI client so
+    many analyses can be in flight on a single event loop.
+    """
+    if not OPENAI_AVAILABLE:
+        await simulated_latency.wait_async()
+        return _business_fallback(form_data)
+    
+    system_prompt, prompt = _business_prompt(form_data)
+    try:
+        return await _acreate_completion(system_prompt, prompt, BusinessAnalysis)
+    except Exception as e:
+        print(f"Error calling OpenAI API: {e}")
+        return _business_fallback(form_data)
+
+def _blue_ocean_prompt(form_data):
+    """Build the system and user prompts for the Blue Ocean strategy"""
+    # Extract form data
+    business_name = form_data.get('business_name', 'Empresa')
+    products_services = form_data.get('products_services', 'Software')
+    competitors = form_data.get('competitors', 'Concorrentes')
+    target_customers = form_data.get('target_customers', 'Clientes')
+    differentials = form_data.get('differentials', 'Diferenciais')
+    challenges = form_data.get('challenges', 'Desafios')
+    goals = form_data.get('goals', 'Objetivos')
+    strengths = form_data.get('strengths', 'Pontos fortes')
+    limitations = form_data.get('limitations', 'Limitações')
+    
+    return _assemble_prompt(
+        "blue_ocean",
+        BLUE_OCEAN_SYSTEM_PROMPT,
+        business_name=business_name,
+        products_services=products_services,
+        competitors=competitors,
+        target_customers=target_customers,
+        differentials=differentials,
+        challenges=challenges,
+        goals=goals,
+        strengths=strengths,
+        limitations=limitations,
+        template=prompt_registry.render("blue_ocean_reference")
+    )
+
+def _blue_ocean_fallback(form_data):
+    """Simulated Blue Ocean strategy used when OpenAI can't be reached"""
+    return get_fallback("blue_ocean", form_data)
+
+def generate_blue_ocean_strategy(form_data):
+    """
+    Generate a Blue Ocean strategy using OpenAI's GPT model
+    
+    This function takes form data about a business and sends it to OpenAI's API
+    to generate a Blue Ocean strategy.
+    
+    If OpenAI is not available, it returns simulated data.
+    """
+    # If OpenAI is not available, return simulated data immediately
+    if not OPENAI_AVAILABLE:
+        # Simulated analysis, delayed according to SIMULATED_LATENCY
+        simulated_latency.wait()
+        return _blue_ocean_fallback(form_data)
+    
+    system_prompt, prompt = _blue_ocean_prompt(form_data)
+    try:
+        return _create_completion(system_prompt, prompt, BlueOceanAnalysis)
+    except Exception as e:
+        # If there's an error, return a default response
+        print(f"Error calling OpenAI API: {e}")
+        return _blue_ocean_fallback(form_data)
+
+async def generate_blue_ocean_strategy_async(form_data):
+    """
+    Generate a Blue Ocean strategy without blocking a thread
+    
+    Same contract as generate_blue_ocean_strategy, backed by AsyncOpenAI.
+    """
+    if not OPENAI_AVAILABLE:
+        await simulated_latency.wait_async()
+        return _blue_ocean_fallback(form_data)
+    
+    system_prompt, prompt = _blue_ocean_prompt(form_data)
+    try:
+        return await _acreate_completion(system_prompt, prompt, BlueOceanAnalysis)
+    except Exception as e:
+        print(f"Error calling OpenAI API: {e}")
+        return _blue_ocean_fallback(form_data)
+
+def _seo_prompt(form_data):
+    """Build the system and user prompts for the SEO analysis"""
+    # Extract form data
+    business_name = form_data.get('business_name', 'Empresa')
+    website_url = form_data.get('website_url', 'https://exemplo.com')
+    keywords = form_data.get('keywords', 'palavras-chave')
+    competitors = form_data.get('competitors', 'concorrentes')
+    digital_channels = form_data.get('digital_channels', [])
+    site_age = form_data.get('site_age', '1 a 3 anos')
+    goals = form_data.get('goals', 'objetivos')
+    target_audience = form_data.get('target_audience', 'público-alvo')
+    
+    return _assemble_prompt(
+        "seo",
+        SEO_SYSTEM_PROMPT,
+        seo_example=prompt_registry.render("seo_example", business_name=business_name),
+        business_name=business_name,
+        website_url=website_url,
+        keywords=keywords,
+        competitors=competitors,
+        digital_channels=', '.join(digital_channels) if digital_channels else 'Não informado',
+        site_age=site_age,
+        goals=goals,
+        target_audience=target_audience
+    )
+
+def _seo_fallback(form_data):
+    """Simulated SEO analysis used when OpenAI can't be reached"""
+    return get_fallback("seo", form_data)
+
+def analyze_seo(form_data):
+    """
+    Analyze SEO data using OpenAI's GPT model
+    
+    This function takes form data about a website and sends it to OpenAI's API
+    to generate SEO insights and recommendations.
+    """
+    # If OpenAI is not available, return simulated data immediately
+    if not OPENAI_AVAILABLE:
+        # Simulated analysis, delayed according to SIMULATED_LATENCY
+        simulated_latency.wait()
+        return _seo_fallback(form_data)
+    
+    system_prompt, prompt = _seo_prompt(form_data)
+    try:
+        return _create_completion(system_prompt, prompt, SEOAnalysis)
+    except Exception as e:
+        # If there's an error, return a default response
+        print(f"Error calling OpenAI API: {e}")
+        return _seo_fallback(form_data)
+
+async def analyze_seo_async(form_data):
+    """
+    Analyze SEO data without blocking a thread
+    
+    Same contract as analyze_seo, backed by AsyncOpenAI.
+    """
+    if not OPENAI_AVAILABLE:
+        await simulated_latency.wait_async()
+        return _seo_fallback(form_data)
+    
+    system_prompt, prompt = _seo_prompt(form_data)
+    try:
+        return await _acreate_completion(system_prompt, prompt, SEOAnalysis)
+    except Exception as e:
+        print(f"Error calling OpenAI API: {e}")
+        return _seo_fallback(form_data)
+
+# Prompt and fallback builders per report type, used by the streaming path
+_REPORT_BUILDERS = {
+    "business_map": (_business_prompt, _business_fallback, BusinessAnalysis),
+    "blue_ocean": (_blue_ocean_prompt, _blue_ocean_fallback, BlueOceanAnalysis),
+    "seo": (_seo_prompt, _seo_fallback, SEOAnalysis)
+}
+
+def stream_analysis(report_type, form_data):
+    """
+    Generate the AI analysis for ``report_type`` in streaming mode
+    
+    Yields ``("item", key, index, value)`` for each completed element of a
+    top-level list (e.g. one recommendation), ``("member", key, value)`` for
+    each completed top-level section (e.g. the strengths list or a chart
+    array) and finally ``("done", analysis)`` with the full analysis.
+    
+    If the stream fails or its response doesn't match the schema, the
+    analysis is requested again without streaming (with the retries, hedging
+    and schema retries of _create_completion). If OpenAI is not available or
+    that request fails too, the simulated analysis is delivered instead.
+    """
+    if report_type not in _REPORT_BUILDERS:
+        raise ValueError(f"Tipo de relatório inválido: {report_type}")
+    build_prompt, build_fallback, response_model = _REPORT_BUILDERS[report_type]
+    
+    if not OPENAI_AVAILABLE:
+        # Simulated analysis, delayed according to SIMULATED_LATENCY
+        simulated_latency.wait()
+        result = build_fallback(form_data)
+        for key, value in result.items():
+            yield (MEMBER, key, value)
+        yield (DONE, result)
+        return
+    
+    system_prompt, prompt = build_prompt(form_data)
+    try:
+        yield from _stream_completion(system_prompt, prompt, response_model)
+        return
+    except Exception as e:
+        print(f"Streaming da resposta falhou ({e}), nova tentativa sem streaming")
+    
+    try:
+        result = _create_completion(system_prompt, prompt, response_model)
+    except Exception as e:
+        # If there's an error, finish with the default response
+        print(f"Error calling OpenAI API: {e}")
+        result = build_fallback(form_data)
+    yield (DONE, result)
@@ -0,0 +1,198 @@
+import os
+import re
+import threading
+import time
+from functools import lru_cache
+from string import Formatter
+from typing import Dict, Iterable, Optional
+
+_SPACES = re.compile(r"[ \t]+")
+_LIST_ITEM = re.compile(r"^(?:[-*+]|\d+\.)\s")
+
+
+def compact_prompt(text: str) -> str:
+    """Strip indentation, repeated spaces and blank lines from a prompt"""
+    lines = (_SPACES.sub(" ", line.strip()) for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+@lru_cache(maxsize=32)
+def markdown_outline(text: str) -> str:
+    """
+    Summarize a markdown template to its headings and list items
+
+    Paragraphs, images and code blocks are dropped; the structure the model
+    has to follow is kept.
+    """
+    outline = []
+    in_code = False
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("```"):
+            in_code = not in_code
+            continue
+        if in_code or not stripped or stripped.startswith("!["):
+            continue
+        if stripped.startswith("#") or _LIST_ITEM.match(stripped):
+            outline.append(_SPACES.sub(" ", stripped))
+    return "\n".join(outline)
+
+
+class PromptTemplate:
+    """
+    A prompt template compiled once into literal and placeholder segments
+
+    ``placeholders`` lists the fields the template must use; the source is
+    validated against it when compiled, so a typo in a template fails at
+    startup instead of at request time. Templates created with
+    ``placeholders=None`` are raw text (e.g. markdown with JSON examples) and
+    are returned unchanged by ``render``.
+    """
+
+    def __init__(self, name: str, text: str, placeholders: Optional[Iterable[str]] = None):
+        self.name = name
+        self.text = text
+        self.raw = placeholders is None
+        self.placeholders = frozenset(placeholders or ())
+        self._segments = [] if self.raw else self._compile()
+
+    def _compile(self):
+        segments = []
+        found = set()
+        for literal, field, spec, conversion in Formatter().parse(self.text):
+            if literal:
+                segments.append((literal, None, None))
+            if field is None:
+                continue
+            if not field.isidentifier() or conversion:
+                raise ValueError(f"Placeholder inválido '{field}' no template '{self.name}'")
+            found.add(field)
+            segments.append((None, field, spec or ""))
+
+        if found != self.placeholders:
+            missing = ", ".join(sorted(self.placeholders - found)) or "-"
+            unexpected = ", ".join(sorted(found - self.placeholders)) or "-"
+            raise ValueError(
+                f"Template '{self.name}' com placeholders divergentes "
+                f"(ausentes: {missing}; inesperados: {unexpected})"
+            )
+        return segments
+
+    def render(self, **values) -> str:
+        """Substitute ``values`` into the precompiled segments"""
+        if self.raw:
+            return self.text
+        missing = self.placeholders - values.keys()
+        if missing:
+            raise KeyError(f"Valores ausentes para o template '{self.name}': {', '.join(sorted(missing))}")
+
+        parts = []
+        for literal, field, spec in self._segments:
+            if field is None:
+                parts.append(literal)
+            elif spec:
+                parts.append(format(values[field], spec))
+            else:
+                parts.append(str(values[field]))
+        return "".join(parts)
+
+
+class PromptRegistry:
+    """
+    In-memory registry of compiled prompt templates
+
+    Templates are registered from text or from files. File-backed templates
+    are read once and re-read only when their mtime changes (checked at most
+    every ``check_interval`` seconds), so edits are picked up without a
+    restart while requests only pay for the substitution.
+    """
+
+    def __init__(self, check_interval: float = 1.0):
+        self.check_interval = check_interval
+        self._templates: Dict[str, PromptTemplate] = {}
+        self._files: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, text: str, placeholders: Optional[Iterable[str]] = None) -> PromptTemplate:
+        """Compile and register a template from text"""
+        template = PromptTemplate(name, text, placeholders)
+        with self._lock:
+            self._templates[name] = template
+            self._files.pop(name, None)
+        return template
+
+    def register_file(
+        self,
+        name: str,
+        path: str,
+        placeholders: Optional[Iterable[str]] = None,
+        default: Optional[str] = None
+    ) -> PromptTemplate:
+        """
+        Compile and register a template read from ``path``
+
+        When the file can't be read ``default`` is used (if given) until the
+        file becomes available.
+        """
+        placeholders = None if placeholders is None else frozenset(placeholders)
+        with self._lock:
+            self._files[name] = {
+                "path": path,
+                "placeholders": placeholders,
+                "default": default,
+                "mtime": None,
+                "checked": 0.0,
+            }
+            self._templates.pop(name, None)
+            return self._load_file(name, force=True)
+
+    def _load_file(self, name: str, force: bool = False) -> PromptTemplate:
+        entry = self._files[name]
+        now = time.monotonic()
+        if not force and now - entry["checked"] < self.check_interval:
+            return self._templates[name]
+        entry["checked"] = now
+
+        try:
+            mtime = os.stat(entry["path"]).st_mtime
+        except OSError as e:
+            # Keep the version already in memory if the file goes missing
+            if name in self._templates:
+                return self._templates[name]
+            if entry["default"] is None:
+                raise
+            print(f"Erro ao ler o template '{name}': {e}")
+            self._templates[name] = PromptTemplate(name, entry["default"], entry["placeholders"])
+            return self._templates[name]
+
+        if mtime == entry["mtime"] and name in self._templates:
+            return self._templates[name]
+
+        with open(entry["path"], "r", encoding="utf-8") as f:
+            text = f.read()
+        try:
+            template = PromptTemplate(name, text, entry["placeholders"])
+        except ValueError as e:
+            if name not in self._templates:
+                raise
+            # Keep serving the last valid version while the file is being edited
+            print(f"Template '{name}' inválido, mantendo a versão anterior: {e}")
+            return self._templates[name]
+
+        entry["mtime"] = mtime
+        self._templates[name] = template
+        return template
+
+    def get(self, name: str) -> PromptTemplate:
+        """Return the compiled template, reloading file-backed ones if they changed"""
+        with self._lock:
+            if name in self._files:
+                return self._load_file(name)
+            return self._templates[name]
+
+    def render(self, name: str, **values) -> str:
+        return self.get(name).render(**values)
+
+    def names(self):
+        with self._lock:
+            return sorted(self._templates)
@@ -0,0 +1,198 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Dict, Optional
+
+from config import EnvironmentManager
+
+# Rough characters-per-token ratio used to estimate prompt sizes before a call
+CHARS_PER_TOKEN = 4
+# Tokens added per chat message for role/formatting overhead
+MESSAGE_OVERHEAD_TOKENS = 4
+# Poll interval for async waiters, which can't block on the condition variable
+ASYNC_POLL_SECONDS = 0.05
+
+
+def estimate_tokens(*texts: str) -> int:
+    """Estimate the number of prompt tokens of one or more chat messages"""
+    return sum(len(text) // CHARS_PER_TOKEN + MESSAGE_OVERHEAD_TOKENS for text in texts if text)
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``refill_per_second``"""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self._level = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._level = min(self.capacity, self._level + elapsed * self.refill_per_second)
+        self._updated = now
+
+    def time_until(self, amount: float, now: float) -> float:
+        """Seconds until ``amount`` can be taken (0 if available right now)"""
+        self._refill(now)
+        # Requests bigger than the bucket only wait for a full bucket
+        missing = min(amount, self.capacity) - self._level
+        if missing <= 0:
+            return 0.0
+        return missing / self.refill_per_second
+
+    def consume(self, amount: float) -> None:
+        self._level -= amount
+
+    def refund(self, amount: float) -> None:
+        """Give back (or, if negative, further debit) part of a reservation"""
+        self._level = min(self.capacity, self._level + amount)
+
+
+class Permit:
+    """Reservation granted by RateLimiter for a single request"""
+
+    def __init__(self, estimated_tokens: int):
+        self.estimated_tokens = estimated_tokens
+        # Set by the caller once the real usage is known
+        self.actual_tokens: Optional[int] = None
+
+
+class RateLimiter:
+    """
+    Process-wide limiter for LLM calls
+
+    Enforces requests per minute and tokens per minute with two token buckets
+    and caps the number of requests in flight. Waiting callers are served in
+    FIFO order, whether they block a thread (``limit``) or await on an event
+    loop (``limit_async``).
+    """
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float, max_in_flight: int):
+        self.max_in_flight = max_in_flight
+        self._requests = TokenBucket(requests_per_minute, requests_per_minute / 60)
+        self._tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60)
+        self._condition = threading.Condition()
+        self._queue = deque()
+        self._in_flight = 0
+
+        self._acquired = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    @classmethod
+    def from_environment(cls) -> "RateLimiter":
+        """Build a limiter from the OPENAI_* settings in EnvironmentManager"""
+        env = EnvironmentManager()
+        return cls(
+            requests_per_minute=float(env.get("OPENAI_RPM_LIMIT", "500")),
+            tokens_per_minute=float(env.get("OPENAI_TPM_LIMIT", "200000")),
+            max_in_flight=int(env.get("OPENAI_MAX_IN_FLIGHT", "8")),
+        )
+
+    def _try_acquire(self, ticket: object, tokens: int) -> Optional[float]:
+        """
+        Take the reservation for ``ticket`` if it is its turn
+
+        Returns 0 when acquired, the seconds to wait when only the budget is
+        missing, or None when the caller must wait for another caller.
+        """
+        if self._queue[0] is not ticket or self._in_flight >= self.max_in_flight:
+            return None
+
+        now = time.monotonic()
+        wait = max(self._requests.time_until(1, now), self._tokens.time_until(tokens, now))
+        if wait > 0:
+            return wait
+
+        self._requests.consume(1)
+        self._tokens.consume(tokens)
+        self._queue.popleft()
+        self._in_flight += 1
+        self._condition.notify_all()
+        return 0.0
+
+    def _record_wait(self, waited: float) -> None:
+        self._acquired += 1
+        self._total_wait += waited
+        self._max_wait = max(self._max_wait, waited)
+
+    def _abandon(self, ticket: object) -> None:
+        if ticket in self._queue:
+            self._queue.remove(ticket)
+            self._condition.notify_all()
+
+    def acquire(self, estimated_tokens: int) -> Permit:
+        """Block until the request can be sent and return its permit"""
+        ticket = object()
+        started = time.monotonic()
+        with self._condition:
+            self._queue.append(ticket)
+            try:
+                while True:
+                    wait = self._try_acquire(ticket, estimated_tokens)
+                    if wait == 0:
+                        break
+                    self._condition.wait(timeout=wait)
+            finally:
+                self._abandon(ticket)
+            self._record_wait(time.monotonic() - started)
+        return Permit(estimated_tokens)
+
+    async def acquire_async(self, estimated_tokens: int) -> Permit:
+        """Await until the request can be sent and return its permit"""
+        ticket = object()
+        started = time.monotonic()
+        with self._condition:
+            self._queue.append(ticket)
+        try:
+            while True:
+                with self._condition:
+                    wait = self._try_acquire(ticket, estimated_tokens)
+                    if wait == 0:
+                        self._record_wait(time.monotonic() - started)
+                        break
+                await asyncio.sleep(min(wait, ASYNC_POLL_SECONDS) if wait else ASYNC_POLL_SECONDS)
+        finally:
+            with self._condition:
+                self._abandon(ticket)
+        return Permit(estimated_tokens)
+
+    def release(self, permit: Permit) -> None:
+        """Free the in-flight slot and reconcile the token estimate"""
+        with self._condition:
+            self._in_flight -= 1
+            if permit.actual_tokens is not None:
+                self._tokens.refund(permit.estimated_tokens - permit.actual_tokens)
+            self._condition.notify_all()
+
+    @contextmanager
+    def limit(self, estimated_tokens: int):
+        permit = self.acquire(estimated_tokens)
+        try:
+            yield permit
+        finally:
+            self.release(permit)
+
+    @asynccontextmanager
+    async def limit_async(self, estimated_tokens: int):
+        permit = await self.acquire_async(estimated_tokens)
+        try:
+            yield permit
+        finally:
+            self.release(permit)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth, in-flight count and wait time metrics"""
+        with self._condition:
+            return {
+                "queue_depth": len(self._queue),
+                "in_flight": self._in_flight,
+                "max_in_flight": self.max_in_flight,
+                "acquired": self._acquired,
+                "avg_wait_seconds": round(self._total_wait / self._acquired, 4) if self._acquired else 0.0,
+                "max_wait_seconds": round(self._max_wait, 4),
+                "total_wait_seconds": round(self._total_wait, 4),
+            }
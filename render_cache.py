@@ -0,0 +1,89 @@
+import json
+from typing import Any, Dict
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from chart_specs import build_figure
+from figure_cache import FigureCache, input_key
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, plotly falls back to the json module
+    orjson = None
+
+JSON_ENGINE = "orjson" if orjson is not None else "json"
+
+
+def serialize_figure(figure: go.Figure) -> bytes:
+    """Figure JSON as st.plotly_chart would send it (orjson engine when available)"""
+    return pio.to_json(figure, validate=False, engine=JSON_ENGINE).encode("utf-8")
+
+
+class RenderedFigure(go.Figure):
+    """
+    Figure backed by a pre-serialized payload, for st.plotly_chart only
+
+    st.plotly_chart converts figures with ``to_dict`` (a deep copy of every
+    trace and of the template) before encoding them. This figure is empty;
+    ``to_dict`` returns the decoded payload instead, decoded once, so each
+    render only pays for the final JSON encoding.
+    """
+
+    def __init__(self, payload: bytes):
+        super().__init__()
+        self._payload = payload
+        self._payload_dict = None
+
+    @property
+    def payload(self) -> bytes:
+        return self._payload
+
+    def to_dict(self) -> Dict[str, Any]:
+        if self._payload_dict is None:
+            self._payload_dict = orjson.loads(self._payload) if orjson is not None else json.loads(self._payload)
+        return self._payload_dict
+
+    def to_plotly_json(self) -> Dict[str, Any]:
+        return self.to_dict()
+
+
+_rendered = FigureCache()
+
+
+def rendered_figure(report: Dict[str, Any], key: str):
+    """
+    Figure to pass to st.plotly_chart for ``report['visualizations'][key]``
+
+    The chart is serialized once and the payload is stored with the report
+    in report_repository, so later page views (including after a restart)
+    neither build nor convert the figure again. Payloads are tied to the
+    chart spec and the Plotly template they were rendered with, and are
+    rebuilt when either changes. Live figures are returned as they are.
+    """
+    spec = report['visualizations'][key]
+    if isinstance(spec, go.Figure):
+        return spec
+
+    fingerprint = input_key(spec, pio.templates.default)
+    report_id = report.get('id')
+    return _rendered.get_or_build(f"{report_id}:{key}:{fingerprint}", lambda: RenderedFigure(_payload(report_id, key, spec, fingerprint)))
+
+
+def _payload(report_id, key, spec, fingerprint) -> bytes:
+    from report_repository import get_report_repository
+
+    repository = get_report_repository() if report_id else None
+    if repository is not None:
+        stored = repository.get_rendered(report_id, key)
+        if stored is not None and stored[0] == fingerprint:
+            return stored[1]
+
+    payload = serialize_figure(build_figure(spec))
+    if repository is not None:
+        repository.save_rendered(report_id, key, fingerprint, payload)
+    return payload
+
+
+def render_cache_stats() -> Dict[str, int]:
+    return _rendered.stats()
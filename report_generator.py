@@ -1,16 +1,37 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 import uuid
 import datetime
 import random
-from utils import (
-    generate_radar_chart, 
-    generate_bar_chart, 
-    generate_line_chart
-)
-from api_client import AIClient
+import asyncio
+import os
+from chart_specs import chart_spec
+from api_client import AIClient, AsyncAIClient
+from fallback_store import get_fallback_section
+from report_repository import get_report_repository
+import openai_client
+
+REPORT_TYPES = ("business_map", "blue_ocean", "seo")
+
+# Top-level sections of the AI analysis of each report type, in the order the
+# model is asked to produce them (used to report streaming progress)
+REPORT_SECTIONS = {
+    "business_map": (
+        "strengths", "weaknesses", "opportunities", "threats", "recommendations",
+        "categories", "values", "market_data", "growth_data"
+    ),
+    "blue_ocean": (
+        "eliminate", "reduce", "raise", "create", "canvas_factors",
+        "your_values", "industry_values", "recommendations"
+    ),
+    "seo": (
+        "overall_score", "keywords_data", "traffic_sources",
+        "optimization_opportunities", "recommendations"
+    )
+}
+
+# Upper bound on LLM calls a single generate_reports_concurrently call keeps in flight
+MAX_CONCURRENT_REPORTS = int(os.environ.get("MAX_CONCURRENT_REPORTS", 4))
 
 def generate_report(report_type, form_data):
     """
@@ -20,19 +41,8 @@ def generate_report(report_type, form_data):
     based on the user's input data.
     """
     
-    # Create report ID and timestamp
-    report_id = str(uuid.uuid4())
-    generated_date = datetime.datetime.now().strftime("%d/%m/%Y %H:%M")
-    
-    # Map report types to display names
-    report_type_display = {
-        "business_map": "Mapa do Seu Negócio",
-        "blue_ocean": "Relatório Xperience (Blue Ocean)",
-        "seo": "Relatório SEO"
-    }.get(report_type, "Relatório Personalizado")
-    
     # Pre-process form data to ensure all required fields are present
-    form_data = {k: v for k, v in form_data.items() if v is not None and v != ""}
+    form_data = _clean_form_data(form_data)
     
     # Initialize AI client
     ai_client = AIClient()
@@ -48,105 +58,200 @@ def generate_report(report_type, form_data):
         else:
             raise ValueError(f"Tipo de relatório inválido: {report_type}")
         
-        # Ensure recommendations are properly structured
-        recommendations = ai_analysis.get('recommendations', [])
-        if not recommendations:
-            # Create default recommendation if none exist
-            recommendations = [{
-                "title": "Recomendação Geral",
-                "description": "Com base na análise dos dados fornecidos, recomendamos uma revisão detalhada da estratégia atual.",
-                "action_items": [
-                    "Realizar análise aprofundada do mercado",
-                    "Identificar oportunidades de melhoria",
-                    "Desenvolver plano de ação específico"
-                ]
-            }]
-        else:
-            # Ensure each recommendation has the required structure
-            structured_recommendations = []
-            for rec in recommendations:
-                if isinstance(rec, dict):
-                    structured_rec = {
-                        "title": rec.get('title', 'Recomendação'),
-                        "description": rec.get('description', 'Descrição não fornecida'),
-                        "action_items": rec.get('action_items', [])
-                    }
-                else:
-                    # If recommendation is a string, create a structured version
-                    structured_rec = {
-                        "title": "Recomendação",
-                        "description": str(rec),
-                        "action_items": []
-                    }
-                structured_recommendations.append(structured_rec)
-            recommendations = structured_recommendations
-        
-        # Update AI analysis with structured recommendations
-        ai_analysis['recommendations'] = recommendations
-        
-        # Create base report structure
-        report = {
-            "id": report_id,
-            "generated_date": generated_date,
-            "report_type": report_type,
-            "report_type_display": report_type_display,
-            "form_data": form_data,
-            "ai_analysis": ai_analysis,
-            "recommendations": recommendations,  # Add recommendations at top level
-            "conclusion": ai_analysis.get('conclusion', 'Análise concluída com sucesso.')
-        }
-        
-        # Add report-specific data and visualizations
-        if report_type == "business_map":
-            report.update(_generate_business_map_report(form_data, ai_analysis))
-        elif report_type == "blue_ocean":
-            report.update(_generate_blue_ocean_report(form_data, ai_analysis))
-        elif report_type == "seo":
-            report.update(_generate_seo_report(form_data, ai_analysis))
-        
-        return report
+        return _build_report(report_type, form_data, ai_analysis)
         
     except Exception as e:
         st.error(f"Erro ao gerar relatório: {str(e)}")
         raise
 
-def _generate_business_map_report(form_data, ai_analysis):
-    """Generate business map specific report content"""
-    business_name = form_data.get('business_name', 'Empresa')
+def stream_report(report_type, form_data):
+    """
+    Generate a report in streaming mode
+    
+    Yields the analysis events of openai_client.stream_analysis as sections
+    of the LLM response complete (``("item", key, index, value)`` and
+    ``("member", key, value)``), then ``("report", report)`` with the fully
+    assembled report.
+    """
+    if report_type not in REPORT_TYPES:
+        raise ValueError(f"Tipo de relatório inválido: {report_type}")
     
-    # Default data for visualizations if AI analysis doesn't provide it
-    default_categories = ['Inovação', 'Marketing', 'Operações', 'Finanças', 'Atendimento', 'Produto']
-    default_values = [7, 6, 8, 7, 9, 8]
-    default_market_data = {
-        'Qualidade': 8,
-        'Preço': 7,
-        'Atendimento': 9,
-        'Inovação': 8,
-        'Alcance': 6
+    form_data = _clean_form_data(form_data)
+    
+    # Runs on report job workers, without a Streamlit script context: errors
+    # propagate to the job and are shown by main.show_job_progress
+    for event in AIClient().stream_analysis(report_type, form_data):
+        if event[0] == openai_client.DONE:
+            yield ("report", _build_report(report_type, form_data, event[1]))
+        else:
+            yield event
+
+def generate_reports_concurrently(requests):
+    """
+    Generate several reports with their LLM calls running concurrently
+    
+    ``requests`` is an iterable of ``(report_type, form_data)`` tuples or of
+    dicts with ``report_type`` and ``form_data`` keys. The AI analyses are
+    fanned out on the shared AsyncAIClient event loop (at most
+    MAX_CONCURRENT_REPORTS at a time) and the figures are built afterwards,
+    so total latency is close to that of the slowest report.
+    
+    Returns the reports in the same order as ``requests``.
+    """
+    normalized = []
+    for request in requests:
+        if isinstance(request, dict):
+            report_type, form_data = request["report_type"], request.get("form_data", {})
+        else:
+            report_type, form_data = request
+        if report_type not in REPORT_TYPES:
+            raise ValueError(f"Tipo de relatório inválido: {report_type}")
+        normalized.append((report_type, _clean_form_data(form_data)))
+    
+    if not normalized:
+        return []
+    
+    try:
+        analyses = AsyncAIClient.run(_analyze_concurrently(normalized))
+        return [
+            _build_report(report_type, form_data, ai_analysis)
+            for (report_type, form_data), ai_analysis in zip(normalized, analyses)
+        ]
+    except Exception as e:
+        st.error(f"Erro ao gerar relatório: {str(e)}")
+        raise
+
+async def _analyze_concurrently(requests):
+    """Run the AI analysis of every request, bounded by MAX_CONCURRENT_REPORTS"""
+    ai_client = AsyncAIClient()
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REPORTS)
+    analyzers = {
+        "business_map": ai_client.analyze_business,
+        "blue_ocean": ai_client.generate_blue_ocean_strategy,
+        "seo": ai_client.analyze_seo
     }
-    default_growth_data = {
-        'Q1': 100,
-        'Q2': 120,
-        'Q3': 150,
-        'Q4': 200
+    
+    async def analyze(report_type, form_data):
+        async with semaphore:
+            return await analyzers[report_type](form_data)
+    
+    return await asyncio.gather(*[
+        analyze(report_type, form_data) for report_type, form_data in requests
+    ])
+
+def _clean_form_data(form_data):
+    """Drop empty values from the submitted form data"""
+    return {k: v for k, v in form_data.items() if v is not None and v != ""}
+
+def _build_report(report_type, form_data, ai_analysis):
+    """Assemble the report dict and its chart specs from an AI analysis"""
+    
+    # Create report ID and timestamps (display string and sortable epoch seconds)
+    report_id = str(uuid.uuid4())
+    generated = datetime.datetime.now()
+    generated_date = generated.strftime("%d/%m/%Y %H:%M")
+    
+    # Map report types to display names
+    report_type_display = {
+        "business_map": "Mapa do Seu Negócio",
+        "blue_ocean": "Relatório Xperience (Blue Ocean)",
+        "seo": "Relatório SEO"
+    }.get(report_type, "Relatório Personalizado")
+    
+    # Ensure recommendations are properly structured
+    recommendations = ai_analysis.get('recommendations', [])
+    if not recommendations:
+        # Create default recommendation if none exist
+        recommendations = [{
+            "title": "Recomendação Geral",
+            "description": "Com base na análise dos dados fornecidos, recomendamos uma revisão detalhada da estratégia atual.",
+            "action_items": [
+                "Realizar análise aprofundada do mercado",
+                "Identificar oportunidades de melhoria",
+                "Desenvolver plano de ação específico"
+            ]
+        }]
+    else:
+        # Ensure each recommendation has the required structure
+        structured_recommendations = []
+        for rec in recommendations:
+            if isinstance(rec, dict):
+                structured_rec = {
+                    "title": rec.get('title', 'Recomendação'),
+                    "description": rec.get('description', 'Descrição não fornecida'),
+                    "action_items": rec.get('action_items', [])
+                }
+            else:
+                # If recommendation is a string, create a structured version
+                structured_rec = {
+                    "title": "Recomendação",
+                    "description": str(rec),
+                    "action_items": []
+                }
+            structured_recommendations.append(structured_rec)
+        recommendations = structured_recommendations
+    
+    # Update AI analysis with structured recommendations
+    ai_analysis['recommendations'] = recommendations
+    
+    # Create base report structure
+    report = {
+        "id": report_id,
+        "generated_date": generated_date,
+        "generated_at": generated.timestamp(),
+        "report_type": report_type,
+        "report_type_display": report_type_display,
+        "form_data": form_data,
+        "ai_analysis": ai_analysis,
+        "recommendations": recommendations,  # Add recommendations at top level
+        "conclusion": ai_analysis.get('conclusion', 'Análise concluída com sucesso.')
     }
     
-    # Get data from AI analysis or use defaults
-    categories = ai_analysis.get('categories', default_categories)
-    values = ai_analysis.get('values', default_values)
-    market_data = ai_analysis.get('market_data', default_market_data)
-    growth_data = ai_analysis.get('growth_data', default_growth_data)
+    # Add report-specific data and visualizations
+    if report_type in _REPORT_CONTENT:
+        report.update(_REPORT_CONTENT[report_type](form_data, ai_analysis))
+    
+    return report
+
+def restore_visualizations(report):
+    """
+    Return ``report`` with its chart specs
+    
+    Reports stored before chart specs were kept in the report don't have
+    visualizations; they are rebuilt here from the report's form data and
+    AI analysis.
+    """
+    if 'visualizations' in report or report.get('report_type') not in _REPORT_CONTENT:
+        return report
+    content = _REPORT_CONTENT[report['report_type']](report.get('form_data', {}), report.get('ai_analysis', {}))
+    return dict(report, visualizations=content['visualizations'])
+
+def _analysis_section(ai_analysis, report_type, key, form_data):
+    """Section of the AI analysis, or its default from fallback_store when missing"""
+    if key in ai_analysis:
+        return ai_analysis[key]
+    return get_fallback_section(report_type, key, form_data)
+
+def _generate_business_map_report(form_data, ai_analysis):
+    """Generate business map specific report content"""
+    business_name = form_data.get('business_name', 'Empresa')
+    
+    # Get data from AI analysis or use the defaults from fallback_store
+    categories = _analysis_section(ai_analysis, 'business_map', 'categories', form_data)
+    values = _analysis_section(ai_analysis, 'business_map', 'values', form_data)
+    market_data = _analysis_section(ai_analysis, 'business_map', 'market_data', form_data)
+    growth_data = _analysis_section(ai_analysis, 'business_map', 'growth_data', form_data)
     
     # Ensure we have data for all visualizations
     if not categories or not values:
-        categories = default_categories
-        values = default_values
+        categories = get_fallback_section('business_map', 'categories', form_data)
+        values = get_fallback_section('business_map', 'values', form_data)
     
     if not market_data:
-        market_data = default_market_data
+        market_data = get_fallback_section('business_map', 'market_data', form_data)
         
     if not growth_data:
-        growth_data = default_growth_data
+        growth_data = get_fallback_section('business_map', 'growth_data', form_data)
     
     return {
         "title": f"Mapa Estratégico: {business_name}",
@@ -155,24 +260,27 @@ def _generate_business_map_report(form_data, ai_analysis):
             "identificando oportunidades de crescimento e áreas para otimização."
         ),
         "visualizations": {
-            "radar_chart": generate_radar_chart(
-                categories,
-                values,
-                "Desempenho por Área"
+            "radar_chart": chart_spec(
+                "radar",
+                categories=categories,
+                values=values,
+                title="Desempenho por Área"
             ),
-            "market_comparison": generate_bar_chart(
-                list(market_data.keys()),
-                list(market_data.values()),
-                "Comparação com o Mercado",
-                "Categorias",
-                "Valores"
+            "market_comparison": chart_spec(
+                "bar",
+                x=list(market_data.keys()),
+                y=list(market_data.values()),
+                title="Comparação com o Mercado",
+                x_label="Categorias",
+                y_label="Valores"
             ),
-            "growth_potential": generate_line_chart(
-                list(growth_data.keys()),
-                list(growth_data.values()),
-                "Potencial de Crescimento",
-                "Período",
-                "Crescimento (%)"
+            "growth_potential": chart_spec(
+                "line",
+                x=list(growth_data.keys()),
+                y=list(growth_data.values()),
+                title="Potencial de Crescimento",
+                x_label="Período",
+                y_label="Crescimento (%)"
             )
         }
     }
@@ -181,23 +289,14 @@ def _generate_blue_ocean_report(form_data, ai_analysis):
     """Generate Blue Ocean specific report content"""
     business_name = form_data.get('business_name', 'Empresa')
     
-    # Default data for visualizations
-    default_canvas_factors = ['Preço', 'Qualidade', 'Inovação', 'Marketing', 'Atendimento']
-    default_your_values = [7, 8, 9, 7, 8]
-    default_industry_values = [8, 7, 6, 8, 7]
-    default_eliminate = ['Processos redundantes', 'Custos desnecessários']
-    default_reduce = ['Tempo de espera', 'Complexidade']
-    default_raise = ['Satisfação do cliente', 'Eficiência']
-    default_create = ['Novas experiências', 'Inovações']
-    
-    # Get data from AI analysis or use defaults
-    canvas_factors = ai_analysis.get('canvas_factors', default_canvas_factors)
-    your_values = ai_analysis.get('your_values', default_your_values)
-    industry_values = ai_analysis.get('industry_values', default_industry_values)
-    eliminate = ai_analysis.get('eliminate', default_eliminate)
-    reduce = ai_analysis.get('reduce', default_reduce)
-    raise_items = ai_analysis.get('raise', default_raise)
-    create = ai_analysis.get('create', default_create)
+    # Get data from AI analysis or use the defaults from fallback_store
+    canvas_factors = _analysis_section(ai_analysis, 'blue_ocean', 'canvas_factors', form_data)
+    your_values = _analysis_section(ai_analysis, 'blue_ocean', 'your_values', form_data)
+    industry_values = _analysis_section(ai_analysis, 'blue_ocean', 'industry_values', form_data)
+    eliminate = _analysis_section(ai_analysis, 'blue_ocean', 'eliminate', form_data)
+    reduce = _analysis_section(ai_analysis, 'blue_ocean', 'reduce', form_data)
+    raise_items = _analysis_section(ai_analysis, 'blue_ocean', 'raise', form_data)
+    create = _analysis_section(ai_analysis, 'blue_ocean', 'create', form_data)
     
     # Update AI analysis with the data we'll use
     ai_analysis.update({
@@ -217,9 +316,17 @@ def _generate_blue_ocean_report(form_data, ai_analysis):
             "identificando oportunidades de criação de novo espaço de mercado."
         ),
         "visualizations": {
-            "strategy_canvas": _create_strategy_canvas(ai_analysis),
-            "actions_chart": _create_actions_chart(ai_analysis),
-            "performance_projection": _create_performance_projection(ai_analysis)
+            "strategy_canvas": chart_spec(
+                "strategy_canvas",
+                factors=canvas_factors,
+                your_values=your_values,
+                industry_values=industry_values
+            ),
+            "actions_chart": chart_spec(
+                "errc_actions",
+                counts=[len(eliminate), len(reduce), len(raise_items), len(create)]
+            ),
+            "performance_projection": chart_spec("performance_projection")
         }
     }
 
@@ -228,30 +335,10 @@ def _generate_seo_report(form_data, ai_analysis):
     business_name = form_data.get('business_name', 'Empresa')
     website_url = form_data.get('website_url', 'exemplo.com')
     
-    # Default data for visualizations
-    default_keywords_data = {
-        'keywords': ['produto1', 'serviço1', 'solução1', 'marca1', 'categoria1'],
-        'positions': [3, 5, 8, 12, 15],
-        'search_volumes': [1000, 800, 600, 400, 200]
-    }
-    
-    default_traffic_sources = {
-        'sources': ['Orgânico', 'Direto', 'Social', 'Email', 'Referral'],
-        'percentages': [40, 25, 20, 10, 5]
-    }
-    
-    default_optimization_opportunities = [
-        {'area': 'SEO On-page', 'impact': 8, 'difficulty': 5},
-        {'area': 'Conteúdo', 'impact': 9, 'difficulty': 6},
-        {'area': 'Backlinks', 'impact': 7, 'difficulty': 8},
-        {'area': 'Performance', 'impact': 6, 'difficulty': 4},
-        {'area': 'Mobile', 'impact': 8, 'difficulty': 7}
-    ]
-    
-    # Get data from AI analysis or use defaults
-    keywords_data = ai_analysis.get('keywords_data', default_keywords_data)
-    traffic_sources = ai_analysis.get('traffic_sources', default_traffic_sources)
-    optimization_opportunities = ai_analysis.get('optimization_opportunities', default_optimization_opportunities)
+    # Get data from AI analysis or use the defaults from fallback_store
+    keywords_data = _analysis_section(ai_analysis, 'seo', 'keywords_data', form_data)
+    traffic_sources = _analysis_section(ai_analysis, 'seo', 'traffic_sources', form_data)
+    optimization_opportunities = _analysis_section(ai_analysis, 'seo', 'optimization_opportunities', form_data)
     
     # Update AI analysis with the data we'll use
     ai_analysis.update({
@@ -267,154 +354,42 @@ def _generate_seo_report(form_data, ai_analysis):
             f"({website_url}), com recomendações para otimização."
         ),
         "visualizations": {
-            "keyword_performance": _create_keyword_chart(ai_analysis),
-            "traffic_sources": _create_traffic_chart(ai_analysis),
-            "optimization_opportunities": _create_optimization_chart(ai_analysis)
+            "keyword_performance": chart_spec(
+                "keyword_performance",
+                keywords=keywords_data.get('keywords', []),
+                positions=keywords_data.get('positions', []),
+                search_volumes=keywords_data.get('search_volumes', [])
+            ),
+            "traffic_sources": chart_spec(
+                "traffic_sources",
+                sources=traffic_sources.get('sources', []),
+                percentages=traffic_sources.get('percentages', [])
+            ),
+            # Analyses are validated against report_schemas.SEOAnalysis, but
+            # reports saved before that may still lack some fields
+            "optimization_opportunities": chart_spec(
+                "optimization_opportunities",
+                areas=[opp.get('area', 'Área') for opp in optimization_opportunities],
+                impact=[opp.get('impact', 0) for opp in optimization_opportunities],
+                difficulty=[opp.get('difficulty', 0) for opp in optimization_opportunities]
+            )
         }
     }
 
-def _create_strategy_canvas(ai_analysis):
-    """Create strategy canvas visualization"""
-    factors = ai_analysis.get('canvas_factors', [])
-    your_values = ai_analysis.get('your_values', [])
-    industry_values = ai_analysis.get('industry_values', [])
-    
-    fig = go.Figure()
-    
-    fig.add_trace(go.Scatter(
-        x=factors,
-        y=your_values,
-        name='Sua Empresa',
-        line=dict(color='blue', width=4)
-    ))
-    
-    fig.add_trace(go.Scatter(
-        x=factors,
-        y=industry_values,
-        name='Concorrentes',
-        line=dict(color='red', width=4)
-    ))
-    
-    fig.update_layout(
-        title="Canvas Estratégico: Sua Empresa vs. Concorrentes",
-        xaxis_title="Fatores de Competição",
-        yaxis_title="Nível de Oferta",
-        yaxis=dict(range=[0, 10])
-    )
-    
-    return fig
-
-def _create_actions_chart(ai_analysis):
-    """Create actions chart visualization"""
-    actions = ["Eliminar", "Reduzir", "Aumentar", "Criar"]
-    action_counts = [
-        len(ai_analysis.get('eliminate', [])),
-        len(ai_analysis.get('reduce', [])),
-        len(ai_analysis.get('raise', [])),
-        len(ai_analysis.get('create', []))
-    ]
-    
-    return px.bar(
-        x=actions,
-        y=action_counts,
-        color=actions,
-        title="Framework ERRC (Eliminar-Reduzir-Aumentar-Criar)",
-        labels={'x': 'Ações Estratégicas', 'y': 'Quantidade de Elementos'}
-    )
-
-def _create_performance_projection(ai_analysis):
-    """Create performance projection visualization"""
-    years = [f"Ano {i}" for i in range(1, 6)]
-    blue_ocean = [100, 150, 225, 340, 510]  # 50% growth YoY
-    red_ocean = [100, 110, 121, 133, 146]   # 10% growth YoY
-    
-    fig = go.Figure()
-    
-    fig.add_trace(go.Scatter(
-        x=years,
-        y=blue_ocean,
-        name='Estratégia Blue Ocean',
-        line=dict(color='blue', width=3)
-    ))
-    
-    fig.add_trace(go.Scatter(
-        x=years,
-        y=red_ocean,
-        name='Mercado Tradicional',
-        line=dict(color='red', width=3)
-    ))
-    
-    fig.update_layout(
-        title="Projeção de Performance (5 anos)",
-        xaxis_title="Período",
-        yaxis_title="Crescimento (%)"
-    )
-    
-    return fig
-
-def _create_keyword_chart(ai_analysis):
-    """Create keyword performance visualization"""
-    keywords_data = ai_analysis.get('keywords_data', {})
-    
-    return px.scatter(
-        x=keywords_data.get('keywords', []),
-        y=keywords_data.get('positions', []),
-        size=keywords_data.get('search_volumes', []),
-        title="Performance de Palavras-chave",
-        labels={'x': 'Palavras-chave', 'y': 'Posição nos Resultados de Busca'}
-    )
-
-def _create_traffic_chart(ai_analysis):
-    """Create traffic sources visualization"""
-    traffic_data = ai_analysis.get('traffic_sources', {})
-    
-    return px.pie(
-        values=traffic_data.get('percentages', []),
-        names=traffic_data.get('sources', []),
-        title="Fontes de Tráfego",
-        hole=0.4
-    )
-
-def _create_optimization_chart(ai_analysis):
-    """Create optimization opportunities visualization"""
-    opportunities = ai_analysis.get('optimization_opportunities', [])
-    
-    areas = [opp['area'] for opp in opportunities]
-    impact = [opp['impact'] for opp in opportunities]
-    difficulty = [opp['difficulty'] for opp in opportunities]
-    
-    fig = go.Figure()
-    
-    fig.add_trace(go.Bar(
-        name='Impacto',
-        x=areas,
-        y=impact,
-        marker_color='blue'
-    ))
-    
-    fig.add_trace(go.Bar(
-        name='Dificuldade',
-        x=areas,
-        y=difficulty,
-        marker_color='red'
-    ))
-    
-    fig.update_layout(
-        barmode='group',
-        title="Oportunidades de Otimização",
-        xaxis_title="Áreas",
-        yaxis_title="Pontuação"
-    )
-    
-    return fig
+_REPORT_CONTENT = {
+    "business_map": _generate_business_map_report,
+    "blue_ocean": _generate_blue_ocean_report,
+    "seo": _generate_seo_report
+}
 
 def generate_sample_reports():
     """Generate sample reports for testing"""
     
+    repository = get_report_repository()
+    wallet_address = st.session_state.get('wallet_address', '')
+    
     # Only generate if no reports exist yet
-    if 'reports' not in st.session_state or not st.session_state.reports:
-        st.session_state.reports = []
-        
+    if not repository.count(wallet_address):
         # Sample Business Map report
         business_map_data = {
             'business_name': 'Tech Solutions',
@@ -426,10 +401,6 @@ def generate_sample_reports():
             'target_audience': 'Pequenas e Médias Empresas'
         }
         
-        business_map_report = generate_report('business_map', business_map_data)
-        if business_map_report:
-            st.session_state.reports.append(business_map_report)
-        
         # Sample Blue Ocean report
         blue_ocean_data = {
             'business_name': 'Inova Marketing',
@@ -440,10 +411,6 @@ def generate_sample_reports():
             'goals': 'Expandir para novos mercados, Aumentar ticket médio'
         }
         
-        blue_ocean_report = generate_report('blue_ocean', blue_ocean_data)
-        if blue_ocean_report:
-            st.session_state.reports.append(blue_ocean_report)
-        
         # Sample SEO report
         seo_data = {
             'business_name': 'Ecommerce Shop',
@@ -454,6 +421,12 @@ def generate_sample_reports():
             'channels': 'Google, Redes Sociais, Blog'
         }
         
-        seo_report = generate_report('seo', seo_data)
-        if seo_report:
-            st.session_state.reports.append(seo_report)
+        # Generate the three reports concurrently
+        sample_reports = generate_reports_concurrently([
+            ('business_map', business_map_data),
+            ('blue_ocean', blue_ocean_data),
+            ('seo', seo_data)
+        ])
+        for report in sample_reports:
+            if report:
+                repository.save(report, wallet_address)
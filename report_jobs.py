@@ -0,0 +1,179 @@
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# Number of reports generated at the same time by the worker pool
+REPORT_WORKERS = int(os.environ.get("REPORT_WORKERS", 4))
+# Finished jobs are kept this long for polling, then discarded
+JOB_RETENTION_SECONDS = float(os.environ.get("REPORT_JOB_RETENTION", 3600))
+
+
+class ReportJob:
+    """A report generation request tracked by ReportJobQueue"""
+
+    def __init__(self, report_type: str, form_data: Dict[str, Any], owner: Optional[str] = None):
+        self.id = uuid.uuid4().hex
+        self.report_type = report_type
+        self.form_data = form_data
+        self.owner = owner
+        self.status = QUEUED
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        # Analysis events received so far, for partial rendering while running
+        self.events: List[tuple] = []
+        self.report = None
+        self.error = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Status of the job as plain data (without the events and report)"""
+        return {
+            "id": self.id,
+            "report_type": self.report_type,
+            "owner": self.owner,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "events": len(self.events),
+            "error": self.error,
+        }
+
+
+class ReportJobQueue:
+    """
+    In-process job queue for report generation
+
+    Jobs run on a thread pool independent of the Streamlit script run, so a
+    rerun or a browser refresh doesn't interrupt them. The UI keeps the job
+    id (session state and query params) and polls ``status``/``events``
+    until the report is available through ``result``.
+    """
+
+    def __init__(self, max_workers: int = REPORT_WORKERS, retention_seconds: float = JOB_RETENTION_SECONDS):
+        self.retention_seconds = retention_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="report-job")
+        self._jobs: Dict[str, ReportJob] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, report_type: str, form_data: Dict[str, Any], owner: Optional[str] = None) -> str:
+        """Queue a report and return its job id"""
+        from report_generator import REPORT_TYPES
+
+        if report_type not in REPORT_TYPES:
+            raise ValueError(f"Tipo de relatório inválido: {report_type}")
+
+        job = ReportJob(report_type, dict(form_data), owner)
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        self._executor.submit(self._run, job)
+        return job.id
+
+    def _run(self, job: ReportJob) -> None:
+        from report_generator import stream_report
+
+        job.status = RUNNING
+        job.started_at = time.time()
+        try:
+            for event in stream_report(job.report_type, job.form_data):
+                if event[0] == "report":
+                    job.report = event[1]
+                else:
+                    job.events.append(event)
+            # The error is set first, so a failed status is never seen without it
+            if job.report is None:
+                job.error = "A geração terminou sem relatório"
+            job.status = DONE if job.report is not None else FAILED
+        except Exception as e:
+            job.error = str(e)
+            job.status = FAILED
+        finally:
+            job.finished_at = time.time()
+
+    def _prune(self) -> None:
+        """Drop finished jobs older than the retention period"""
+        limit = time.time() - self.retention_seconds
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < limit
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def _get(self, job_id: str, owner: Optional[str] = None) -> Optional[ReportJob]:
+        """The job, or None when it is unknown or (given ``owner``) belongs to someone else"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None or (owner is not None and job.owner != owner):
+            return None
+        return job
+
+    def status(self, job_id: str, owner: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Return the job status, or None for unknown (or expired) jobs"""
+        job = self._get(job_id, owner)
+        return job.snapshot() if job else None
+
+    def events(self, job_id: str, since: int = 0, owner: Optional[str] = None) -> List[tuple]:
+        """Return the analysis events received after the first ``since``"""
+        job = self._get(job_id, owner)
+        return list(job.events[since:]) if job else []
+
+    def result(self, job_id: str, owner: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Return the finished report, or None while it isn't ready"""
+        job = self._get(job_id, owner)
+        return job.report if job and job.status == DONE else None
+
+    def take(self, job_id: str, owner: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Collect a finished job: remove it from the queue and return its report
+
+        Collection is one-shot, so only one session can save (or refund) a
+        job. Returns None, leaving the job in place, while it is still
+        running; failed jobs are removed and return None.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or (owner is not None and job.owner != owner) or job.status not in (DONE, FAILED):
+                return None
+            del self._jobs[job_id]
+        return job.report if job.status == DONE else None
+
+    def wait(self, job_id: str, timeout: Optional[float] = None, poll_interval: float = 0.05) -> Optional[Dict[str, Any]]:
+        """Block until the job finishes and return its status"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            status = self.status(job_id)
+            if status is None or status["status"] in (DONE, FAILED):
+                return status
+            if deadline is not None and time.monotonic() >= deadline:
+                return status
+            time.sleep(poll_interval)
+
+    def jobs(self, owner: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Status of every tracked job, optionally only those of ``owner``"""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return [job.snapshot() for job in jobs if owner is None or job.owner == owner]
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> ReportJobQueue:
+    """Return the process-wide queue shared by every Streamlit session"""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = ReportJobQueue()
+        return _queue
@@ -0,0 +1,599 @@
+import datetime
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.application.interfaces.i_state_manager import IStateManager
+from swot_themes import normalize
+
+# Format of the report's generated_date field
+DATE_FORMAT = "%d/%m/%Y %H:%M"
+
+
+def _timestamp(generated_date: Optional[str]) -> float:
+    """Epoch seconds of a generated_date string (0 when it can't be parsed)"""
+    try:
+        return datetime.datetime.strptime(generated_date, DATE_FORMAT).timestamp()
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _generated_at(report: Dict[str, Any]) -> float:
+    """Sortable generation time of a report (legacy reports only have generated_date)"""
+    value = report.get("generated_at")
+    if isinstance(value, (int, float)):
+        return float(value)
+    return _timestamp(report.get("generated_date"))
+
+
+def _load(payload: str) -> Dict[str, Any]:
+    """Decode a stored report, adding generated_at to reports saved without it"""
+    report = json.loads(payload)
+    if not isinstance(report.get("generated_at"), (int, float)):
+        report["generated_at"] = _timestamp(report.get("generated_date"))
+    return report
+
+
+def _day(value: Optional[Any]) -> Optional[str]:
+    """ISO day of a date, datetime or epoch seconds (aggregate bucket key)"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        value = datetime.datetime.fromtimestamp(value)
+    if isinstance(value, datetime.datetime):
+        value = value.date()
+    return value.isoformat()
+
+
+def _revenue(form_data: Dict[str, Any]) -> float:
+    try:
+        return float(form_data.get("monthly_revenue") or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _epoch(value: Optional[Any]) -> Optional[float]:
+    """Accept dates, datetimes or epoch seconds as query bounds"""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if isinstance(value, datetime.datetime):
+        return value.timestamp()
+    return datetime.datetime.combine(value, datetime.time.min).timestamp()
+
+
+# Tables maintained by _add_to_aggregates; bump AGGREGATES_VERSION when they
+# change so existing databases are rebuilt
+AGGREGATE_TABLES = ("report_daily", "report_industries", "report_swot")
+AGGREGATES_VERSION = 2
+
+# Sections of the AI analysis counted in report_swot
+SWOT_KINDS = ("strengths", "weaknesses", "opportunities", "threats")
+
+# Columns of the summaries returned by list_reports and page_reports
+SUMMARY_COLUMNS = "id, title, report_type, report_type_display, generated_date, recommendations"
+
+
+def _summary(row) -> Dict[str, Any]:
+    return {
+        "id": row[0],
+        "title": row[1],
+        "report_type": row[2],
+        "report_type_display": row[3],
+        "generated_date": row[4],
+        "recommendations": row[5],
+    }
+
+
+class ReportRepository(IStateManager):
+    """
+    Persistent storage for generated reports
+
+    Reports are stored in a local SQLite database (WAL mode, so the dashboards
+    can read while a report job writes) as compact JSON; their visualizations
+    are chart specs (see chart_specs), not Plotly figures. The columns the
+    dashboards filter and sort on (wallet address, report type and date) are
+    indexed, and listings are paginated. Reports are ordered by generated_at
+    (epoch seconds, derived from generated_date for legacy reports when they
+    are saved or loaded), ties in the order they were saved.
+
+    Per-day aggregates (report and recommendation counts per type, revenue
+    sums, industries and SWOT items) are updated in the same transaction as
+    each save or delete, so the dashboard metrics never need to load the
+    reports.
+
+    As an IStateManager, keys are report ids and values are report dicts.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS reports (
+                id TEXT PRIMARY KEY,
+                wallet_address TEXT NOT NULL DEFAULT '',
+                report_type TEXT NOT NULL,
+                report_type_display TEXT NOT NULL DEFAULT '',
+                title TEXT NOT NULL DEFAULT '',
+                generated_date TEXT NOT NULL DEFAULT '',
+                generated_at REAL NOT NULL,
+                recommendations INTEGER NOT NULL DEFAULT 0,
+                payload TEXT NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_reports_wallet_date ON reports (wallet_address, generated_at)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_reports_date ON reports (generated_at)")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_reports_wallet_type_date ON reports (wallet_address, report_type, generated_at)"
+        )
+        # Serialized figures of each report's charts (see render_cache)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS report_renders (
+                report_id TEXT NOT NULL,
+                chart TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                payload BLOB NOT NULL,
+                PRIMARY KEY (report_id, chart)
+            )
+            """
+        )
+        # Materialized aggregates, one row per wallet, day and report type
+        # (or industry); see aggregates()
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS report_daily (
+                wallet_address TEXT NOT NULL,
+                day TEXT NOT NULL,
+                report_type TEXT NOT NULL,
+                reports INTEGER NOT NULL DEFAULT 0,
+                recommendations INTEGER NOT NULL DEFAULT 0,
+                revenue REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (wallet_address, day, report_type)
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS report_industries (
+                wallet_address TEXT NOT NULL,
+                day TEXT NOT NULL,
+                industry TEXT NOT NULL,
+                reports INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (wallet_address, day, industry)
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS report_swot (
+                wallet_address TEXT NOT NULL,
+                day TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                item_key TEXT NOT NULL,
+                item TEXT NOT NULL,
+                reports INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (wallet_address, day, kind, item_key)
+            )
+            """
+        )
+        self._conn.commit()
+        self._backfill_aggregates()
+
+    def _backfill_aggregates(self) -> None:
+        """Rebuild the aggregates of databases created before AGGREGATES_VERSION"""
+        with self._lock, self._conn:
+            if self._conn.execute("PRAGMA user_version").fetchone()[0] >= AGGREGATES_VERSION:
+                return
+            for table in AGGREGATE_TABLES:
+                self._conn.execute(f"DELETE FROM {table}")
+            rows = self._conn.execute("SELECT wallet_address, generated_at, payload FROM reports").fetchall()
+            for wallet_address, generated_at, payload in rows:
+                self._add_to_aggregates(wallet_address, generated_at, _load(payload), 1)
+            self._conn.execute(f"PRAGMA user_version = {AGGREGATES_VERSION}")
+
+    def _add_to_aggregates(self, wallet_address: str, generated_at: float, report: Dict[str, Any], sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) a report's contribution; caller holds the lock"""
+        day = _day(generated_at)
+        form_data = report.get("form_data") or {}
+        self._conn.execute(
+            """
+            INSERT INTO report_daily (wallet_address, day, report_type, reports, recommendations, revenue)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (wallet_address, day, report_type) DO UPDATE SET
+                reports = reports + excluded.reports,
+                recommendations = recommendations + excluded.recommendations,
+                revenue = revenue + excluded.revenue
+            """,
+            (
+                wallet_address,
+                day,
+                report["report_type"],
+                sign,
+                sign * len(report.get("recommendations", [])),
+                sign * _revenue(form_data),
+            ),
+        )
+        if report["report_type"] == "business_map":
+            self._conn.execute(
+                """
+                INSERT INTO report_industries (wallet_address, day, industry, reports)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (wallet_address, day, industry) DO UPDATE SET reports = reports + excluded.reports
+                """,
+                (wallet_address, day, form_data.get("industry", ""), sign),
+            )
+        # Each distinct (normalized) SWOT item counts once per report
+        analysis = report.get("ai_analysis") or {}
+        for kind in SWOT_KINDS:
+            items = {}
+            for item in analysis.get(kind) or []:
+                key = normalize(item) if isinstance(item, str) else ""
+                if key:
+                    items.setdefault(key, item.strip())
+            self._conn.executemany(
+                """
+                INSERT INTO report_swot (wallet_address, day, kind, item_key, item, reports)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (wallet_address, day, kind, item_key) DO UPDATE SET reports = reports + excluded.reports
+                """,
+                [(wallet_address, day, kind, key, item, sign) for key, item in items.items()],
+            )
+        if sign < 0:
+            for table in AGGREGATE_TABLES:
+                self._conn.execute(
+                    f"DELETE FROM {table} WHERE wallet_address = ? AND day = ? AND reports <= 0",
+                    (wallet_address, day),
+                )
+
+    def _remove_from_aggregates(self, report_id: str) -> None:
+        """Subtract the stored version of ``report_id``, if any; caller holds the lock"""
+        row = self._conn.execute(
+            "SELECT wallet_address, generated_at, payload FROM reports WHERE id = ?", (report_id,)
+        ).fetchone()
+        if row:
+            self._add_to_aggregates(row[0], row[1], _load(row[2]), -1)
+
+    def save(self, report: Dict[str, Any], wallet_address: str = "") -> str:
+        """
+        Insert or update ``report`` for ``wallet_address`` and return its id
+
+        A report can only be updated by its own wallet: saving an id that
+        belongs to another wallet raises ValueError.
+        """
+        wallet_address = wallet_address or ""
+        payload = json.dumps(report, ensure_ascii=False, separators=(",", ":"), default=str)
+        generated_at = _generated_at(report)
+        # The aggregates change in the same transaction as the report, and any
+        # failure rolls both back
+        with self._lock, self._conn:
+            owner = self._conn.execute("SELECT wallet_address FROM reports WHERE id = ?", (report["id"],)).fetchone()
+            if owner is not None and owner[0] != wallet_address:
+                raise ValueError(f"O relatório {report['id']} pertence a outra carteira")
+            self._remove_from_aggregates(report["id"])
+            self._conn.execute(
+                """
+                INSERT INTO reports (
+                    id, wallet_address, report_type, report_type_display, title,
+                    generated_date, generated_at, recommendations, payload
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (id) DO UPDATE SET
+                    report_type = excluded.report_type,
+                    report_type_display = excluded.report_type_display,
+                    title = excluded.title,
+                    generated_date = excluded.generated_date,
+                    generated_at = excluded.generated_at,
+                    recommendations = excluded.recommendations,
+                    payload = excluded.payload
+                WHERE reports.wallet_address = excluded.wallet_address
+                """,
+                (
+                    report["id"],
+                    wallet_address,
+                    report["report_type"],
+                    report.get("report_type_display", ""),
+                    report.get("title", ""),
+                    report.get("generated_date", ""),
+                    generated_at,
+                    len(report.get("recommendations", [])),
+                    payload,
+                ),
+            )
+            self._add_to_aggregates(wallet_address, generated_at, report, 1)
+        return report["id"]
+
+    def _where(self, wallet_address, report_type=None, start=None, end=None, search=None):
+        """WHERE clause and parameters shared by the listing queries"""
+        clauses, params = [], []
+        if wallet_address is not None:
+            clauses.append("wallet_address = ?")
+            params.append(wallet_address)
+        if report_type is not None:
+            clauses.append("report_type = ?")
+            params.append(report_type)
+        if start is not None:
+            clauses.append("generated_at >= ?")
+            params.append(_epoch(start))
+        if end is not None:
+            clauses.append("generated_at < ?")
+            params.append(_epoch(end))
+        if search:
+            pattern = "%" + search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            clauses.append("(title LIKE ? ESCAPE '\\' OR report_type_display LIKE ? ESCAPE '\\')")
+            params.extend([pattern, pattern])
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def list_reports(
+        self,
+        wallet_address: Optional[str] = None,
+        report_type: Optional[str] = None,
+        start=None,
+        end=None,
+        limit: int = 20,
+        offset: int = 0,
+        search: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Summaries (id, title, type and date) of the matching reports, newest first
+
+        ``start`` (inclusive) and ``end`` (exclusive) are dates, datetimes or
+        epoch seconds; ``search`` matches part of the title or of the type's
+        display name (SQL LIKE, so case-insensitive for ASCII letters only).
+        """
+        where, params = self._where(wallet_address, report_type, start, end, search)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {SUMMARY_COLUMNS} FROM reports{where} "
+                "ORDER BY generated_at DESC, rowid DESC LIMIT ? OFFSET ?",
+                params + [limit, offset],
+            ).fetchall()
+        return [_summary(row) for row in rows]
+
+    def page_reports(
+        self,
+        wallet_address: Optional[str] = None,
+        report_type: Optional[str] = None,
+        search: Optional[str] = None,
+        limit: int = 20,
+        after: Optional[Tuple[float, int]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[Tuple[float, int]]]:
+        """
+        One page of report summaries, newest first, and the cursor of the next page
+
+        Keyset pagination: ``after`` is the cursor returned with the previous
+        page (None for the first one), so every page is an index seek no
+        matter how deep it is. The next cursor is None on the last page.
+        """
+        where, params = self._where(wallet_address, report_type, search=search)
+        if after is not None:
+            where += (" AND " if where else " WHERE ") + "(generated_at, rowid) < (?, ?)"
+            params += list(after)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {SUMMARY_COLUMNS}, generated_at, rowid FROM reports{where} "
+                "ORDER BY generated_at DESC, rowid DESC LIMIT ?",
+                params + [limit + 1],
+            ).fetchall()
+        next_cursor = (rows[limit - 1][-2], rows[limit - 1][-1]) if len(rows) > limit else None
+        return [_summary(row) for row in rows[:limit]], next_cursor
+
+    def load_reports(
+        self,
+        wallet_address: Optional[str] = None,
+        report_type: Optional[str] = None,
+        start=None,
+        end=None,
+        limit: int = -1
+    ) -> List[Dict[str, Any]]:
+        """Full reports matching the filters, newest first"""
+        where, params = self._where(wallet_address, report_type, start, end)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT payload FROM reports{where} ORDER BY generated_at DESC, rowid DESC LIMIT ?",
+                params + [limit],
+            ).fetchall()
+        return [_load(row[0]) for row in rows]
+
+    def get_report(self, report_id: str, wallet_address: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Report ``report_id`` (a primary key lookup), only if it belongs to ``wallet_address``"""
+        where, params = self._where(wallet_address)
+        where += " AND id = ?" if where else " WHERE id = ?"
+        with self._lock:
+            row = self._conn.execute(f"SELECT payload FROM reports{where}", params + [report_id]).fetchone()
+        return _load(row[0]) if row else None
+
+    def latest(self, wallet_address: Optional[str] = None, report_type: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Most recent matching report (a single index seek), or None"""
+        reports = self.load_reports(wallet_address, report_type, limit=1)
+        return reports[0] if reports else None
+
+    def recent_recommendations(self, wallet_address: Optional[str] = None, start=None, end=None, limit: int = 5) -> List[Dict[str, Any]]:
+        """The first ``limit`` recommendations of the matching reports, newest report first"""
+        where, params = self._where(wallet_address, start=start, end=end)
+        where += " AND recommendations > 0" if where else " WHERE recommendations > 0"
+        recommendations: List[Dict[str, Any]] = []
+        with self._lock:
+            cursor = self._conn.execute(
+                f"SELECT payload FROM reports{where} ORDER BY generated_at DESC, rowid DESC", params
+            )
+            for (payload,) in cursor:
+                recommendations.extend(json.loads(payload).get("recommendations", []))
+                if len(recommendations) >= limit:
+                    break
+        return recommendations[:limit]
+
+    def count(
+        self,
+        wallet_address: Optional[str] = None,
+        report_type: Optional[str] = None,
+        start=None,
+        end=None,
+        search: Optional[str] = None
+    ) -> int:
+        where, params = self._where(wallet_address, report_type, start, end, search)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM reports{where}", params).fetchone()[0]
+
+    def count_by_type(self, wallet_address: Optional[str] = None) -> Dict[str, int]:
+        """Number of reports per report_type_display"""
+        where, params = self._where(wallet_address)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT report_type_display, COUNT(*) FROM reports{where} GROUP BY report_type_display",
+                params,
+            ).fetchall()
+        return dict(rows)
+
+    def date_range(self, wallet_address: Optional[str] = None):
+        """(oldest, newest) generation datetimes of the matching reports, or None"""
+        where, params = self._where(wallet_address)
+        # Separate subqueries, so each bound is a single seek on the
+        # (wallet_address, generated_at) index instead of a scan of the wallet
+        with self._lock:
+            oldest, newest = self._conn.execute(
+                f"SELECT (SELECT MIN(generated_at) FROM reports{where}), "
+                f"(SELECT MAX(generated_at) FROM reports{where})",
+                params + params,
+            ).fetchone()
+        if oldest is None:
+            return None
+        return datetime.datetime.fromtimestamp(oldest), datetime.datetime.fromtimestamp(newest)
+
+    def _day_where(self, wallet_address, start=None, end=None, **columns):
+        """WHERE clause and parameters of the per-day aggregate queries"""
+        clauses, params = [], []
+        for column, value in dict(columns, wallet_address=wallet_address).items():
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if start is not None:
+            clauses.append("day >= ?")
+            params.append(_day(start))
+        if end is not None:
+            clauses.append("day < ?")
+            params.append(_day(end))
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def aggregates(self, wallet_address: Optional[str] = None, start=None, end=None) -> Dict[str, Any]:
+        """
+        Dashboard metrics of the matching reports, from the materialized aggregates
+
+        Returns the number of reports (in total and per report_type), the
+        number of recommendations, the average monthly revenue of the
+        business map reports and their distinct industries. ``start``
+        (inclusive) and ``end`` (exclusive) are compared by day; the cost
+        depends on the number of days with reports, not on the reports.
+        """
+        where, params = self._day_where(wallet_address, start, end)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT report_type, SUM(reports), SUM(recommendations), SUM(revenue) "
+                f"FROM report_daily{where} GROUP BY report_type",
+                params,
+            ).fetchall()
+            industries = [
+                row[0] for row in self._conn.execute(
+                    f"SELECT DISTINCT industry FROM report_industries{where}", params
+                ).fetchall()
+            ]
+
+        by_type = {row[0]: row[1] for row in rows}
+        business_maps = by_type.get("business_map", 0)
+        revenue = sum(row[3] for row in rows if row[0] == "business_map")
+        return {
+            "reports": sum(by_type.values()),
+            "by_type": by_type,
+            "recommendations": sum(row[2] for row in rows),
+            "average_revenue": revenue / business_maps if business_maps else 0,
+            "industries": industries,
+        }
+
+    def swot_items(self, kind: str, wallet_address: Optional[str] = None, start=None, end=None) -> List[Tuple[str, int]]:
+        """
+        Distinct items of one SWOT section (e.g. "strengths") of the matching
+        reports, with the number of reports that mention each
+
+        Items are distinct after swot_themes.normalize; near-duplicates are
+        grouped by swot_themes.top_themes. ``start`` and ``end`` are compared
+        by day, as in aggregates().
+        """
+        where, params = self._day_where(wallet_address, start, end, kind=kind)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT MIN(item), SUM(reports) FROM report_swot{where} GROUP BY item_key ORDER BY item_key",
+                params,
+            ).fetchall()
+        return [(item, reports) for item, reports in rows]
+
+    def get_rendered(self, report_id: str, chart: str) -> Optional[Tuple[str, bytes]]:
+        """(fingerprint, payload) of a chart serialized by render_cache, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fingerprint, payload FROM report_renders WHERE report_id = ? AND chart = ?",
+                (report_id, chart),
+            ).fetchone()
+        return (row[0], bytes(row[1])) if row else None
+
+    def save_rendered(self, report_id: str, chart: str, fingerprint: str, payload: bytes) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO report_renders (report_id, chart, fingerprint, payload) VALUES (?, ?, ?, ?)",
+                (report_id, chart, fingerprint, payload),
+            )
+            self._conn.commit()
+
+    # IStateManager interface, keyed by report id
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the compact report with id ``key``"""
+        with self._lock:
+            row = self._conn.execute("SELECT payload FROM reports WHERE id = ?", (key,)).fetchone()
+        return _load(row[0]) if row else default
+
+    def set(self, key: str, value: Any) -> None:
+        """Store ``value`` as report ``key`` (owned by its ``wallet_address``, if any)"""
+        self.save(dict(value, id=key), value.get("wallet_address", ""))
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._conn:
+            self._remove_from_aggregates(key)
+            self._conn.execute("DELETE FROM reports WHERE id = ?", (key,))
+            self._conn.execute("DELETE FROM report_renders WHERE report_id = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM reports")
+            self._conn.execute("DELETE FROM report_renders")
+            for table in AGGREGATE_TABLES:
+                self._conn.execute(f"DELETE FROM {table}")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_repository = None
+_repository_lock = threading.Lock()
+
+
+def get_report_repository() -> ReportRepository:
+    """Return the process-wide repository at REPORTS_DB_PATH"""
+    global _repository
+    with _repository_lock:
+        if _repository is None:
+            _repository = ReportRepository(os.environ.get("REPORTS_DB_PATH", ".cache/reports.sqlite3"))
+        return _repository
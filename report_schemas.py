@@ -0,0 +1,180 @@
+import copy
+from typing import Annotated, Any, Dict, List, Type
+
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field, field_validator, model_validator
+
+# Chart sections keyed by free-form labels. Strict JSON schemas can't describe
+# objects with arbitrary keys, so the model returns them as [{label, value}]
+# lists which are turned back into {label: value} dicts for the app.
+LABELED_FIELDS = ("market_data", "growth_data")
+
+
+class _ResponseModel(BaseModel):
+    # Validation is lenient: without structured outputs (json_object mode)
+    # models add keys of their own, such as "conclusion", which are kept.
+    # The json_schema response_format is still closed (see _strict_schema).
+    model_config = ConfigDict(extra="allow")
+
+
+def _round_number(value: Any) -> Any:
+    """Accept fractional numbers (e.g. 72.5) where an integer is expected"""
+    if isinstance(value, float):
+        return round(value)
+    return value
+
+
+# Integer in the schema, but fractional values are rounded instead of rejected
+Integer = Annotated[int, BeforeValidator(_round_number)]
+
+
+class Recommendation(_ResponseModel):
+    title: str
+    description: str
+    action_items: List[str]
+
+
+class LabeledValue(_ResponseModel):
+    label: str
+    value: float
+
+
+def _labeled_values(value: Any) -> Any:
+    """Accept the {label: value} dicts produced without a strict schema"""
+    if isinstance(value, dict):
+        return [{"label": label, "value": amount} for label, amount in value.items()]
+    return value
+
+
+def _require_same_length(model: BaseModel, *fields: str) -> None:
+    lengths = {field: len(getattr(model, field)) for field in fields}
+    if len(set(lengths.values())) > 1:
+        raise ValueError(f"Listas com tamanhos diferentes: {lengths}")
+
+
+class BusinessAnalysis(_ResponseModel):
+    strengths: List[str]
+    weaknesses: List[str]
+    opportunities: List[str]
+    threats: List[str]
+    recommendations: List[Recommendation]
+    categories: List[str]
+    values: List[float]
+    market_data: List[LabeledValue]
+    growth_data: List[LabeledValue]
+
+    _labeled = field_validator(*LABELED_FIELDS, mode="before")(_labeled_values)
+
+    @model_validator(mode="after")
+    def _check_chart_data(self):
+        _require_same_length(self, "categories", "values")
+        return self
+
+
+class BlueOceanAnalysis(_ResponseModel):
+    eliminate: List[str]
+    reduce: List[str]
+    # "raise" is a Python keyword
+    raise_: List[str] = Field(alias="raise")
+    create: List[str]
+    canvas_factors: List[str]
+    your_values: List[float]
+    industry_values: List[float]
+    recommendations: List[Recommendation]
+
+    @model_validator(mode="after")
+    def _check_chart_data(self):
+        _require_same_length(self, "canvas_factors", "your_values", "industry_values")
+        return self
+
+
+class KeywordsData(_ResponseModel):
+    keywords: List[str]
+    positions: List[Integer]
+    search_volumes: List[Integer]
+    competition: List[float]
+
+    @model_validator(mode="after")
+    def _check_chart_data(self):
+        _require_same_length(self, "keywords", "positions", "search_volumes", "competition")
+        return self
+
+
+class TrafficSources(_ResponseModel):
+    sources: List[str]
+    percentages: List[float]
+
+    @model_validator(mode="after")
+    def _check_chart_data(self):
+        _require_same_length(self, "sources", "percentages")
+        return self
+
+
+class OptimizationOpportunity(_ResponseModel):
+    area: str
+    impact: float
+    difficulty: float
+    recommendations: List[str]
+
+
+class SEOAnalysis(_ResponseModel):
+    overall_score: Integer
+    keywords_data: KeywordsData
+    traffic_sources: TrafficSources
+    optimization_opportunities: List[OptimizationOpportunity]
+    recommendations: List[Recommendation]
+
+
+REPORT_MODELS: Dict[str, Type[_ResponseModel]] = {
+    "business_map": BusinessAnalysis,
+    "blue_ocean": BlueOceanAnalysis,
+    "seo": SEOAnalysis,
+}
+
+
+def _strict_schema(node: Any) -> Any:
+    """Mark every object as closed with all properties required"""
+    if isinstance(node, dict):
+        if "properties" in node:
+            node["required"] = list(node["properties"])
+            node["additionalProperties"] = False
+        for value in node.values():
+            _strict_schema(value)
+    elif isinstance(node, list):
+        for value in node:
+            _strict_schema(value)
+    return node
+
+
+_schema_formats: Dict[Type[BaseModel], Dict[str, Any]] = {}
+
+
+def json_schema_format(model: Type[BaseModel]) -> Dict[str, Any]:
+    """Return the strict ``json_schema`` response_format for ``model``"""
+    if model not in _schema_formats:
+        schema = _strict_schema(copy.deepcopy(model.model_json_schema(by_alias=True)))
+        _schema_formats[model] = {
+            "type": "json_schema",
+            "json_schema": {"name": model.__name__, "strict": True, "schema": schema},
+        }
+    return _schema_formats[model]
+
+
+def convert_member(key: str, value: Any) -> Any:
+    """Convert a streamed top-level section to the shape used by the app"""
+    if key in LABELED_FIELDS and isinstance(value, list):
+        return {item["label"]: item["value"] for item in value}
+    return value
+
+
+def parse_analysis(model: Type[BaseModel], content: str) -> Dict[str, Any]:
+    """
+    Validate a JSON completion against ``model`` in a single pass
+
+    Returns the analysis as the plain dict used across the app. Raises
+    pydantic.ValidationError if the payload doesn't match the model.
+    """
+    data = model.model_validate_json(content).model_dump(by_alias=True)
+    for key in LABELED_FIELDS:
+        if key in data:
+            data[key] = convert_member(key, data[key])
+    return data
@@ -1,3 +1,4 @@
+import time
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional
 from dataclasses import dataclass
@@ -48,11 +49,42 @@ class ReportLLM(ABC):
     def get_completion(self, prompt: str, **kwargs) -> Optional[str]:
         """
         Método auxiliar para obter uma completion do LLM.
-        Pode ser sobrescrito para implementar retry logic, error handling, etc.
+        Usa o pool de conexões compartilhado de llm_transport e passa pelos
+        mesmos rate_limiter, retry_policy e latency_tracker das demais
+        chamadas à OpenAI (ver openai_client); kwargs sobrescrevem os
+        parâmetros de self.config. Retorna None se a chamada falhar depois
+        das novas tentativas.
         """
+        import openai_client
+        from llm_transport import get_openai_client
+        from rate_limiter import estimate_tokens
+        from retry_policy import call_with_retry
+
+        params = {
+            "model": self.config.model_name,
+            "temperature": self.config.temperature,
+            "max_tokens": self.config.max_tokens,
+            "top_p": self.config.top_p,
+            "frequency_penalty": self.config.frequency_penalty,
+            "presence_penalty": self.config.presence_penalty,
+        }
+        params.update(kwargs)
+
+        def send():
+            estimated = estimate_tokens(prompt) + (params.get("max_tokens") or openai_client.EXPECTED_COMPLETION_TOKENS)
+            with openai_client.rate_limiter.limit(estimated) as permit:
+                started = time.perf_counter()
+                response = get_openai_client(openai_client.OPENAI_API_KEY).chat.completions.create(
+                    messages=[{"role": "user", "content": prompt}],
+                    **params
+                )
+                openai_client.latency_tracker.record(time.perf_counter() - started)
+                permit.actual_tokens = getattr(getattr(response, "usage", None), "total_tokens", None)
+            return response
+
         try:
-            # Implementação específica de cada LLM deve ser feita nas classes filhas
-            return None
+            response = call_with_retry(send, openai_client.retry_policy)
+            return response.choices[0].message.content
         except Exception as e:
             print(f"Error getting completion: {e}")
-            return None 
\ No newline at end of file
+            return None
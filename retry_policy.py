@@ -0,0 +1,228 @@
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Optional
+
+from config import EnvironmentManager
+
+try:
+    import openai
+    RETRYABLE_ERRORS = (
+        openai.APITimeoutError,
+        openai.APIConnectionError,
+        openai.RateLimitError,
+        openai.InternalServerError,
+        TimeoutError,
+        ConnectionError,
+    )
+except ImportError:
+    RETRYABLE_ERRORS = (TimeoutError, ConnectionError)
+
+# HTTP statuses worth retrying even when the SDK raises a generic status error
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Return the delay requested by the server through Retry-After headers"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return float(retry_after)
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Tell whether a failed request is worth sending again"""
+    if isinstance(error, RETRYABLE_ERRORS):
+        return True
+    return getattr(error, "status_code", None) in RETRYABLE_STATUS_CODES
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter
+
+    The n-th retry waits a random delay between 0 and
+    ``min(max_delay, base_delay * 2 ** n)``, unless the server asked for a
+    specific delay through Retry-After.
+    """
+
+    def __init__(self, max_retries: int = 3, base_delay: float = 0.5, max_delay: float = 20.0, jitter: bool = True):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+
+    @classmethod
+    def from_environment(cls) -> "RetryPolicy":
+        """Build a policy from the OPENAI_RETRY_* settings in EnvironmentManager"""
+        env = EnvironmentManager()
+        return cls(
+            max_retries=int(env.get("OPENAI_MAX_RETRIES", "3")),
+            base_delay=float(env.get("OPENAI_RETRY_BASE_DELAY", "0.5")),
+            max_delay=float(env.get("OPENAI_RETRY_MAX_DELAY", "20")),
+        )
+
+    def backoff(self, attempt: int, error: Optional[BaseException] = None) -> float:
+        """Seconds to wait before retry number ``attempt`` (starting at 0)"""
+        requested = retry_after_seconds(error) if error is not None else None
+        if requested is not None:
+            return min(requested, self.max_delay)
+
+        ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(0, ceiling) if self.jitter else ceiling
+
+
+class LatencyTracker:
+    """Sliding window of recent request latencies"""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """Return the given percentile, or None until enough samples exist"""
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def samples(self):
+        with self._lock:
+            return list(self._samples)
+
+
+# Threads used to run the primary and hedged copies of blocking requests
+HEDGE_WORKERS = 16
+_hedge_executor = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix="llm-hedge")
+# Idle hedge workers. Requests are only handed to an idle worker, so none
+# waits in the executor queue, where it would look slow and be hedged.
+_hedge_slots = threading.BoundedSemaphore(HEDGE_WORKERS)
+
+
+def _submit_to_idle_worker(fn: Callable[[], Any]):
+    """Start ``fn`` on an idle hedge worker, or return None if all are busy"""
+    if not _hedge_slots.acquire(blocking=False):
+        return None
+    future = _hedge_executor.submit(fn)
+    future.add_done_callback(lambda _: _hedge_slots.release())
+    return future
+
+
+def hedged_call(fn: Callable[[], Any], hedge_after: Optional[float]) -> Any:
+    """
+    Run ``fn`` and, if it is still running after ``hedge_after`` seconds, start
+    a second identical request and return whichever succeeds first
+
+    With ``hedge_after`` None the call is made directly. Hedging is skipped
+    when the hedge workers are all busy: the process is saturated then, and
+    a second copy would only add load. The slower copy is left to finish in
+    the background since blocking requests can't be cancelled.
+    """
+    if hedge_after is None:
+        return fn()
+
+    primary = _submit_to_idle_worker(fn)
+    if primary is None:
+        return fn()
+    done, _ = wait([primary], timeout=hedge_after)
+    if done:
+        return primary.result()
+
+    hedge = _submit_to_idle_worker(fn)
+    if hedge is None:
+        return primary.result()
+
+    pending = {primary, hedge}
+    error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+            error = future.exception()
+    raise error
+
+
+async def ahedged_call(coro_fn: Callable[[], Awaitable[Any]], hedge_after: Optional[float]) -> Any:
+    """Async counterpart of hedged_call; the losing request is cancelled"""
+    if hedge_after is None:
+        return await coro_fn()
+
+    primary = asyncio.ensure_future(coro_fn())
+    done, _ = await asyncio.wait({primary}, timeout=hedge_after)
+    if done:
+        return primary.result()
+
+    pending = {primary, asyncio.ensure_future(coro_fn())}
+    error = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def call_with_retry(fn: Callable[[], Any], policy: RetryPolicy, sleep: Callable[[float], None] = time.sleep) -> Any:
+    """Call ``fn``, retrying retryable errors according to ``policy``"""
+    attempt = 0
+    while True:
+        try:
+            return fn()
+        except Exception as e:
+            if attempt >= policy.max_retries or not is_retryable(e):
+                raise
+            delay = policy.backoff(attempt, e)
+            print(f"Erro temporário na chamada à OpenAI ({type(e).__name__}), nova tentativa em {delay:.1f}s")
+            sleep(delay)
+            attempt += 1
+
+
+async def acall_with_retry(coro_fn: Callable[[], Awaitable[Any]], policy: RetryPolicy) -> Any:
+    """Async counterpart of call_with_retry"""
+    attempt = 0
+    while True:
+        try:
+            return await coro_fn()
+        except Exception as e:
+            if attempt >= policy.max_retries or not is_retryable(e):
+                raise
+            delay = policy.backoff(attempt, e)
+            print(f"Erro temporário na chamada à OpenAI ({type(e).__name__}), nova tentativa em {delay:.1f}s")
+            await asyncio.sleep(delay)
+            attempt += 1
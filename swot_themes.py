@@ -0,0 +1,158 @@
+"""
+Near-duplicate grouping of SWOT items across reports
+
+Reports phrase the same point in slightly different ways ("Equipe
+qualificada", "Equipe altamente qualificada"). Items are normalized
+(case, accents, punctuation and stopwords), cut into character shingles and
+summarized with MinHash signatures; locality-sensitive hashing over the
+signature bands finds candidate duplicates without comparing every pair,
+and candidates are merged when the Jaccard similarity of their shingles
+reaches SIMILARITY_THRESHOLD.
+
+report_repository keeps, per day, how many reports mention each normalized
+item, so only the distinct items of a period are grouped here, not every
+item of every report.
+"""
+import functools
+import hashlib
+import heapq
+import re
+import unicodedata
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+
+import numpy as np
+
+# Items whose shingle sets are at least this similar are the same theme
+SIMILARITY_THRESHOLD = 0.5
+
+# MinHash signature length, split into LSH bands of BAND_ROWS values
+# (candidate pairs are found from a similarity of roughly 0.5)
+NUM_PERMUTATIONS = 64
+BAND_ROWS = 4
+
+SHINGLE_SIZE = 3
+
+STOPWORDS = frozenset(
+    "a ao aos as com da das de do dos e em na nas no nos o os ou para pela pelas pelo pelos "
+    "por que se sem sua suas seu seus um uma umas uns".split()
+)
+
+# Universal hashing (a * h + b) mod p, with 31-bit coefficients and p
+_MERSENNE_PRIME = (1 << 31) - 1
+_rng = np.random.RandomState(20240501)
+_A = _rng.randint(1, _MERSENNE_PRIME, NUM_PERMUTATIONS).astype(np.uint64)
+_B = _rng.randint(0, _MERSENNE_PRIME, NUM_PERMUTATIONS).astype(np.uint64)
+
+
+def normalize(text: str) -> str:
+    """Lowercase text without accents, punctuation, stopwords or repeated spaces"""
+    text = unicodedata.normalize("NFKD", str(text).lower())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return " ".join(tokenize(text))
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in re.findall(r"\w+", text) if token not in STOPWORDS]
+
+
+def shingles(normalized: str) -> FrozenSet[str]:
+    """Character shingles of each word, so word order and inflections matter little"""
+    result = set()
+    for token in normalized.split():
+        padded = f" {token} "
+        if len(padded) <= SHINGLE_SIZE:
+            result.add(padded)
+        result.update(padded[i:i + SHINGLE_SIZE] for i in range(len(padded) - SHINGLE_SIZE + 1))
+    return frozenset(result)
+
+
+def minhash(shingle_set: FrozenSet[str]) -> np.ndarray:
+    """MinHash signature (NUM_PERMUTATIONS values) of a shingle set"""
+    if not shingle_set:
+        return np.zeros(NUM_PERMUTATIONS, dtype=np.uint64)
+    hashes = np.array(
+        [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little") for s in shingle_set],
+        dtype=np.uint64,
+    ) % _MERSENNE_PRIME
+    # 31-bit values times 31-bit coefficients stay below 2**63
+    permuted = (_A[:, None] * hashes[None, :] + _B[:, None]) % _MERSENNE_PRIME
+    return permuted.min(axis=1)
+
+
+def jaccard(first: FrozenSet[str], second: FrozenSet[str]) -> float:
+    if not first and not second:
+        return 1.0
+    return len(first & second) / len(first | second)
+
+
+class ThemeCounter:
+    """
+    Incremental counter of SWOT themes
+
+    ``add`` files an item under the theme of a near-duplicate already seen
+    (found through the LSH buckets) or starts a new theme. Each theme is
+    labeled with its most counted wording; its count is the sum of its
+    variants, so it counts mentions rather than distinct reports.
+    """
+
+    def __init__(self):
+        self._buckets: Dict[Tuple[int, bytes], List[int]] = {}
+        self._shingles: List[FrozenSet[str]] = []
+        self._counts: List[int] = []
+        self._variants: List[Dict[str, int]] = []
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def add(self, item: str, count: int = 1) -> None:
+        item_shingles = shingles(normalize(item))
+        bands = [
+            (band, signature.tobytes())
+            for band, signature in enumerate(minhash(item_shingles).reshape(-1, BAND_ROWS))
+        ]
+
+        theme = self._match(item_shingles, bands)
+        if theme is None:
+            theme = len(self._counts)
+            self._shingles.append(item_shingles)
+            self._counts.append(0)
+            self._variants.append({})
+            for band in bands:
+                self._buckets.setdefault(band, []).append(theme)
+
+        self._counts[theme] += count
+        self._variants[theme][item] = self._variants[theme].get(item, 0) + count
+
+    def _match(self, item_shingles, bands):
+        """Most similar theme sharing an LSH bucket with the item, if similar enough"""
+        candidates = {theme for band in bands for theme in self._buckets.get(band, ())}
+        best, best_similarity = None, SIMILARITY_THRESHOLD
+        for theme in candidates:
+            similarity = jaccard(item_shingles, self._shingles[theme])
+            if similarity >= best_similarity:
+                best, best_similarity = theme, similarity
+        return best
+
+    def top(self, limit: int = 5) -> List[Tuple[str, int]]:
+        """(label, count) of the ``limit`` most counted themes"""
+        themes = heapq.nlargest(limit, range(len(self._counts)), key=lambda theme: (self._counts[theme], -theme))
+        return [(max(self._variants[theme].items(), key=lambda v: v[1])[0], self._counts[theme]) for theme in themes]
+
+
+def top_themes(items: Iterable[Tuple[str, int]], limit: int = 5) -> List[Tuple[str, int]]:
+    """
+    Most frequent themes of ``(item, count)`` pairs, as ``(label, count)``
+
+    Results are cached by their input, so Streamlit reruns over the same
+    period don't group the items again.
+    """
+    return list(_top_themes(tuple(items), limit))
+
+
+@functools.lru_cache(maxsize=64)
+def _top_themes(items: Tuple[Tuple[str, int], ...], limit: int) -> List[Tuple[str, int]]:
+    counter = ThemeCounter()
+    # Most counted items first, so they found (and label) the themes
+    for item, count in sorted(items, key=lambda pair: -pair[1]):
+        counter.add(item, count)
+    return counter.top(limit)
@@ -0,0 +1,52 @@
+import json
+
+import plotly.graph_objects as go
+import pytest
+
+from chart_specs import build_figure, chart_spec
+
+
+def test_specs_are_json_serializable_and_build_figures():
+    spec = chart_spec("bar", x=["A", "B"], y=[1, 2], title="Título", x_label="X", y_label="Y")
+
+    figure = build_figure(json.loads(json.dumps(spec)))
+
+    assert isinstance(figure, go.Figure)
+    assert figure.layout.title.text == "Título"
+    assert list(figure.data[0].y) == [1, 2]
+
+
+def test_unknown_chart_kind_is_rejected():
+    with pytest.raises(ValueError):
+        chart_spec("sankey")
+
+
+def test_equal_specs_share_one_figure():
+    spec = chart_spec("traffic_sources", sources=["Orgânico"], percentages=[100])
+
+    assert build_figure(spec) is build_figure(json.loads(json.dumps(spec)))
+
+
+def test_figures_pass_through():
+    figure = go.Figure()
+    assert build_figure(figure) is figure
+
+
+@pytest.mark.parametrize("report_type, charts", [
+    ("business_map", {"values": "radar_chart", "market_data": "market_comparison", "growth_data": "growth_potential"}),
+    ("blue_ocean", {"industry_values": "strategy_canvas"}),
+    ("seo", {
+        "keywords_data": "keyword_performance",
+        "traffic_sources": "traffic_sources",
+        "optimization_opportunities": "optimization_opportunities",
+    }),
+])
+def test_streamed_previews_match_the_final_report_charts(report_type, charts):
+    from report_generator import generate_report
+    from utils import _build_stream_chart
+
+    report = generate_report(report_type, {"business_name": "Acme", "keywords": "a, b"})
+
+    for key, chart in charts.items():
+        preview = _build_stream_chart(key, report["ai_analysis"])
+        assert preview.to_plotly_json() == build_figure(report["visualizations"][chart]).to_plotly_json()
@@ -1,8 +1,12 @@
 import pytest
 import streamlit as st
-from report_generator import generate_report
+from report_generator import generate_report, generate_reports_concurrently
 import plotly.graph_objects as go
 import plotly.express as px
+from chart_specs import build_figure
+import time
+import openai_client
+from latency_model import FixedLatency
 
 @pytest.fixture
 def sample_business_map_data():
@@ -45,6 +49,7 @@ def test_business_map_report_generation(sample_business_map_data):
     # Validate basic report structure
     assert report['id'] is not None
     assert report['generated_date'] is not None
+    assert isinstance(report['generated_at'], float)
     assert report['report_type'] == 'business_map'
     assert report['report_type_display'] == 'Mapa do Seu Negócio'
     assert report['form_data'] == sample_business_map_data
@@ -60,9 +65,9 @@ def test_business_map_report_generation(sample_business_map_data):
     assert 'growth_potential' in visualizations
     
     # Validate chart types
-    assert isinstance(visualizations['radar_chart'], go.Figure)
-    assert isinstance(visualizations['market_comparison'], go.Figure)
-    assert isinstance(visualizations['growth_potential'], go.Figure)
+    assert isinstance(build_figure(visualizations['radar_chart']), go.Figure)
+    assert isinstance(build_figure(visualizations['market_comparison']), go.Figure)
+    assert isinstance(build_figure(visualizations['growth_potential']), go.Figure)
 
 def test_blue_ocean_report_generation(sample_blue_ocean_data):
     """Test if blue ocean report is generated correctly with all required fields"""
@@ -86,9 +91,9 @@ def test_blue_ocean_report_generation(sample_blue_ocean_data):
     assert 'performance_projection' in visualizations
     
     # Validate chart types
-    assert isinstance(visualizations['strategy_canvas'], go.Figure)
-    assert isinstance(visualizations['actions_chart'], go.Figure)
-    assert isinstance(visualizations['performance_projection'], go.Figure)
+    assert isinstance(build_figure(visualizations['strategy_canvas']), go.Figure)
+    assert isinstance(build_figure(visualizations['actions_chart']), go.Figure)
+    assert isinstance(build_figure(visualizations['performance_projection']), go.Figure)
 
 def test_seo_report_generation(sample_seo_data):
     """Test if SEO report is generated correctly with all required fields"""
@@ -112,9 +117,9 @@ def test_seo_report_generation(sample_seo_data):
     assert 'optimization_opportunities' in visualizations
     
     # Validate chart types
-    assert isinstance(visualizations['keyword_performance'], go.Figure)
-    assert isinstance(visualizations['traffic_sources'], go.Figure)
-    assert isinstance(visualizations['optimization_opportunities'], go.Figure)
+    assert isinstance(build_figure(visualizations['keyword_performance']), go.Figure)
+    assert isinstance(build_figure(visualizations['traffic_sources']), go.Figure)
+    assert isinstance(build_figure(visualizations['optimization_opportunities']), go.Figure)
 
 def test_invalid_report_type():
     """Test if invalid report type raises ValueError"""
@@ -127,13 +132,13 @@ def test_visualization_parameters(sample_business_map_data):
     report = generate_report('business_map', sample_business_map_data)
     
     # Test market comparison chart
-    market_comparison = report['visualizations']['market_comparison']
+    market_comparison = build_figure(report['visualizations']['market_comparison'])
     assert market_comparison.layout.title.text == "Comparação com o Mercado"
     assert market_comparison.layout.xaxis.title.text == "Categorias"
     assert market_comparison.layout.yaxis.title.text == "Valores"
     
     # Test growth potential chart
-    growth_potential = report['visualizations']['growth_potential']
+    growth_potential = build_figure(report['visualizations']['growth_potential'])
     assert growth_potential.layout.title.text == "Potencial de Crescimento"
     assert growth_potential.layout.xaxis.title.text == "Período"
     assert growth_potential.layout.yaxis.title.text == "Crescimento (%)"
@@ -151,5 +156,43 @@ def test_empty_data_handling():
     assert 'growth_potential' in visualizations
     
     # Validate that charts are created with default/empty values
-    market_comparison = visualizations['market_comparison']
-    assert len(market_comparison.data) > 0  # Chart should exist even if empty 
\ No newline at end of file
+    market_comparison = build_figure(visualizations['market_comparison'])
+    assert len(market_comparison.data) > 0  # Chart should exist even if empty 
+
+
+def test_concurrent_report_generation(sample_business_map_data, sample_blue_ocean_data, sample_seo_data):
+    """Test if reports generated concurrently keep the request order and structure"""
+    reports = generate_reports_concurrently([
+        ('business_map', sample_business_map_data),
+        {'report_type': 'blue_ocean', 'form_data': sample_blue_ocean_data},
+        ('seo', sample_seo_data)
+    ])
+    
+    assert [report['report_type'] for report in reports] == ['business_map', 'blue_ocean', 'seo']
+    assert reports[0]['title'] == f"Mapa Estratégico: {sample_business_map_data['business_name']}"
+    assert reports[2]['form_data'] == sample_seo_data
+    assert len({report['id'] for report in reports}) == 3
+
+
+def test_concurrent_generation_rejects_invalid_type(sample_seo_data):
+    """Test if an invalid report type fails before any analysis is started"""
+    with pytest.raises(ValueError) as exc_info:
+        generate_reports_concurrently([('seo', sample_seo_data), ('invalid_type', {})])
+    assert 'Tipo de relatório inválido' in str(exc_info.value)
+
+
+def test_concurrent_generation_overlaps_simulated_latency(monkeypatch, sample_business_map_data, sample_blue_ocean_data, sample_seo_data):
+    """Test if three analyses of 0.2s each take about as long as one when generated concurrently"""
+    monkeypatch.setattr(openai_client, 'simulated_latency', FixedLatency(0.2))
+    
+    started = time.perf_counter()
+    reports = generate_reports_concurrently([
+        ('business_map', sample_business_map_data),
+        ('blue_ocean', sample_blue_ocean_data),
+        ('seo', sample_seo_data)
+    ])
+    elapsed = time.perf_counter() - started
+    
+    assert len(reports) == 3
+    # Run one after another, they would take at least 0.6s
+    assert 0.2 <= elapsed < 0.45
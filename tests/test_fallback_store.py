@@ -0,0 +1,48 @@
+import pytest
+
+from fallback_store import FallbackTemplate, get_fallback, get_fallback_section
+
+
+def test_fallbacks_are_filled_with_form_data():
+    analysis = get_fallback("business_map", {"business_name": 'Acme "Ltda"', "industry": "Varejo"})
+
+    assert analysis["strengths"][0] == "Posicionamento único no mercado de Varejo"
+    assert 'Acme "Ltda"' in analysis["recommendations"][0]["description"]
+
+    seo = get_fallback("seo", {"website_url": "https://acme.com", "keywords": "sapatos, bolsas"})
+    assert seo["keywords_data"]["keywords"] == ["sapatos", "bolsas", "keyword3", "keyword4", "keyword5"]
+    assert "https://acme.com" in seo["recommendations"][0]["description"]
+
+
+def test_copies_are_independent():
+    first = get_fallback("seo")
+    first["keywords_data"]["positions"].append(99)
+    first["optimization_opportunities"][0]["impact"] = 0
+
+    second = get_fallback("seo")
+    assert second["keywords_data"]["positions"] == [4, 12, 18, 7, 22]
+    assert second["optimization_opportunities"][0]["impact"] == 85
+
+
+def test_sections_match_the_full_payload():
+    form_data = {"business_name": "Acme", "products_services": "Software"}
+    analysis = get_fallback("blue_ocean", form_data)
+
+    for key in analysis:
+        assert get_fallback_section("blue_ocean", key, form_data) == analysis[key]
+
+
+def test_unknown_placeholders_are_rejected():
+    with pytest.raises(ValueError):
+        FallbackTemplate("custom", {"title": "Olá {nome}"}, ("business_name",))
+    with pytest.raises(TypeError):
+        FallbackTemplate("custom", {"x": object()}, ())
+
+
+def test_template_payload_is_immutable():
+    template = FallbackTemplate("custom", {"items": ["a"], "nested": {"b": 1}}, ())
+
+    with pytest.raises(TypeError):
+        template.payload["items"] = []
+    assert template.payload["items"] == ("a",)
+    assert template.fill({}) == {"items": ["a"], "nested": {"b": 1}}
@@ -0,0 +1,19 @@
+import pytest
+
+from chart_benchmark import CASES, equivalent
+
+
+@pytest.mark.parametrize("name,fast,reference,args", CASES, ids=[case[0] for case in CASES])
+def test_graph_objects_builders_match_plotly_express(name, fast, reference, args):
+    assert equivalent(fast.uncached(*args), reference(*args))
+
+
+def test_repeated_keys_share_one_trace_like_px():
+    from chart_benchmark import px_optimization_matrix
+    from visualization import create_optimization_matrix
+
+    args = (["SEO", "SEO", "Links"], [8, 6, 7], [3, 5, 4])
+    figure = create_optimization_matrix.uncached(*args)
+
+    assert [trace.name for trace in figure.data] == ["SEO", "Links"]
+    assert equivalent(figure, px_optimization_matrix(*args))
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from figure_cache import FigureCache, UnhashableInput, input_key, memoize_figure
+from utils import generate_bar_chart
+
+
+def test_input_key_is_stable_for_equal_data():
+    assert input_key([1, 2], title="A") == input_key([1, 2], title="A")
+    assert input_key(np.array([1, 2])) == input_key([1, 2])
+    assert input_key([1, 2], title="A") != input_key([1, 2], title="B")
+
+
+def test_input_key_uses_every_value_of_pandas_objects():
+    first = pd.DataFrame({"x": range(100), "y": range(100)})
+    second = first.copy()
+    second.loc[50, "y"] = -1
+
+    assert input_key(first) == input_key(first.copy())
+    assert input_key(first) != input_key(second)
+    assert input_key(first["y"]) != input_key(second["y"])
+
+
+def test_unknown_arguments_bypass_the_cache():
+    class Opaque:
+        pass
+
+    with pytest.raises(UnhashableInput):
+        input_key(Opaque())
+
+    calls = []
+
+    @memoize_figure
+    def build(value):
+        calls.append(value)
+        return object()
+
+    value = Opaque()
+    assert build(value) is not build(value)
+    assert len(calls) == 2
+
+
+def test_cache_is_bounded_lru():
+    cache = FigureCache(max_entries=2)
+    builds = []
+
+    def build(name):
+        return lambda: builds.append(name) or name
+
+    cache.get_or_build("a", build("a"))
+    cache.get_or_build("b", build("b"))
+    cache.get_or_build("a", build("a"))
+    cache.get_or_build("c", build("c"))
+    cache.get_or_build("b", build("b"))
+
+    assert builds == ["a", "b", "c", "b"]
+    assert cache.stats() == {"entries": 2, "hits": 1, "misses": 4}
+
+
+def test_memoized_builders_return_the_same_figure_for_the_same_data():
+    first = generate_bar_chart(["A", "B"], [1, 2], "Título", "X", "Y")
+
+    assert generate_bar_chart(["A", "B"], [1, 2], "Título", "X", "Y") is first
+    assert generate_bar_chart(["A", "B"], [1, 3], "Título", "X", "Y") is not first
+    assert generate_bar_chart.uncached(["A", "B"], [1, 2], "Título", "X", "Y") is not first
+
+
+def test_memoize_keys_include_the_builder():
+    @memoize_figure
+    def one(x):
+        return ("one", x)
+
+    @memoize_figure
+    def two(x):
+        return ("two", x)
+
+    assert one(1) == ("one", 1)
+    assert two(1) == ("two", 1)
@@ -0,0 +1,56 @@
+import json
+
+from json_stream import IncrementalJSONParser, ITEM, MEMBER
+
+
+ANALYSIS = {
+    "strengths": ["Equipe \"sênior\", comprometida", "Produto {único}"],
+    "recommendations": [
+        {"title": "Recomendação 1", "action_items": ["ação 1", "ação 2"]},
+        {"title": "Recomendação 2", "action_items": []}
+    ],
+    "values": [7, 6.5, 8],
+    "market_data": {"Qualidade": 8, "Preço": 7},
+    "overall_score": 65
+}
+
+
+def _feed_in_chunks(text, size):
+    parser = IncrementalJSONParser()
+    events = []
+    for start in range(0, len(text), size):
+        events.extend(parser.feed(text[start:start + size]))
+    return parser, events
+
+
+def test_members_are_emitted_for_any_chunking():
+    """Test if every top-level section is emitted once, whatever the chunk size"""
+    text = json.dumps(ANALYSIS, ensure_ascii=False, indent=2)
+    for size in (1, 3, 17, len(text)):
+        parser, events = _feed_in_chunks(text, size)
+        members = {event[1]: event[2] for event in events if event[0] == MEMBER}
+        assert members == ANALYSIS
+        assert parser.finished
+        assert parser.result() == ANALYSIS
+
+
+def test_list_items_are_emitted_before_the_list_closes():
+    """Test if each recommendation is emitted as soon as it is complete"""
+    text = json.dumps(ANALYSIS, ensure_ascii=False)
+    cut = text.index('{"title": "Recomendação 2"')
+
+    parser = IncrementalJSONParser()
+    events = parser.feed(text[:cut])
+
+    items = [event for event in events if event[0] == ITEM and event[1] == "recommendations"]
+    assert items == [(ITEM, "recommendations", 0, ANALYSIS["recommendations"][0])]
+    assert (MEMBER, "strengths", ANALYSIS["strengths"]) in events
+    assert not parser.finished
+
+
+def test_scalar_items_are_emitted():
+    """Test if numeric chart arrays are emitted item by item"""
+    _, events = _feed_in_chunks(json.dumps(ANALYSIS), 2)
+
+    values = [event[3] for event in events if event[0] == ITEM and event[1] == "values"]
+    assert values == ANALYSIS["values"]
@@ -0,0 +1,38 @@
+import asyncio
+import time
+
+import pytest
+
+from latency_model import FixedLatency, SampledLatency, ZeroLatency, latency_model_from_spec
+
+
+def test_specs_build_the_matching_model(tmp_path):
+    samples = tmp_path / "latencies.txt"
+    samples.write_text("0.5\n1.25\n", encoding="utf-8")
+
+    assert isinstance(latency_model_from_spec(None), ZeroLatency)
+    assert latency_model_from_spec("fixed:0.2").delay() == 0.2
+    assert latency_model_from_spec(f"sampled:{samples}").delay() in (0.5, 1.25)
+    assert latency_model_from_spec("sampled", recorded=lambda: [2.0]).delay() == 2.0
+    with pytest.raises(ValueError):
+        latency_model_from_spec("gaussian:1")
+
+
+def test_zero_latency_does_not_block():
+    started = time.perf_counter()
+    assert ZeroLatency().wait() == 0
+    assert asyncio.run(ZeroLatency().wait_async()) == 0
+    assert time.perf_counter() - started < 0.05
+
+
+def test_async_waits_run_concurrently():
+    async def wait_many():
+        return await asyncio.gather(*(FixedLatency(0.1).wait_async() for _ in range(10)))
+
+    started = time.perf_counter()
+    asyncio.run(wait_many())
+    assert time.perf_counter() - started < 0.5
+
+
+def test_sampled_latency_without_samples_is_zero():
+    assert SampledLatency([]).delay() == 0.0
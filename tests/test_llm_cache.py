@@ -0,0 +1,59 @@
+import time
+
+import pytest
+
+from llm_cache import ResponseCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(str(tmp_path / "cache.sqlite3"), ttl_seconds=60, max_entries=2)
+
+
+def test_key_depends_on_every_input():
+    """Test if changing any request input produces a different cache key"""
+    base = ResponseCache.make_key("gpt", "system", "prompt", {"type": "json_object"})
+
+    assert base == ResponseCache.make_key("gpt", "system", "prompt", {"type": "json_object"})
+    assert base != ResponseCache.make_key("gpt-4o", "system", "prompt", {"type": "json_object"})
+    assert base != ResponseCache.make_key("gpt", "other", "prompt", {"type": "json_object"})
+    assert base != ResponseCache.make_key("gpt", "system", "other", {"type": "json_object"})
+    assert base != ResponseCache.make_key("gpt", "system", "prompt", None)
+
+
+def test_hits_and_misses_are_counted(cache):
+    """Test if hits return stored content and report the savings"""
+    assert cache.get("a") is None
+
+    cache.set("a", '{"ok": true}', latency=1.5, tokens=300)
+    assert cache.get("a") == '{"ok": true}'
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["saved_seconds"] == 1.5
+    assert stats["saved_tokens"] == 300
+
+
+def test_least_recently_used_entry_is_evicted(cache):
+    """Test if the cache keeps at most max_entries, dropping the LRU entry"""
+    cache.set("a", "1")
+    time.sleep(0.01)
+    cache.set("b", "2")
+    time.sleep(0.01)
+    cache.get("a")
+    time.sleep(0.01)
+    cache.set("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+
+
+def test_expired_entries_are_misses(tmp_path):
+    """Test if entries older than the TTL are not served"""
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"), ttl_seconds=0)
+    cache.set("a", "1")
+    time.sleep(0.01)
+
+    assert cache.get("a") is None
@@ -0,0 +1,34 @@
+import asyncio
+
+import llm_transport
+
+
+def test_sync_clients_share_one_connection_pool():
+    first = llm_transport.get_openai_client("sk-test-1")
+    second = llm_transport.get_openai_client("sk-test-2")
+
+    assert llm_transport.get_openai_client("sk-test-1") is first
+    assert first._client is second._client is llm_transport.get_http_client()
+    assert first.max_retries == 0
+
+
+def test_async_clients_are_pooled_per_event_loop():
+    async def fetch():
+        return llm_transport.get_async_openai_client("sk-test"), llm_transport.get_async_openai_client("sk-test")
+
+    first, again = asyncio.run(fetch())
+    other, _ = asyncio.run(fetch())
+
+    assert first is again
+    assert first is not other
+
+
+def test_transport_settings_come_from_environment(monkeypatch):
+    monkeypatch.setenv("OPENAI_HTTP_MAX_KEEPALIVE", "7")
+    monkeypatch.setenv("OPENAI_HTTP_CONNECT_TIMEOUT", "2.5")
+    monkeypatch.setenv("OPENAI_HTTP2", "true")
+
+    assert llm_transport.transport_limits().max_keepalive_connections == 7
+    assert llm_transport.transport_timeout().connect == 2.5
+    # HTTP/2 stays off unless the optional h2 package is installed
+    assert llm_transport.http2_enabled() == (llm_transport.importlib.util.find_spec("h2") is not None)
@@ -0,0 +1,66 @@
+import json
+
+import pytest
+from openai import OpenAI, RateLimitError
+
+from mock_llm_server import LatencyDistribution, MockLLMServer
+from report_schemas import BlueOceanAnalysis, json_schema_format, parse_analysis
+
+
+@pytest.fixture
+def server():
+    server = MockLLMServer(seed=1).start()
+    yield server
+    server.stop()
+
+
+def _client(server):
+    return OpenAI(api_key="mock", base_url=server.base_url, max_retries=0)
+
+
+def test_completions_follow_the_requested_schema(server):
+    response = _client(server).chat.completions.create(
+        model="mock-model",
+        messages=[{"role": "user", "content": "Estratégia"}],
+        response_format=json_schema_format(BlueOceanAnalysis)
+    )
+
+    analysis = parse_analysis(BlueOceanAnalysis, response.choices[0].message.content)
+    assert len(analysis["canvas_factors"]) == len(analysis["your_values"])
+    assert response.usage.total_tokens > 0
+
+
+def test_streaming_sends_content_in_chunks(server):
+    stream = _client(server).chat.completions.create(
+        model="mock-model",
+        messages=[{"role": "user", "content": "Estratégia"}],
+        response_format=json_schema_format(BlueOceanAnalysis),
+        stream=True,
+        stream_options={"include_usage": True}
+    )
+    chunks = [chunk for chunk in stream]
+    content = "".join(c.choices[0].delta.content or "" for c in chunks if c.choices)
+
+    assert len(chunks) > 2
+    assert chunks[-1].usage is not None
+    assert set(json.loads(content)) >= {"eliminate", "recommendations"}
+
+
+def test_injected_rate_limits_carry_retry_after():
+    server = MockLLMServer(rate_limit_rate=1.0, retry_after=0.25).start()
+    try:
+        with pytest.raises(RateLimitError) as error:
+            _client(server).chat.completions.create(model="mock-model", messages=[{"role": "user", "content": "oi"}])
+        assert error.value.response.headers["retry-after-ms"] == "250"
+        assert server.stats()["rate_limited"] == 1
+    finally:
+        server.stop()
+
+
+def test_latency_distributions():
+    assert LatencyDistribution("fixed:0.3").sample() == 0.3
+    samples = [LatencyDistribution("uniform:0.1,0.2", seed=3).sample() for _ in range(20)]
+    assert all(0.1 <= s <= 0.2 for s in samples)
+    assert LatencyDistribution("normal:0,1", seed=3).sample() >= 0
+    with pytest.raises(ValueError):
+        LatencyDistribution("pareto:1")
@@ -0,0 +1,149 @@
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import openai_client
+from api_client import AsyncAIClient
+from retry_policy import LatencyTracker, RetryPolicy
+
+
+def _chunk(content):
+    return SimpleNamespace(usage=None, choices=[SimpleNamespace(delta=SimpleNamespace(content=content))])
+
+
+def _response(content):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=None)
+
+
+@pytest.fixture
+def online(monkeypatch):
+    """openai_client as if the API were reachable, without cache or network"""
+    monkeypatch.setattr(openai_client, "OPENAI_AVAILABLE", True)
+    monkeypatch.setattr(openai_client, "OPENAI_CACHE_ENABLED", False)
+    monkeypatch.setattr(openai_client, "OPENAI_SCHEMA_RETRIES", 0)
+    monkeypatch.setattr(openai_client, "latency_tracker", LatencyTracker())
+
+
+def _streaming_client(chunks):
+    def create(**kwargs):
+        assert kwargs["stream"] is True
+        return iter(chunks())
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+
+def _valid_seo():
+    return json.dumps(openai_client._seo_fallback({"business_name": "Acme"}))
+
+
+def test_streamed_analysis_is_validated_and_its_latency_recorded(online, monkeypatch):
+    content = _valid_seo()
+    monkeypatch.setattr(openai_client, "client", _streaming_client(lambda: [_chunk(content[:40]), _chunk(content[40:])]), raising=False)
+
+    events = list(openai_client.stream_analysis("seo", {"business_name": "Acme"}))
+
+    assert events[-1] == ("done", json.loads(content))
+    assert len(openai_client.latency_tracker.samples()) == 1
+
+
+@pytest.mark.parametrize("broken_stream", ["mid_stream_error", "invalid_body"])
+def test_failed_streams_are_requested_again_without_streaming(online, monkeypatch, broken_stream):
+    def chunks():
+        yield _chunk('{"overall_score": 70, ')
+        if broken_stream == "mid_stream_error":
+            raise ConnectionError("conexão perdida")
+        yield _chunk('"keywords_data": {}}')
+
+    requests = []
+    monkeypatch.setattr(openai_client, "client", _streaming_client(chunks), raising=False)
+    monkeypatch.setattr(
+        openai_client, "_send_completion",
+        lambda *args: requests.append(args) or _response(_valid_seo())
+    )
+
+    events = list(openai_client.stream_analysis("seo", {"business_name": "Acme"}))
+
+    assert len(requests) == 1
+    assert events[-1] == ("done", json.loads(_valid_seo()))
+
+
+class _SlowCache:
+    """Response cache whose SQLite reads and writes take a while"""
+
+    def __init__(self):
+        self.stored = {}
+
+    def get(self, key):
+        time.sleep(0.2)
+        return self.stored.get(key)
+
+    def set(self, key, content, latency=0.0, tokens=0):
+        time.sleep(0.2)
+        self.stored[key] = content
+
+
+def test_async_analyses_keep_the_shared_loop_free_during_cache_access(online, monkeypatch):
+    async def create(**kwargs):
+        return _response(_valid_seo())
+
+    cache = _SlowCache()
+    monkeypatch.setattr(openai_client, "OPENAI_CACHE_ENABLED", True)
+    monkeypatch.setattr(openai_client, "response_cache", cache)
+    monkeypatch.setattr(
+        openai_client, "get_async_openai_client",
+        lambda api_key: SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    )
+
+    async def analyze_while_ticking():
+        gaps, done = [], False
+
+        async def tick():
+            last = time.perf_counter()
+            while not done:
+                await asyncio.sleep(0.01)
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+
+        ticker = asyncio.ensure_future(tick())
+        try:
+            return await AsyncAIClient().analyze_seo({"business_name": "Acme"}), max(gaps)
+        finally:
+            done = True
+            await ticker
+
+    result, longest_gap = AsyncAIClient.run(analyze_while_ticking(), timeout=5)
+
+    assert result == json.loads(_valid_seo())
+    assert len(cache.stored) == 1
+    assert longest_gap < 0.1
+
+
+class _RateLimited(Exception):
+    status_code = 429
+
+
+def test_report_llm_completions_share_the_retry_and_latency_path(online, monkeypatch):
+    import llm_transport
+    from reports.llm_configs.business_map_llm import BusinessMapLLM
+
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs)
+        if len(calls) == 1:
+            raise _RateLimited("limite de requisições")
+        return _response("análise")
+
+    monkeypatch.setattr(openai_client, "retry_policy", RetryPolicy(max_retries=2, base_delay=0, jitter=False))
+    monkeypatch.setattr(
+        llm_transport, "get_openai_client",
+        lambda api_key=None: SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    )
+
+    assert BusinessMapLLM().get_completion("Analise o negócio") == "análise"
+    assert len(calls) == 2
+    assert calls[1]["max_tokens"] == 4000
+    assert len(openai_client.latency_tracker.samples()) == 1
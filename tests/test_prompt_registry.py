@@ -0,0 +1,64 @@
+import os
+
+import pytest
+
+from prompt_registry import PromptRegistry, PromptTemplate, compact_prompt, markdown_outline
+
+
+def test_template_renders_precompiled_segments():
+    template = PromptTemplate("t", 'Olá {name}, JSON: {{"score": {score:.1f}}}', ("name", "score"))
+
+    assert template.render(name="Ana", score=7) == 'Olá Ana, JSON: {"score": 7.0}'
+    assert template.render(name="Ana", score=7) == 'Olá {name}, JSON: {{"score": {score:.1f}}}'.format(name="Ana", score=7)
+
+
+def test_placeholders_are_validated_when_compiled():
+    with pytest.raises(ValueError):
+        PromptTemplate("t", "Olá {nome}", ("name",))
+    with pytest.raises(KeyError):
+        PromptTemplate("t", "Olá {name}", ("name",)).render()
+    # Raw templates keep braces untouched
+    assert PromptTemplate("raw", '{"a": 1}').render() == '{"a": 1}'
+
+
+def test_file_templates_reload_when_modified(tmp_path):
+    path = tmp_path / "template.md"
+    path.write_text("versão 1", encoding="utf-8")
+    registry = PromptRegistry(check_interval=0)
+    registry.register_file("doc", str(path))
+
+    assert registry.render("doc") == "versão 1"
+
+    path.write_text("versão 2", encoding="utf-8")
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 5))
+    assert registry.render("doc") == "versão 2"
+
+
+def test_missing_file_uses_default(tmp_path):
+    registry = PromptRegistry(check_interval=0)
+    registry.register_file("doc", str(tmp_path / "missing.md"), default="Template não encontrado")
+
+    assert registry.render("doc") == "Template não encontrado"
+
+
+def test_compact_prompt_and_outline():
+    assert compact_prompt("\n    Linha   um\n    \n        Linha dois\n    ") == "Linha um\nLinha dois"
+
+    markdown = "# Título\n\nParágrafo longo.\n\n![img](http://x)\n\n## Seção\n- item\n```\ncódigo\n```\n1. passo"
+    assert markdown_outline(markdown) == "# Título\n## Seção\n- item\n1. passo"
+
+
+def test_compact_mode_moves_schema_to_system_message(monkeypatch):
+    import openai_client
+
+    monkeypatch.setattr(openai_client, "OPENAI_COMPACT_PROMPTS", True)
+    before = openai_client.get_prompt_stats()["tokens_saved"]
+
+    system_prompt, prompt = openai_client._blue_ocean_prompt({"business_name": "Acme"})
+
+    assert "Organize a resposta em JSON" in system_prompt
+    assert "Organize a resposta em JSON" not in prompt
+    assert "- Nome: Acme" in prompt
+    assert not prompt.startswith(" ")
+    assert openai_client.get_prompt_stats()["tokens_saved"] > before
@@ -0,0 +1,90 @@
+import asyncio
+import threading
+import time
+
+from rate_limiter import RateLimiter, TokenBucket, estimate_tokens
+
+
+def test_estimate_tokens_grows_with_prompt_size():
+    """Test if longer prompts are estimated to use more tokens"""
+    assert estimate_tokens("a" * 400) > estimate_tokens("a" * 40) > 0
+    assert estimate_tokens("", None) == 0
+
+
+def test_token_bucket_reports_wait_until_refill():
+    """Test if an empty bucket reports how long until enough tokens refill"""
+    bucket = TokenBucket(capacity=10, refill_per_second=10)
+    now = time.monotonic()
+    assert bucket.time_until(10, now) == 0
+    bucket.consume(10)
+    assert 0.4 < bucket.time_until(5, now) <= 0.5
+
+
+def test_in_flight_requests_are_capped():
+    """Test if no more than max_in_flight requests run at the same time"""
+    limiter = RateLimiter(requests_per_minute=6000, tokens_per_minute=1_000_000, max_in_flight=2)
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def worker():
+        with limiter.limit(10):
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.pop()
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(peak) == 2
+    stats = limiter.stats()
+    assert stats["acquired"] == 6
+    assert stats["queue_depth"] == 0
+    assert stats["in_flight"] == 0
+    assert stats["max_wait_seconds"] > 0
+
+
+def test_requests_per_minute_budget_delays_callers():
+    """Test if callers wait once the requests-per-minute budget is spent"""
+    limiter = RateLimiter(requests_per_minute=600, tokens_per_minute=1_000_000, max_in_flight=10)
+    for _ in range(600):
+        limiter.release(limiter.acquire(1))
+
+    started = time.monotonic()
+    limiter.release(limiter.acquire(1))
+    assert time.monotonic() - started >= 0.05
+
+
+def test_async_callers_share_the_limiter():
+    """Test if awaiting callers are limited by the same in-flight cap"""
+    limiter = RateLimiter(requests_per_minute=6000, tokens_per_minute=1_000_000, max_in_flight=1)
+    order = []
+
+    async def call(name):
+        async with limiter.limit_async(10):
+            order.append(f"start {name}")
+            await asyncio.sleep(0.02)
+            order.append(f"end {name}")
+
+    async def main():
+        await asyncio.gather(call("a"), call("b"))
+
+    asyncio.run(main())
+    assert order == ["start a", "end a", "start b", "end b"]
+
+
+def test_actual_usage_is_reconciled():
+    """Test if unused reserved tokens are given back after the request"""
+    limiter = RateLimiter(requests_per_minute=6000, tokens_per_minute=1000, max_in_flight=10)
+    with limiter.limit(1000) as permit:
+        permit.actual_tokens = 100
+
+    started = time.monotonic()
+    limiter.release(limiter.acquire(800))
+    assert time.monotonic() - started < 0.5
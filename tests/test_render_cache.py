@@ -0,0 +1,55 @@
+import plotly.io as pio
+import plotly.tools
+import pytest
+
+import render_cache
+import report_repository
+from chart_specs import build_figure, chart_spec
+from report_repository import ReportRepository
+
+
+@pytest.fixture
+def repository(tmp_path, monkeypatch):
+    repository = ReportRepository(str(tmp_path / "reports.sqlite3"))
+    monkeypatch.setattr(report_repository, "_repository", repository)
+    monkeypatch.setattr(render_cache, "_rendered", render_cache.FigureCache())
+    return repository
+
+
+def _report(values):
+    return {"id": "r1", "visualizations": {"traffic_sources": chart_spec("traffic_sources", sources=["A", "B"], percentages=values)}}
+
+
+def _plotly_chart_spec(figure):
+    """The JSON st.plotly_chart sends for ``figure``"""
+    return pio.to_json(plotly.tools.return_figure_from_figure_or_data(figure, validate_figure=True), validate=False)
+
+
+def test_rendered_figure_sends_the_same_json_as_the_live_figure(repository):
+    report = _report([60, 40])
+
+    rendered = render_cache.rendered_figure(report, "traffic_sources")
+
+    assert _plotly_chart_spec(rendered) == _plotly_chart_spec(build_figure(report["visualizations"]["traffic_sources"]))
+    assert render_cache.rendered_figure(report, "traffic_sources") is rendered
+
+
+def test_payload_is_stored_with_the_report_and_reused(repository, monkeypatch):
+    report = _report([60, 40])
+    payload = render_cache.rendered_figure(report, "traffic_sources").payload
+    assert repository.get_rendered("r1", "traffic_sources")[1] == payload
+
+    # A new process (empty memory cache) reads the stored payload without building the figure
+    monkeypatch.setattr(render_cache, "_rendered", render_cache.FigureCache())
+    monkeypatch.setattr(render_cache, "build_figure", lambda spec: pytest.fail("figure rebuilt"))
+    assert render_cache.rendered_figure(report, "traffic_sources").payload == payload
+
+
+def test_changed_spec_is_rendered_again(repository):
+    first = render_cache.rendered_figure(_report([60, 40]), "traffic_sources").payload
+    second = render_cache.rendered_figure(_report([10, 90]), "traffic_sources").payload
+
+    assert first != second
+    assert repository.get_rendered("r1", "traffic_sources")[1] == second
+    repository.delete("r1")
+    assert repository.get_rendered("r1", "traffic_sources") is None
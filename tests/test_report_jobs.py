@@ -0,0 +1,74 @@
+import pytest
+
+import openai_client
+from report_jobs import DONE, FAILED, ReportJobQueue
+
+FORM = {"business_name": "Tech Solutions", "industry": "Tecnologia", "main_products": "Software"}
+
+
+@pytest.fixture(autouse=True)
+def no_response_cache(monkeypatch):
+    """Jobs generate their analyses without reading or filling the response cache"""
+    monkeypatch.setattr(openai_client, "OPENAI_CACHE_ENABLED", False)
+
+
+def test_job_runs_in_background_and_keeps_the_report():
+    queue = ReportJobQueue(max_workers=2)
+    job_id = queue.submit("business_map", FORM, owner="0xabc")
+
+    status = queue.wait(job_id, timeout=30)
+
+    assert status["status"] == DONE
+    report = queue.result(job_id)
+    assert report["report_type"] == "business_map"
+    assert queue.events(job_id)
+    assert [job["id"] for job in queue.jobs(owner="0xabc")] == [job_id]
+    assert queue.jobs(owner="0xdef") == []
+
+
+def test_invalid_report_type_is_rejected_on_submit():
+    with pytest.raises(ValueError):
+        ReportJobQueue(max_workers=1).submit("unknown", FORM)
+
+
+def test_failed_job_reports_the_error(monkeypatch):
+    import report_generator
+
+    def broken_stream(report_type, form_data):
+        raise RuntimeError("falhou")
+        yield
+
+    monkeypatch.setattr(report_generator, "stream_report", broken_stream)
+    queue = ReportJobQueue(max_workers=1)
+    job_id = queue.submit("seo", FORM)
+
+    status = queue.wait(job_id, timeout=5)
+
+    assert status["status"] == FAILED
+    assert status["error"] == "falhou"
+    assert queue.result(job_id) is None
+
+
+def test_finished_jobs_expire_after_retention():
+    queue = ReportJobQueue(max_workers=1, retention_seconds=0)
+    job_id = queue.submit("business_map", FORM)
+    queue.wait(job_id, timeout=30)
+
+    queue.submit("business_map", FORM)
+
+    assert queue.status(job_id) is None
+
+
+def test_jobs_are_only_visible_to_their_owner_and_collected_once():
+    queue = ReportJobQueue(max_workers=1)
+    job_id = queue.submit("business_map", FORM, owner="0xabc")
+    queue.wait(job_id, timeout=30)
+
+    assert queue.status(job_id, owner="0xdef") is None
+    assert queue.events(job_id, owner="0xdef") == []
+    assert queue.take(job_id, owner="0xdef") is None
+
+    report = queue.take(job_id, owner="0xabc")
+    assert report["report_type"] == "business_map"
+    assert queue.take(job_id, owner="0xabc") is None
+    assert queue.status(job_id) is None
@@ -0,0 +1,248 @@
+import datetime
+import sqlite3
+
+import pytest
+
+from report_repository import ReportRepository
+
+
+def make_report(report_id, report_type="business_map", generated_date="01/03/2025 10:00"):
+    return {
+        "id": report_id,
+        "generated_date": generated_date,
+        "report_type": report_type,
+        "report_type_display": {"business_map": "Mapa do Seu Negócio", "seo": "Relatório SEO"}[report_type],
+        "title": f"Relatório {report_id}",
+        "form_data": {"business_name": "Tech Solutions"},
+        "ai_analysis": {"strengths": ["Equipe"]},
+        "recommendations": [{"title": "A", "description": "B", "action_items": []}],
+        "visualizations": {"radar_chart": {"kind": "radar", "categories": ["A"], "values": [5], "title": "T"}},
+    }
+
+
+def test_reports_round_trip_with_their_chart_specs(tmp_path):
+    repository = ReportRepository(str(tmp_path / "reports.sqlite3"))
+    repository.save(make_report("r1"), "0xabc")
+
+    report = repository.get("r1")
+
+    # Legacy reports (without generated_at) get it from generated_date
+    assert report == dict(make_report("r1"), generated_at=datetime.datetime(2025, 3, 1, 10, 0).timestamp())
+    assert report["ai_analysis"] == {"strengths": ["Equipe"]}
+    assert repository.get("missing", {}) == {}
+
+
+def test_database_uses_wal_and_survives_reopening(tmp_path):
+    path = str(tmp_path / "reports.sqlite3")
+    ReportRepository(path).save(make_report("r1"), "0xabc")
+
+    assert sqlite3.connect(path).execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert ReportRepository(path).count("0xabc") == 1
+
+
+def test_listing_is_scoped_paginated_and_newest_first(tmp_path):
+    repository = ReportRepository(str(tmp_path / "reports.sqlite3"))
+    for day in range(1, 6):
+        repository.save(make_report(f"r{day}", generated_date=f"0{day}/03/2025 10:00"), "0xabc")
+    repository.save(make_report("other", "seo"), "0xdef")
+
+    first_page = repository.list_reports("0xabc", limit=2)
+    second_page = repository.list_reports("0xabc", limit=2, offset=2)
+
+    assert [r["id"] for r in first_page] == ["r5", "r4"]
+    assert [r["id"] for r in second_page] == ["r3", "r2"]
+    assert repository.count("0xabc") == 5
+    assert repository.count_by_type("0xdef") == {"Relatório SEO": 1}
+    assert repository.date_range("0xabc")[1] == datetime.datetime(2025, 3, 5, 10, 0)
+
+
+def test_load_reports_filters_by_type_and_date(tmp_path):
+    repository = ReportRepository(str(tmp_path / "reports.sqlite3"))
+    repository.save(make_report("old", generated_date="01/01/2025 09:00"), "0xabc")
+    repository.save(make_report("new", generated_date="10/03/2025 09:00"), "0xabc")
+    repository.save(make_report("seo", "seo", generated_date="10/03/2025 09:00"), "0xabc")
+
+    reports = repository.load_reports("0xabc", "business_map", start=datetime.date(2025, 3, 1))
+
+    assert [r["id"] for r in reports] == ["new"]
+
+
+def test_state_manager_interface(tmp_path):
+    repository = ReportRepository(str(tmp_path / "reports.sqlite3"))
+    repository.set("r1", dict(make_report("ignored"), wallet_address="0xabc"))
+
+    assert repository.get("r1")["id"] == "r1"
+    assert repository.count("0xabc") == 1
+    repository.delete("r1")
+    assert repository.get("r1") is None
+    repository.set("r2", make_report("r2"))
+    repository.clear()
+    assert repository.count() == 0
+
+
+def test_aggregates_follow_saves_replacements_and_deletes(tmp_path):
+    repository = ReportRepository(str(tmp_path / "reports.sqlite3"))
+    first = dict(make_report("r1"), form_data={"industry": "Tecnologia", "monthly_revenue": 1000})
+    second = dict(make_report("r2", generated_date="05/03/2025 10:00"), form_data={"industry": "Saúde", "monthly_revenue": 3000})
+    repository.save(first, "0xabc")
+    repository.save(second, "0xabc")
+    repository.save(make_report("seo", "seo"), "0xabc")
+
+    aggregates = repository.aggregates("0xabc")
+    assert aggregates["reports"] == 3
+    assert aggregates["by_type"] == {"business_map": 2, "seo": 1}
+    assert aggregates["recommendations"] == 3
+    assert aggregates["average_revenue"] == 2000
+    assert sorted(aggregates["industries"]) == ["Saúde", "Tecnologia"]
+
+    # Period filters work on day buckets (end exclusive)
+    march_first = repository.aggregates("0xabc", start=datetime.date(2025, 3, 1), end=datetime.date(2025, 3, 2))
+    assert march_first["by_type"] == {"business_map": 1, "seo": 1}
+    assert march_first["industries"] == ["Tecnologia"]
+
+    # Replacing a report swaps its contribution; deleting removes it
+    repository.save(dict(second, form_data={"industry": "Tecnologia", "monthly_revenue": 5000}), "0xabc")
+    repository.delete("seo")
+    aggregates = repository.aggregates("0xabc")
+    assert aggregates["by_type"] == {"business_map": 2}
+    assert aggregates["average_revenue"] == 3000
+    assert aggregates["industries"] == ["Tecnologia"]
+    assert repository.aggregates("0xdef")["reports"] == 0
+
+
+def test_aggregates_are_backfilled_for_existing_databases(tmp_path):
+    path = str(tmp_path / "reports.sqlite3")
+    repository = ReportRepository(path)
+    repository.save(make_report("r1"), "0xabc")
+    repository.save(make_report("r2"), "0xabc")
+    # A database from before the current aggregates
+    repository._conn.execute("DELETE FROM report_daily")
+    repository._conn.execute("DELETE FROM report_swot")
+    repository._conn.execute("PRAGMA user_version = 1")
+    repository._conn.commit()
+
+    reopened = ReportRepository(path)
+    assert reopened.aggregates("0xabc")["reports"] == 2
+    assert reopened.swot_items("strengths", "0xabc") == [("Equipe", 2)]
+
+
+def test_recent_recommendations_skip_reports_without_any(tmp_path):
+    repository = ReportRepository(str(tmp_path / "reports.sqlite3"))
+    repository.save(make_report("old", generated_date="01/03/2025 10:00"), "0xabc")
+    repository.save(dict(make_report("new", generated_date="02/03/2025 10:00"), recommendations=[]), "0xabc")
+
+    assert repository.recent_recommendations("0xabc", limit=5) == make_report("old")["recommendations"]
+
+
+def test_dashboard_filters_are_index_seeks(tmp_path):
+    repository = ReportRepository(str(tmp_path / "reports.sqlite3"))
+
+    def plan(sql, params):
+        return [row[-1] for row in repository._conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+
+    where, params = repository._where("0xabc", "seo", datetime.date(2025, 3, 1), datetime.date(2025, 4, 1))
+    filtered = plan(f"SELECT payload FROM reports{where} ORDER BY generated_at DESC, rowid DESC", params)
+    assert filtered == ["SEARCH reports USING INDEX idx_reports_wallet_type_date "
+                        "(wallet_address=? AND report_type=? AND generated_at>? AND generated_at<?)"]
+
+    bounds = plan("SELECT (SELECT MIN(generated_at) FROM reports WHERE wallet_address = ?), "
+                  "(SELECT MAX(generated_at) FROM reports WHERE wallet_address = ?)", ["0xabc", "0xabc"])
+    assert all("SCAN reports" not in step for step in bounds)
+
+
+def test_latest_report_uses_generated_at_and_save_order(tmp_path):
+    repository = ReportRepository(str(tmp_path / "reports.sqlite3"))
+    march_5 = datetime.datetime(2025, 3, 5, 10, 0).timestamp()
+    repository.save(dict(make_report("precise"), generated_at=march_5 + 30), "0xabc")
+    repository.save(make_report("same_minute", generated_date="05/03/2025 10:00"), "0xabc")
+    repository.save(make_report("legacy", generated_date="01/03/2025 10:00"), "0xabc")
+    repository.save(make_report("seo", "seo", generated_date="01/03/2025 10:00"), "0xabc")
+
+    assert repository.latest("0xabc")["id"] == "precise"
+    assert repository.latest("0xabc", "seo")["id"] == "seo"
+    assert repository.latest("0xdef") is None
+    assert [r["id"] for r in repository.list_reports("0xabc", "business_map")] == ["precise", "same_minute", "legacy"]
+    assert repository.get("legacy")["generated_at"] == datetime.datetime(2025, 3, 1, 10, 0).timestamp()
+
+
+def test_keyset_pages_cover_every_report_once(tmp_path):
+    repository = ReportRepository(str(tmp_path / "reports.sqlite3"))
+    for i in range(7):
+        # Several reports share a generation time; the save order breaks ties
+        repository.save(make_report(f"r{i}", generated_date=f"0{1 + i // 3}/03/2025 10:00"), "0xabc")
+
+    pages, cursor = [], None
+    while True:
+        page, cursor = repository.page_reports("0xabc", limit=3, after=cursor)
+        pages.append([r["id"] for r in page])
+        if cursor is None:
+            break
+
+    assert pages == [["r6", "r5", "r4"], ["r3", "r2", "r1"], ["r0"]]
+
+
+def test_search_matches_title_or_type_display(tmp_path):
+    repository = ReportRepository(str(tmp_path / "reports.sqlite3"))
+    repository.save(dict(make_report("a"), title="Loja 100% online"), "0xabc")
+    repository.save(make_report("b", "seo"), "0xabc")
+
+    assert [r["id"] for r in repository.list_reports("0xabc", search="seo")] == ["b"]
+    assert [r["id"] for r in repository.page_reports("0xabc", search="100%")[0]] == ["a"]
+    assert repository.count("0xabc", search="%") == 1
+
+
+def test_get_report_is_scoped_to_the_wallet(tmp_path):
+    repository = ReportRepository(str(tmp_path / "reports.sqlite3"))
+    repository.save(make_report("r1"), "0xabc")
+
+    assert repository.get_report("r1", "0xabc")["id"] == "r1"
+    assert repository.get_report("r1", "0xdef") is None
+    assert repository.get_report("missing", "0xabc") is None
+
+
+def test_swot_items_count_each_normalized_item_once_per_report(tmp_path):
+    repository = ReportRepository(str(tmp_path / "reports.sqlite3"))
+    first = dict(make_report("r1"), ai_analysis={"strengths": ["Equipe qualificada", "EQUIPE QUALIFICADA!"], "weaknesses": ["Custos altos"]})
+    second = dict(make_report("r2", generated_date="05/03/2025 10:00"), ai_analysis={"strengths": ["Equipe  qualificada", "Preço competitivo"]})
+    repository.save(first, "0xabc")
+    repository.save(second, "0xabc")
+
+    assert repository.swot_items("strengths", "0xabc") == [("Equipe  qualificada", 2), ("Preço competitivo", 1)]
+    assert repository.swot_items("strengths", "0xabc", start=datetime.date(2025, 3, 2)) == [("Equipe  qualificada", 1), ("Preço competitivo", 1)]
+    assert repository.swot_items("weaknesses", "0xabc") == [("Custos altos", 1)]
+
+    repository.delete("r1")
+    assert repository.swot_items("weaknesses", "0xabc") == []
+
+
+def test_saving_another_wallets_report_id_is_rejected(tmp_path):
+    repository = ReportRepository(str(tmp_path / "reports.sqlite3"))
+    repository.save(make_report("r1"), "0xabc")
+
+    with pytest.raises(ValueError):
+        repository.save(dict(make_report("r1"), title="Tomado"), "0xdef")
+
+    assert repository.count("0xabc") == 1
+    assert repository.count("0xdef") == 0
+    assert repository.get_report("r1", "0xabc")["title"] == "Relatório r1"
+    assert repository.aggregates("0xdef")["reports"] == 0
+
+    # The owner can still update it
+    repository.save(dict(make_report("r1"), title="Atualizado"), "0xabc")
+    assert repository.get_report("r1", "0xabc")["title"] == "Atualizado"
+    assert repository.aggregates("0xabc")["reports"] == 1
+
+
+def test_failed_saves_leave_reports_and_aggregates_untouched(tmp_path):
+    repository = ReportRepository(str(tmp_path / "reports.sqlite3"))
+    repository.save(make_report("a"), "w")
+
+    with pytest.raises(TypeError):
+        repository.save(dict(make_report("a"), recommendations=None), "w")
+    with pytest.raises(KeyError):
+        repository.set("c", {"title": "Sem tipo", "wallet_address": "w"})
+    repository.save(make_report("b"), "w")
+
+    assert repository.count("w") == 2
+    assert repository.aggregates("w")["reports"] == repository.count("w")
+    assert repository.aggregates("w")["recommendations"] == 2
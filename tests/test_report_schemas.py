@@ -0,0 +1,99 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from pydantic import ValidationError
+
+import openai_client
+from report_schemas import REPORT_MODELS, SEOAnalysis, json_schema_format, parse_analysis
+
+FALLBACKS = {
+    "business_map": openai_client._business_fallback,
+    "blue_ocean": openai_client._blue_ocean_fallback,
+    "seo": openai_client._seo_fallback,
+}
+
+
+@pytest.mark.parametrize("report_type", sorted(REPORT_MODELS))
+def test_fallback_analyses_match_their_models(report_type):
+    fallback = FALLBACKS[report_type]({"business_name": "Acme"})
+
+    assert parse_analysis(REPORT_MODELS[report_type], json.dumps(fallback)) == fallback
+
+
+def test_strict_schema_closes_every_object():
+    def objects(node):
+        if isinstance(node, dict):
+            if "properties" in node:
+                yield node
+            for value in node.values():
+                yield from objects(value)
+        elif isinstance(node, list):
+            for value in node:
+                yield from objects(value)
+
+    for model in REPORT_MODELS.values():
+        response_format = json_schema_format(model)
+        assert response_format["json_schema"]["strict"] is True
+        for node in objects(response_format["json_schema"]["schema"]):
+            assert node["additionalProperties"] is False
+            assert node["required"] == list(node["properties"])
+
+
+def test_labeled_values_are_converted_to_dicts():
+    fallback = openai_client._business_fallback({})
+    wire = dict(fallback, market_data=[{"label": k, "value": v} for k, v in fallback["market_data"].items()])
+
+    assert parse_analysis(REPORT_MODELS["business_map"], json.dumps(wire))["market_data"] == fallback["market_data"]
+
+
+def test_invalid_payloads_are_rejected():
+    seo = openai_client._seo_fallback({})
+    del seo["optimization_opportunities"][0]["impact"]
+    with pytest.raises(ValidationError):
+        parse_analysis(SEOAnalysis, json.dumps(seo))
+
+    seo = openai_client._seo_fallback({})
+    seo["traffic_sources"]["percentages"].pop()
+    with pytest.raises(ValidationError):
+        parse_analysis(SEOAnalysis, json.dumps(seo))
+
+
+def test_json_object_responses_are_validated_leniently():
+    seo = openai_client._seo_fallback({})
+    seo["overall_score"] = 72.6
+    seo["keywords_data"]["positions"][0] = 3.2
+    seo["conclusion"] = "Boa base técnica."
+
+    analysis = parse_analysis(SEOAnalysis, json.dumps(seo))
+
+    assert analysis["overall_score"] == 73
+    assert analysis["keywords_data"]["positions"][0] == 3
+    assert analysis["conclusion"] == "Boa base técnica."
+
+
+def _response(content):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=None)
+
+
+def test_invalid_responses_are_retried_a_bounded_number_of_times(monkeypatch):
+    valid = json.dumps(openai_client._seo_fallback({}))
+    contents = iter(['{"overall_score": 10}', valid])
+    calls = []
+
+    def send(system_prompt, prompt, response_format):
+        calls.append(response_format)
+        return _response(next(contents))
+
+    monkeypatch.setattr(openai_client, "OPENAI_CACHE_ENABLED", False)
+    monkeypatch.setattr(openai_client, "OPENAI_SCHEMA_RETRIES", 1)
+    monkeypatch.setattr(openai_client, "_send_completion", send)
+
+    assert openai_client._create_completion("s", "p", SEOAnalysis) == json.loads(valid)
+    assert len(calls) == 2
+
+    calls.clear()
+    monkeypatch.setattr(openai_client, "_send_completion", lambda *args: calls.append(args) or _response("{}"))
+    with pytest.raises(ValidationError):
+        openai_client._create_completion("s", "p", SEOAnalysis)
+    assert len(calls) == 2
@@ -0,0 +1,127 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import retry_policy
+from retry_policy import (
+    LatencyTracker,
+    RetryPolicy,
+    ahedged_call,
+    call_with_retry,
+    hedged_call,
+    is_retryable,
+    retry_after_seconds
+)
+
+
+class TransientError(Exception):
+    status_code = 503
+
+    def __init__(self, headers=None):
+        super().__init__("temporarily unavailable")
+        self.response = SimpleNamespace(headers=headers or {})
+
+
+def test_backoff_is_bounded_by_exponential_ceiling():
+    """Test if jittered delays never exceed the exponential ceiling or max_delay"""
+    policy = RetryPolicy(base_delay=0.5, max_delay=3)
+    for attempt in range(6):
+        assert 0 <= policy.backoff(attempt) <= min(3, 0.5 * 2 ** attempt)
+
+
+def test_retry_after_header_is_honored():
+    """Test if the delay requested by the server is used"""
+    policy = RetryPolicy(max_delay=30)
+    assert policy.backoff(0, TransientError({"retry-after": "7"})) == 7
+    assert retry_after_seconds(TransientError({"retry-after-ms": "250"})) == 0.25
+    assert retry_after_seconds(ValueError()) is None
+
+
+def test_transient_errors_are_retried():
+    """Test if retryable errors are retried until the call succeeds"""
+    calls = []
+    delays = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise TransientError()
+        return "ok"
+
+    assert call_with_retry(flaky, RetryPolicy(max_retries=3), sleep=delays.append) == "ok"
+    assert len(calls) == 3
+    assert len(delays) == 2
+
+
+def test_retries_are_bounded_and_skip_permanent_errors():
+    """Test if retries stop at max_retries and permanent errors are raised at once"""
+    calls = []
+
+    def always_failing():
+        calls.append(1)
+        raise TransientError()
+
+    with pytest.raises(TransientError):
+        call_with_retry(always_failing, RetryPolicy(max_retries=2), sleep=lambda _: None)
+    assert len(calls) == 3
+
+    assert not is_retryable(ValueError("bad request"))
+    with pytest.raises(ValueError):
+        call_with_retry(lambda: (_ for _ in ()).throw(ValueError()), RetryPolicy(), sleep=lambda _: None)
+
+
+def test_latency_percentile_needs_enough_samples():
+    """Test if the percentile is only reported once min_samples were recorded"""
+    tracker = LatencyTracker(min_samples=10)
+    for value in range(9):
+        tracker.record(value)
+    assert tracker.percentile(95) is None
+
+    tracker.record(9)
+    assert tracker.percentile(50) in (4, 5)
+    assert tracker.percentile(95) == 9
+
+
+def test_slow_request_is_hedged():
+    """Test if a second request is sent when the first exceeds the hedge delay"""
+    durations = iter([1.0, 0.01])
+
+    def request():
+        duration = next(durations)
+        time.sleep(duration)
+        return duration
+
+    started = time.monotonic()
+    assert hedged_call(request, hedge_after=0.05) == 0.01
+    assert time.monotonic() - started < 0.5
+
+
+def test_saturated_hedge_pool_runs_the_request_once_on_the_caller(monkeypatch):
+    """Test if no copy is sent (or queued) while every hedge worker is busy"""
+    busy = threading.BoundedSemaphore(1)
+    busy.acquire()
+    monkeypatch.setattr(retry_policy, "_hedge_slots", busy)
+    threads = []
+
+    def request():
+        threads.append(threading.current_thread())
+        time.sleep(0.1)
+        return "ok"
+
+    assert hedged_call(request, hedge_after=0.01) == "ok"
+    assert threads == [threading.current_thread()]
+
+
+def test_async_hedge_cancels_the_slower_request():
+    """Test if the async hedge returns the fastest result"""
+    durations = iter([1.0, 0.01])
+
+    async def request():
+        duration = next(durations)
+        await asyncio.sleep(duration)
+        return duration
+
+    assert asyncio.run(ahedged_call(request, hedge_after=0.05)) == 0.01
@@ -0,0 +1,40 @@
+from swot_themes import ThemeCounter, jaccard, minhash, normalize, shingles, top_themes
+
+
+def test_normalize_ignores_case_accents_punctuation_and_stopwords():
+    assert normalize("  Preço   Competitivo! ") == "preco competitivo"
+    assert normalize("Dependência de poucos canais") == "dependencia poucos canais"
+    assert normalize("de a o") == ""
+
+
+def test_minhash_estimates_jaccard_similarity():
+    first = shingles(normalize("Atendimento personalizado"))
+    second = shingles(normalize("Atendimento ao cliente personalizado"))
+
+    estimate = (minhash(first) == minhash(second)).mean()
+
+    assert abs(estimate - jaccard(first, second)) < 0.15
+    assert (minhash(first) == minhash(first)).all()
+
+
+def test_near_duplicates_are_counted_as_one_theme():
+    themes = top_themes([
+        ("Equipe qualificada", 3),
+        ("Equipe altamente qualificada", 2),
+        ("Preço competitivo", 1),
+        ("Preços competitivos", 2),
+        ("Marca forte", 1),
+        ("Equipe comprometida", 1),
+    ], limit=3)
+
+    assert themes == [("Equipe qualificada", 5), ("Preços competitivos", 3), ("Marca forte", 1)]
+
+
+def test_theme_counter_is_incremental():
+    counter = ThemeCounter()
+    counter.add("Marca forte")
+    counter.add("Logística eficiente")
+    counter.add("Marca forte", 2)
+
+    assert len(counter) == 2
+    assert counter.top(1) == [("Marca forte", 3)]
@@ -1,6 +1,4 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 import base64
 from io import BytesIO
@@ -9,6 +7,9 @@ import datetime
 import json
 import re
 
+from fast_charts import cartesian_layout, colorway
+from figure_cache import memoize_figure
+
 # Templates for AI prompts
 BUSINESS_MAP_TEMPLATE = """
 # 🗺️ Mapa Estratégico para {business_name}
@@ -145,6 +146,7 @@ def create_pdf_download_link(content, filename="report.pdf"):
     href = f'<a href="#" download="{filename}">Download PDF</a>'
     return href
 
+@memoize_figure
 def generate_radar_chart(categories, values, title):
     """Generate a radar chart using Plotly"""
     fig = go.Figure()
@@ -169,35 +171,46 @@ def generate_radar_chart(categories, values, title):
     
     return fig
 
+@memoize_figure
 def generate_bar_chart(x_data, y_data, title, x_label, y_label):
-    """Generate a bar chart using Plotly"""
-    df = pd.DataFrame({
-        x_label: x_data,
-        y_label: y_data
-    })
-    
-    fig = px.bar(
-        df,
-        x=x_label,
-        y=y_label,
-        title=title
+    """Generate a bar chart using Plotly (same figure as px.bar)"""
+    return go.Figure(
+        go.Bar(
+            x=list(x_data),
+            y=list(y_data),
+            hovertemplate=f"{x_label}=%{{x}}<br>{y_label}=%{{y}}<extra></extra>",
+            legendgroup="",
+            marker=dict(color=colorway()[0], pattern=dict(shape="")),
+            name="",
+            orientation="v",
+            showlegend=False,
+            textposition="auto",
+            xaxis="x",
+            yaxis="y"
+        ),
+        cartesian_layout(title, x_label, y_label, barmode="relative")
     )
-    return fig
 
+@memoize_figure
 def generate_line_chart(x_data, y_data, title, x_label, y_label):
-    """Generate a line chart using Plotly"""
-    df = pd.DataFrame({
-        x_label: x_data,
-        y_label: y_data
-    })
-    
-    fig = px.line(
-        df,
-        x=x_label,
-        y=y_label,
-        title=title
+    """Generate a line chart using Plotly (same figure as px.line)"""
+    return go.Figure(
+        go.Scatter(
+            x=list(x_data),
+            y=list(y_data),
+            hovertemplate=f"{x_label}=%{{x}}<br>{y_label}=%{{y}}<extra></extra>",
+            legendgroup="",
+            line=dict(color=colorway()[0], dash="solid"),
+            marker=dict(symbol="circle"),
+            mode="lines",
+            name="",
+            orientation="v",
+            showlegend=False,
+            xaxis="x",
+            yaxis="y"
+        ),
+        cartesian_layout(title, x_label, y_label)
     )
-    return fig
 
 def validate_url(url):
     """Validate if a string is a properly formatted URL"""
@@ -211,6 +224,12 @@ def validate_url(url):
     
     return bool(url_pattern.match(url))
 
+def _plot_chart(report, key):
+    """Render one of the report's charts from its cached, pre-serialized figure"""
+    from render_cache import rendered_figure
+    
+    st.plotly_chart(rendered_figure(report, key), use_container_width=True)
+
 def display_report(report):
     """Display a generated report in the Streamlit interface"""
     st.title(report['title'])
@@ -234,39 +253,39 @@ def display_report(report):
     if report['report_type'] == 'business_map':
         # Business Map specific visualizations
         st.subheader("Mapa de Desempenho por Área")
-        st.plotly_chart(report['visualizations']['radar_chart'], use_container_width=True)
+        _plot_chart(report, 'radar_chart')
         
         st.subheader("Comparação com o Mercado")
         col1, col2 = st.columns(2)
         with col1:
-            st.plotly_chart(report['visualizations']['market_comparison'], use_container_width=True)
+            _plot_chart(report, 'market_comparison')
         with col2:
-            st.plotly_chart(report['visualizations']['growth_potential'], use_container_width=True)
+            _plot_chart(report, 'growth_potential')
             
     elif report['report_type'] == 'blue_ocean':
         # Blue Ocean specific visualizations
         st.subheader("Estratégia Canvas")
-        st.plotly_chart(report['visualizations']['strategy_canvas'], use_container_width=True)
+        _plot_chart(report, 'strategy_canvas')
         
         st.subheader("Ações Estratégicas")
         col1, col2 = st.columns(2)
         with col1:
-            st.plotly_chart(report['visualizations']['actions_chart'], use_container_width=True) 
+            _plot_chart(report, 'actions_chart')
         with col2:
-            st.plotly_chart(report['visualizations']['performance_projection'], use_container_width=True)
+            _plot_chart(report, 'performance_projection')
             
     elif report['report_type'] == 'seo':
         # SEO specific visualizations
         st.subheader("Performance de Palavras-chave")
-        st.plotly_chart(report['visualizations']['keyword_performance'], use_container_width=True)
+        _plot_chart(report, 'keyword_performance')
         
         col1, col2 = st.columns(2)
         with col1:
             st.subheader("Tráfego por Canal")
-            st.plotly_chart(report['visualizations']['traffic_sources'], use_container_width=True)
+            _plot_chart(report, 'traffic_sources')
         with col2:
             st.subheader("Oportunidades de Otimização")
-            st.plotly_chart(report['visualizations']['optimization_opportunities'], use_container_width=True)
+            _plot_chart(report, 'optimization_opportunities')
     
     # Display recommendations
     st.header("Recomendações Estratégicas")
@@ -297,6 +316,140 @@ def display_report(report):
             csv_link = create_download_link(report['data'], f"{report['id']}.csv")
             st.markdown(csv_link, unsafe_allow_html=True)
 
+# Titles of the analysis lists rendered while a report is streaming
+STREAM_LIST_TITLES = {
+    'strengths': "Forças",
+    'weaknesses': "Fraquezas",
+    'opportunities': "Oportunidades",
+    'threats': "Ameaças",
+    'eliminate': "Eliminar",
+    'reduce': "Reduzir",
+    'raise': "Aumentar",
+    'create': "Criar"
+}
+
+def render_stream_event(event, received):
+    """
+    Render one section of a report while its analysis is still streaming
+    
+    ``event`` is an analysis event from report_generator.stream_report and
+    ``received`` is a dict owned by the caller that accumulates the completed
+    sections, so charts built from several arrays are drawn as soon as the
+    last of them arrives.
+    """
+    kind, key = event[0], event[1]
+    rendered = received.setdefault('_rendered_items', {})
+    
+    if kind == 'item':
+        # Recommendations are shown one by one as soon as each is complete
+        if key == 'recommendations':
+            _render_recommendation(event[2] + 1, event[3])
+            rendered[key] = event[2] + 1
+        return
+    
+    value = event[2]
+    received[key] = value
+    
+    if key == 'recommendations':
+        # Cached or simulated analyses arrive as whole sections
+        for index, recommendation in enumerate(value[rendered.get(key, 0):], rendered.get(key, 0) + 1):
+            _render_recommendation(index, recommendation)
+    elif key in STREAM_LIST_TITLES and isinstance(value, list):
+        st.markdown(f"**{STREAM_LIST_TITLES[key]}**")
+        for item in value:
+            st.markdown(f"- {item}")
+    elif key == 'overall_score':
+        st.metric("Pontuação SEO Geral", f"{value}/100")
+    else:
+        try:
+            fig = _build_stream_chart(key, received)
+        except (AttributeError, KeyError, TypeError, ValueError):
+            # Partial charts are only a preview, the final report redraws them
+            fig = None
+        if fig is not None:
+            st.plotly_chart(fig, use_container_width=True)
+
+def _render_recommendation(index, recommendation):
+    """Render a single streamed recommendation"""
+    if not isinstance(recommendation, dict):
+        recommendation = {'title': "Recomendação", 'description': str(recommendation)}
+    
+    st.subheader(f"{index}. {recommendation.get('title', 'Recomendação')}")
+    st.write(recommendation.get('description', ''))
+    if recommendation.get('action_items'):
+        st.write("**Ações recomendadas:**")
+        for action in recommendation['action_items']:
+            st.write(f"- {action}")
+
+def _build_stream_chart(key, received):
+    """
+    Build the chart unlocked by the arrival of ``key``, if any
+    
+    Previews use the same chart specs as the final report (see
+    report_generator), so they show the same charts.
+    """
+    # chart_specs imports this module
+    from chart_specs import build_figure, chart_spec
+    
+    spec = None
+    if key in ('categories', 'values'):
+        if 'categories' in received and 'values' in received:
+            spec = chart_spec(
+                "radar",
+                categories=received['categories'],
+                values=received['values'],
+                title="Desempenho por Área"
+            )
+    elif key == 'market_data':
+        spec = chart_spec(
+            "bar",
+            x=list(received[key].keys()),
+            y=list(received[key].values()),
+            title="Comparação com o Mercado",
+            x_label="Categorias",
+            y_label="Valores"
+        )
+    elif key == 'growth_data':
+        spec = chart_spec(
+            "line",
+            x=list(received[key].keys()),
+            y=list(received[key].values()),
+            title="Potencial de Crescimento",
+            x_label="Período",
+            y_label="Crescimento (%)"
+        )
+    elif key in ('canvas_factors', 'your_values', 'industry_values'):
+        if all(k in received for k in ('canvas_factors', 'your_values', 'industry_values')):
+            spec = chart_spec(
+                "strategy_canvas",
+                factors=received['canvas_factors'],
+                your_values=received['your_values'],
+                industry_values=received['industry_values']
+            )
+    elif key == 'keywords_data':
+        keywords_data = received[key]
+        spec = chart_spec(
+            "keyword_performance",
+            keywords=keywords_data['keywords'],
+            positions=keywords_data['positions'],
+            search_volumes=keywords_data['search_volumes']
+        )
+    elif key == 'traffic_sources':
+        spec = chart_spec(
+            "traffic_sources",
+            sources=received[key]['sources'],
+            percentages=received[key]['percentages']
+        )
+    elif key == 'optimization_opportunities':
+        opportunities = received[key]
+        spec = chart_spec(
+            "optimization_opportunities",
+            areas=[opp['area'] for opp in opportunities],
+            impact=[opp['impact'] for opp in opportunities],
+            difficulty=[opp['difficulty'] for opp in opportunities]
+        )
+    return build_figure(spec) if spec is not None else None
+
 def format_currency(value):
     """Format a value as BRL currency"""
     return f"R$ {value:,.2f}"
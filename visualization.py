@@ -1,9 +1,11 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 import numpy as np
 
+from fast_charts import cartesian_layout, colorway, group_indices, pick, size_reference
+from figure_cache import memoize_figure
+
+@memoize_figure
 def create_radar_chart(categories, values, title):
     """Create a radar chart for business areas"""
     fig = go.Figure()
@@ -27,6 +29,7 @@ def create_radar_chart(categories, values, title):
     
     return fig
 
+@memoize_figure
 def create_strategy_canvas(factors, your_values, competitor_values):
     """Create a strategy canvas comparing your business with competitors"""
     fig = go.Figure()
@@ -56,6 +59,7 @@ def create_strategy_canvas(factors, your_values, competitor_values):
     
     return fig
 
+@memoize_figure
 def create_errc_chart():
     """Create a chart for the Eliminate-Reduce-Raise-Create framework"""
     actions = ["Eliminar", "Reduzir", "Aumentar", "Criar"]
@@ -88,72 +92,100 @@ def create_errc_chart():
     
     return fig
 
+@memoize_figure
 def create_keyword_performance(keywords, positions, search_volumes):
-    """Create a scatter plot for keyword performance"""
-    df = pd.DataFrame({
-        'Palavra-chave': keywords,
-        'Posição': positions,
-        'Volume de Busca': search_volumes
-    })
-    
-    fig = px.scatter(
-        df, 
-        x='Palavra-chave', 
-        y='Posição',
-        size='Volume de Busca',
-        color='Palavra-chave',
-        title="Performance de Palavras-chave",
-        labels={'Posição': 'Posição no Google'}
-    )
+    """Create a scatter plot for keyword performance (one colored trace per keyword)"""
+    colors = colorway()
+    sizeref = size_reference(search_volumes)
+    traces = []
+    for i, (keyword, rows) in enumerate(group_indices(keywords).items()):
+        traces.append(go.Scatter(
+            x=pick(keywords, rows),
+            y=pick(positions, rows),
+            hovertemplate="Palavra-chave=%{x}<br>Posição no Google=%{y}<br>Volume de Busca=%{marker.size}<extra></extra>",
+            legendgroup=keyword,
+            marker=dict(
+                color=colors[i % len(colors)],
+                size=pick(search_volumes, rows),
+                sizemode='area',
+                sizeref=sizeref,
+                symbol='circle'
+            ),
+            mode='markers',
+            name=keyword,
+            orientation='v',
+            showlegend=True,
+            xaxis='x',
+            yaxis='y'
+        ))
     
     # Reverse y-axis so that position 1 is at the top
-    fig.update_yaxes(autorange="reversed")
-    
-    return fig
+    return go.Figure(traces, cartesian_layout(
+        "Performance de Palavras-chave",
+        'Palavra-chave',
+        'Posição no Google',
+        legend_title='Palavra-chave',
+        xaxis=dict(categoryorder='array', categoryarray=list(group_indices(keywords))),
+        yaxis=dict(autorange='reversed'),
+        legend=dict(itemsizing='constant')
+    ))
 
+@memoize_figure
 def create_traffic_sources_chart(sources, percentages):
     """Create a pie chart for traffic sources"""
-    df = pd.DataFrame({
-        'Fonte': sources,
-        'Porcentagem': percentages
-    })
-    
-    fig = px.pie(
-        df,
-        values='Porcentagem',
-        names='Fonte',
-        title='Fontes de Tráfego',
-        hole=0.4
+    return go.Figure(
+        go.Pie(
+            labels=list(sources),
+            values=list(percentages),
+            domain=dict(x=[0.0, 1.0], y=[0.0, 1.0]),
+            hole=0.4,
+            hovertemplate="Fonte=%{label}<br>Porcentagem=%{value}<extra></extra>",
+            legendgroup='',
+            name='',
+            showlegend=True
+        ),
+        dict(legend=dict(tracegroupgap=0), title=dict(text='Fontes de Tráfego'))
     )
-    
-    return fig
 
+@memoize_figure
 def create_optimization_matrix(areas, impact, difficulty):
     """Create a scatter plot for SEO optimization opportunities"""
-    df = pd.DataFrame({
-        'Área': areas,
-        'Impacto': impact,
-        'Dificuldade': difficulty
-    })
-    
-    fig = px.scatter(
-        df,
-        x='Dificuldade',
-        y='Impacto',
-        text='Área',
-        size=[40] * len(areas),
-        color='Área',
-        title="Matriz de Oportunidades de Otimização",
-        labels={
-            'Dificuldade': 'Dificuldade de Implementação',
-            'Impacto': 'Impacto Potencial'
-        }
-    )
-    
-    fig.update_traces(textposition='top center')
+    colors = colorway()
+    sizes = [40] * len(areas)
+    sizeref = size_reference(sizes)
+    traces = []
+    for i, (area, rows) in enumerate(group_indices(areas).items()):
+        traces.append(go.Scatter(
+            x=pick(difficulty, rows),
+            y=pick(impact, rows),
+            text=pick(areas, rows),
+            hovertemplate="Área=%{text}<br>Dificuldade de Implementação=%{x}<br>Impacto Potencial=%{y}<br>size=%{marker.size}<extra></extra>",
+            legendgroup=area,
+            marker=dict(
+                color=colors[i % len(colors)],
+                size=pick(sizes, rows),
+                sizemode='area',
+                sizeref=sizeref,
+                symbol='circle'
+            ),
+            mode='markers+text',
+            name=area,
+            orientation='v',
+            showlegend=True,
+            textposition='top center',
+            xaxis='x',
+            yaxis='y'
+        ))
     
-    return fig
+    return go.Figure(traces, cartesian_layout(
+        "Matriz de Oportunidades de Otimização",
+        'Dificuldade de Implementação',
+        'Impacto Potencial',
+        legend_title='Área',
+        legend=dict(itemsizing='constant')
+    ))
 
+@memoize_figure
 def create_comparison_bar_chart(categories, values, competitor_values, title):
     """Create a bar chart comparing your business with competitors"""
     fig = go.Figure()
@@ -181,6 +213,7 @@ def create_comparison_bar_chart(categories, values, competitor_values, title):
     
     return fig
 
+@memoize_figure
 def create_projection_chart(periods, your_values, market_values):
     """Create a line chart for business projections"""
     fig = go.Figure()